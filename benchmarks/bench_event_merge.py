@@ -0,0 +1,126 @@
+"""Benchmark status-change-broadcast merging, one optimisation at a time.
+
+Usage: python benchmarks/bench_event_merge.py [--zones 8] [--events 2000]
+
+Each case differs from the one before it by a single change, so each
+speedup can be put down to that change alone:
+
+    legacy       the original implementation - a deepcopy of the whole
+                 state, a regex split per key and a recursive merge
+    no-deepcopy  legacy merging in place, the cost of the deepcopy alone
+    uncompiled   the current structurally shared merge, parsing every key
+                 afresh as the legacy merge did
+    compiled     the current merge, with parsed keys cached
+
+legacy and no-deepcopy are kept here as reference points only.
+no-deepcopy is the fastest of the four, but only because it changes the
+state it was given, which the coordinator can't allow: a failed update
+must leave the previous state intact and published states are shared.
+compiled pays for copying the path to each changed key instead.
+"""
+
+import argparse
+import copy
+import os
+import re
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "custom_components", "actronair_nimbus")
+)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import api.data  # noqa: E402
+from api.data import ActronAdvanceState  # noqa: E402
+from api.paths import KeyPath  # noqa: E402
+from fixtures import build_delta_events, build_full_event, serial_for  # noqa: E402
+
+
+def legacy_merge(state: dict, event: dict, deepcopy: bool = True) -> dict:
+    """The merge as it was before key paths were compiled."""
+    changes = []
+
+    def recursive_merge(state, keys, value, full_key):
+        if len(keys) == 1:
+            before = state[keys[0]]
+            if before != value:
+                changes.append((full_key, before, value))
+            state[keys[0]] = value
+            return state
+
+        key = keys.pop(0)
+        state[key] = recursive_merge(state[key], keys, value, full_key)
+        return state
+
+    new_state = copy.deepcopy(state) if deepcopy else state
+    for key, value in event["data"].items():
+        if key.startswith("@"):
+            continue
+        parts = re.split(r"\.|\[|\]", key)
+        parts = [int(part) if part.isdigit() else part for part in parts if part]
+        new_state = recursive_merge(new_state, parts, value, key)
+
+    return new_state
+
+
+def _rate(count: int, elapsed: float) -> float:
+    return count / elapsed if elapsed else float("inf")
+
+
+def bench_legacy(full: dict, events: list[dict], deepcopy: bool = True) -> float:
+    state = copy.deepcopy(full["data"])
+    start = time.perf_counter()
+    for event in events:
+        state = legacy_merge(state, event, deepcopy=deepcopy)
+    return _rate(len(events), time.perf_counter() - start)
+
+
+def bench_current(full: dict, events: list[dict], compiled: bool = True) -> float:
+    state = ActronAdvanceState()
+    state.update_from_event(full)
+    cached = api.data.compile_path
+    if not compiled:
+        # parse every key afresh, rather than from the compiled path cache
+        api.data.compile_path = KeyPath
+    try:
+        start = time.perf_counter()
+        for event in events:
+            # coordinator copies before every update to keep all-or-nothing semantics
+            state = state.copy()
+            state.update_from_event(event)
+        return _rate(len(events), time.perf_counter() - start)
+    finally:
+        api.data.compile_path = cached
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--zones", type=int, default=8)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--keys-per-event", type=int, default=4)
+    args = parser.parse_args()
+
+    serial = serial_for(1)
+    full = build_full_event(serial, zones=args.zones)
+    events = build_delta_events(
+        serial, zones=args.zones, count=args.events, keys_per_event=args.keys_per_event
+    )
+
+    legacy = bench_legacy(full, events)
+    no_deepcopy = bench_legacy(full, events, deepcopy=False)
+    uncompiled = bench_current(full, events, compiled=False)
+    compiled = bench_current(full, events)
+
+    print(f"zones={args.zones} events={args.events} keys/event={args.keys_per_event}")
+    print(f"legacy:      {legacy:12.0f} events/s")
+    print(f"no-deepcopy: {no_deepcopy:12.0f} events/s")
+    print(f"uncompiled:  {uncompiled:12.0f} events/s")
+    print(f"compiled:    {compiled:12.0f} events/s")
+    print(f"removing the deepcopy:      {no_deepcopy / legacy:.1f}x")
+    print(f"compiling paths:            {compiled / uncompiled:.1f}x")
+    print(f"overall, legacy to current: {compiled / legacy:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
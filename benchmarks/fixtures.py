@@ -0,0 +1,234 @@
+"""Synthetic, size-parameterised Nimbus payloads for benchmarking.
+
+The shapes follow the real API (see api/README.md) closely enough to exercise
+the same code paths, but every value is generated so nothing personal needs
+to be committed.
+"""
+
+import random
+
+from datetime import datetime, timedelta, timezone
+
+# Nimbus always reports 8 zone slots, only some of which exist
+ZONE_SLOTS = 8
+
+BASE_TIME = datetime(2025, 3, 7, 16, 35, 7, tzinfo=timezone.utc)
+
+
+def serial_for(index: int) -> str:
+    return f"24i{index:05d}"
+
+
+def _timestamp(offset_seconds: float) -> str:
+    return (BASE_TIME + timedelta(seconds=offset_seconds)).isoformat()
+
+
+def build_state(serial: str, zones: int = 8, errors: int = 4, seed: int = 0) -> dict:
+    """Build a lastKnownState for a system with the given number of zones."""
+    rng = random.Random(seed)
+    serial_upper = serial.upper()
+    slots = max(ZONE_SLOTS, zones)
+
+    remote_zone_info = []
+    for i in range(slots):
+        exists = i < zones
+        remote_zone_info.append(
+            {
+                "NV_Exists": exists,
+                "NV_Title": f"Zone {i + 1}" if exists else "",
+                "ZonePosition": rng.randint(0, 20) if exists else 0,
+                "LiveHumidity_pc": round(rng.uniform(30, 70), 1),
+                "LiveTemp_oC": round(rng.uniform(16, 30), 1),
+                "TemperatureSetpoint_Cool_oC": 24.0,
+                "TemperatureSetpoint_Heat_oC": 21.0,
+                "CanOperate": exists,
+                "Sensors": {
+                    serial_upper: {
+                        "NV_Kind": f"Zone Sensor: ZS{serial_upper}{i:02d}",
+                        "Connected": exists,
+                        "lastRssi": -rng.randint(40, 90),
+                        "Signal_of3": rng.randint(0, 3),
+                        "Battery_pc": rng.randint(20, 100),
+                    }
+                }
+                if exists
+                else {},
+            }
+        )
+
+    peripherals = [
+        {
+            "DeviceType": "Zone Sensor",
+            "SerialNumber": f"ZS{serial_upper}{i:02d}",
+            "ZoneAssignment": [i],
+            "RemainingBatteryCapacity_pc": rng.randint(20, 100),
+            "ConnectionState": "Connected",
+            "LastConnectionTime": _timestamp(-rng.randint(0, 3600)),
+            "SensorInputs": {
+                "SHTC1": {
+                    "Temperature_oC": round(rng.uniform(16, 30), 1),
+                    "RelativeHumidity_pc": round(rng.uniform(30, 70), 1),
+                }
+            },
+            "Firmware": {"InstalledVersion": {"NRF52": "1.2.3"}},
+        }
+        for i in reversed(range(zones))
+    ]
+
+    error_history = [
+        {
+            "Code": "E06" if i % 2 else "E00",
+            "Description": "High Discharge Temp. (Discharge Temp exceeded 138C)"
+            if i % 2
+            else "No Error",
+            "Severity": "Error" if i % 2 else "No Error",
+            "Time": (BASE_TIME - timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        for i in range(errors)
+    ]
+
+    return {
+        f"<{serial_upper}>": {
+            "Cloud": {"ConnectionState": "Connected"},
+            "SystemState": {"WCFirmwareVersion": "1.0.0"},
+            "SystemStatus_Local": {
+                "Uptime_s": rng.randint(1000, 1000000),
+                "WifiStrength_of3": 3,
+                "TouchScreen": {
+                    "LastTouchTime": _timestamp(-600),
+                    "ControllerModel": "NEO",
+                },
+                "GUI": {"ActiveScreen": "DISPLAY OFF"},
+            },
+        },
+        "AirconSystem": {
+            "MasterWCModel": "NEO",
+            "MasterSerial": serial_upper,
+            "MasterWCFirmwareVersion": "1.0.0",
+            "IndoorUnit": {"IndoorFW": "2.0.0", "NV_ModelNumber": "IND-1"},
+            "OutdoorUnit": {
+                "SoftwareVersion": "3.0.0",
+                "ModelNumber": "OUT-1",
+                "Family": "QUE",
+            },
+            "Peripherals": peripherals,
+        },
+        "Alerts": {"CleanFilter": False, "Defrosting": False},
+        "LiveAircon": {
+            "AmRunningFan": True,
+            "CoilInlet": 18.5,
+            "CompressorCapacity": 40,
+            "CompressorChasingTemperature": 24.0,
+            "CompressorLiveTemperature": 23.5,
+            "CompressorMode": "COOL",
+            "Defrost": False,
+            "DRM": False,
+            "FanPWM": 40,
+            "FanRPM": 900,
+            "OutdoorUnit": {
+                "AmbTemp": 31.0,
+                "CoilTemp": 35.0,
+                "CompPower": 1800,
+                "CompSpeed": 55,
+                "CompressorOn": True,
+                "DischargeTemp": 70.0,
+                "ReverseValvePosition": "COOL",
+            },
+        },
+        "MasterInfo": {"LiveHumidity_pc": 45.0, "LiveTemp_oC": 24.5},
+        "NV_Limits": {
+            "UserSetpoint_oC": {
+                "setCool_Min": 16,
+                "setCool_Max": 32,
+                "setHeat_Min": 10,
+                "setHeat_Max": 30,
+            }
+        },
+        "NV_SystemSettings": {
+            "SystemName": f"System {serial_upper}",
+            "LEDIndicators": {
+                "WallGlow": {"Enabled": True},
+                "OnOffButton": {"Enabled": True},
+            },
+        },
+        "RemoteZoneInfo": remote_zone_info,
+        "Servicing": {"NV_ErrorHistory": error_history},
+        "UserAirconSettings": {
+            "isOn": True,
+            "Mode": "COOL",
+            "FanMode": "AUTO+CONT",
+            "AwayMode": False,
+            "QuietMode": True,
+            "QuietModeEnabled": False,
+            "QuietModeActive": False,
+            "TurboMode": {"Supported": True, "Enabled": False},
+            "TemperatureSetpoint_Cool_oC": 24.0,
+            "TemperatureSetpoint_Heat_oC": 21.0,
+            "ZoneTemperatureSetpointVariance_oC": 2.0,
+            "EnabledZones": [i < zones for i in range(slots)],
+            "VFT": {
+                "Airflow": 400,
+                "StaticPressure": 50,
+                "SelfLearn": {"MaxStaticPressure": 120},
+            },
+        },
+    }
+
+
+def build_status(serial: str, zones: int = 8, errors: int = 4, seed: int = 0) -> dict:
+    """Build a status/latest response."""
+    return {
+        "isOnline": True,
+        "timeSinceLastContact": "00:00:05",
+        "lastStatusUpdate": _timestamp(0),
+        "lastKnownState": build_state(serial, zones=zones, errors=errors, seed=seed),
+    }
+
+
+def build_full_event(serial: str, zones: int = 8, event_id: int = 0, seed: int = 0) -> dict:
+    """Build a full-status-broadcast event."""
+    return {
+        "id": f"{serial}-{event_id}",
+        "type": "full-status-broadcast",
+        "timestamp": _timestamp(event_id),
+        "data": build_state(serial, zones=zones, seed=seed),
+    }
+
+
+def build_delta_events(
+    serial: str, zones: int = 8, count: int = 100, keys_per_event: int = 4, seed: int = 0
+) -> list[dict]:
+    """Build status-change-broadcast events touching realistic keys."""
+    rng = random.Random(seed)
+
+    def _change():
+        zone = rng.randrange(zones)
+        return rng.choice(
+            [
+                (f"RemoteZoneInfo[{zone}].LiveTemp_oC", round(rng.uniform(16, 30), 1)),
+                (f"RemoteZoneInfo[{zone}].LiveHumidity_pc", round(rng.uniform(30, 70), 1)),
+                (f"RemoteZoneInfo[{zone}].ZonePosition", rng.randint(0, 20)),
+                ("LiveAircon.OutdoorUnit.CompPower", rng.randint(0, 3000)),
+                ("LiveAircon.OutdoorUnit.CompSpeed", rng.randint(0, 100)),
+                ("LiveAircon.FanRPM", rng.randint(0, 1500)),
+                ("MasterInfo.LiveTemp_oC", round(rng.uniform(16, 30), 1)),
+                (
+                    f"AirconSystem.Peripherals[{zone}].RemainingBatteryCapacity_pc",
+                    rng.randint(20, 100),
+                ),
+            ]
+        )
+
+    events = []
+    for i in range(count):
+        data = {"@metadata": {"connectionId": "bench"}}
+        data.update(_change() for _ in range(keys_per_event))
+        events.append(
+            {
+                "id": f"{serial}-{i + 1}",
+                "type": "status-change-broadcast",
+                "timestamp": _timestamp(i + 1),
+                "data": data,
+            }
+        )
+    return events
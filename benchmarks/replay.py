@@ -0,0 +1,337 @@
+"""Replay a capture through the data layer, and the coordinator if possible.
+
+Usage:
+    python benchmarks/replay.py capture.jsonl.gz              # as fast as possible
+    python benchmarks/replay.py capture.jsonl.gz --speed 1    # as it was captured
+    python benchmarks/replay.py capture.jsonl.gz --expect-checksum <sha256>
+
+Captures are recorded with the actronair_nimbus.start_capture service. They
+start with a snapshot of every system's state, followed by every status and
+event payload received, so replaying one reproduces exactly what the
+integration saw.
+
+Each payload is merged into ActronAdvanceState as the coordinator would,
+reporting merge throughput and a checksum of the final states. With Home
+Assistant installed the capture is also fed through the coordinator itself,
+which reports how many entity updates it would have caused (estimated from
+each entity type's state paths, for every system and zone) and must finish
+on the same checksum. --speed paces payloads by when they were received:
+1 is real time, 10 ten times faster, 0 (the default) as fast as possible.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "custom_components", "actronair_nimbus")
+)
+
+from api.capture import (  # noqa: E402
+    CAPTURE_EVENTS,
+    CAPTURE_SNAPSHOT,
+    CAPTURE_STATUS,
+    CAPTURE_STREAM,
+    CaptureRecord,
+    read_capture,
+    state_checksum,
+)
+from api.data import ActronAdvanceState  # noqa: E402
+
+
+class Pacer:
+    """How long to wait before each record to replay at speed."""
+
+    def __init__(self, speed: float):
+        self.speed = speed
+        self._first_at = None
+        self._started = None
+
+    def delay(self, record: CaptureRecord) -> float:
+        if self.speed <= 0:
+            return 0
+        now = time.monotonic()
+        if self._first_at is None:
+            self._first_at, self._started = record.at, now
+        return max((record.at - self._first_at) / self.speed - (now - self._started), 0)
+
+
+def _merge_events(
+    state: ActronAdvanceState, events: list[dict], skip_older: bool = True
+) -> list:
+    changes = []
+    for event in events:
+        if skip_older and state.is_older_than_state(event):
+            continue
+        changes.extend(state.update_from_event(event) or [])
+    return changes
+
+
+def replay_states(records: list[CaptureRecord], speed: float = 0) -> dict:
+    """Merge every payload into ActronAdvanceState, as the coordinator does."""
+    pacer = Pacer(speed)
+    states: dict[str, ActronAdvanceState] = {}
+    payloads = events = changes = 0
+    merging = 0.0
+
+    for record in records:
+        time.sleep(pacer.delay(record))
+        if record.kind == CAPTURE_SNAPSHOT:
+            states = {
+                serial: ActronAdvanceState.from_snapshot(stored)
+                for serial, stored in record.payload["states"].items()
+            }
+            continue
+
+        started = time.perf_counter()
+        state = states.get(record.serial)
+        if state is None and record.kind == CAPTURE_STREAM:
+            # streams only start once a system has been refreshed
+            continue
+        state = state.copy() if state is not None else ActronAdvanceState()
+        if record.kind == CAPTURE_STATUS:
+            record_changes = state.update_from_status(record.payload)
+        elif record.kind == CAPTURE_EVENTS:
+            batch = sorted(record.payload["events"], key=lambda x: x["timestamp"])
+            # as the coordinator, only the latest events are checked against
+            # the state, newer events are merged whatever their timestamp
+            received = datetime.fromtimestamp(record.at, timezone.utc)
+            record_changes = _merge_events(
+                state, batch, skip_older=state.resume_event_id(received) is None
+            )
+            events += len(batch)
+        elif record.kind == CAPTURE_STREAM:
+            record_changes = _merge_events(state, record.payload)
+            events += len(record.payload)
+        else:
+            continue
+        states[record.serial] = state
+        merging += time.perf_counter() - started
+
+        payloads += 1
+        changes += len(record_changes)
+
+    return {
+        "payloads": payloads,
+        "events": events,
+        "changes": changes,
+        "merge_seconds": merging,
+        "payloads_per_second": payloads / merging if merging else None,
+        "events_per_second": events / merging if merging else None,
+        "checksum": state_checksum(states),
+    }
+
+
+class ReplayClient:
+    """Enough of ActronAirAPIClient for the coordinator, answering from a capture."""
+
+    def __init__(self, systems: dict):
+        from api.ledger import PendingSettingsLedger
+
+        self.systems = systems
+        self.status: dict[str, dict] = {}
+        self.events: dict[str, dict] = {}
+        self.pending_settings = PendingSettingsLedger()
+        self.settings_coalescer = SimpleNamespace(state_provider=None)
+        self.adapter = None
+
+    async def get_ac_systems(self):
+        return self.systems
+
+    async def get_ac_status(self, serial: str):
+        return self.status.pop(serial)
+
+    async def get_ac_events(self, serial: str, event_type: str, event_id: str = None):
+        return self.events.pop(serial)
+
+
+def _entity_probes() -> list[tuple[str, type]]:
+    """Every concrete entity type, by name."""
+    from actronair_nimbus import binary_sensor, climate, sensor, switch, update  # noqa: F401
+    from actronair_nimbus.entity import ActronAirNimbusEntity
+
+    probes = []
+    pending = [ActronAirNimbusEntity]
+    while pending:
+        cls = pending.pop()
+        subclasses = cls.__subclasses__()
+        if not subclasses:
+            probes.append((cls.__name__, cls))
+        pending.extend(subclasses)
+    return sorted(probes, key=lambda probe: probe[0])
+
+
+def _closed_task(hass, coro, name: str) -> asyncio.Future:
+    """Stand in for a background task without running it."""
+    coro.close()
+    future = asyncio.get_running_loop().create_future()
+    future.cancel()
+    return future
+
+
+def replay_coordinator(records: list[CaptureRecord], speed: float = 0) -> dict | None:
+    """Feed every payload through the coordinator, or None without Home Assistant."""
+    try:
+        from homeassistant.core import HomeAssistant
+        from actronair_nimbus.api.paths import compile_path
+        from actronair_nimbus.coordinator import (
+            DATA_MODE_EVENT,
+            DATA_MODE_STATUS,
+            ActronAirNimbusDataUpdateCoordinator,
+        )
+        from actronair_nimbus.polling import AdaptivePollScheduler
+    except ImportError:
+        return None
+
+    class ReplayPollScheduler(AdaptivePollScheduler):
+        """Only the system whose payload is being replayed is ever due."""
+
+        replaying: str | None = None
+
+        def due(self, serials):
+            return [serial for serial in serials if serial == self.replaying]
+
+    async def run(config_dir: str) -> dict:
+        hass = HomeAssistant(config_dir)
+        config_entry = SimpleNamespace(
+            entry_id="replay",
+            options={},
+            # events come from the capture, not from streams
+            async_create_background_task=_closed_task,
+            # the coordinator registers its shutdown, which is called directly
+            async_on_unload=lambda func: None,
+            # payloads are replayed by refreshing directly, not on a timer
+            pref_disable_polling=True,
+        )
+        snapshot = records[0].payload
+        client = ReplayClient(snapshot["systems"])
+        coordinator = ActronAirNimbusDataUpdateCoordinator(
+            hass=hass, config_entry=config_entry, actron_api_client=client
+        )
+        coordinator.poll_scheduler = scheduler = ReplayPollScheduler()
+        coordinator.restore(snapshot)
+
+        probes = _entity_probes()
+        compiled: dict[tuple[str, int | None], list] = {}
+        updates = Counter()
+
+        def paths(cls, zone_id):
+            if cls._state_paths is None:
+                return None
+            key = (cls.__name__, zone_id)
+            if key not in compiled:
+                compiled[key] = [
+                    compile_path(path.format(zone_id=zone_id)) for path in cls._state_paths
+                ]
+            return compiled[key]
+
+        def count_updates():
+            for serial, state in coordinator.data.items():
+                for name, cls in probes:
+                    per_zone = any("{zone_id}" in path for path in cls._state_paths or ())
+                    for zone_id in state.index.existing_zones if per_zone else (None,):
+                        if cls._always_update or coordinator.has_changed(
+                            serial, paths(cls, zone_id)
+                        ):
+                            updates[name] += 1
+
+        coordinator.async_add_listener(count_updates)
+
+        pacer = Pacer(speed)
+        merging = 0.0
+        for record in records[1:]:
+            await asyncio.sleep(pacer.delay(record))
+            started = time.perf_counter()
+            if record.kind == CAPTURE_STREAM:
+                coordinator._ingest_events(record.serial, record.payload)
+            elif record.kind in (CAPTURE_STATUS, CAPTURE_EVENTS):
+                if record.kind == CAPTURE_STATUS:
+                    coordinator.data_mode = DATA_MODE_STATUS
+                    client.status[record.serial] = record.payload
+                else:
+                    coordinator.data_mode = DATA_MODE_EVENT
+                    client.events[record.serial] = record.payload
+                scheduler.replaying = record.serial
+                await coordinator.async_refresh()
+            merging += time.perf_counter() - started
+
+        result = {
+            "merge_seconds": merging,
+            "events": sum(stats.events_merged for stats in coordinator.stats.values()),
+            "changes": sum(stats.changes_merged for stats in coordinator.stats.values()),
+            "entity_updates": sum(updates.values()),
+            "entity_updates_by_type": dict(sorted(updates.items())),
+            "checksum": state_checksum(coordinator.confirmed),
+        }
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+        return result
+
+    # keep anything Home Assistant writes out of the way
+    with tempfile.TemporaryDirectory() as config_dir:
+        return asyncio.run(run(config_dir))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", help="a .jsonl.gz capture")
+    parser.add_argument("--speed", type=float, default=0)
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    parser.add_argument("--expect-checksum", help="fail unless the final states match")
+    parser.add_argument(
+        "--no-coordinator",
+        action="store_true",
+        help="only replay through the data layer",
+    )
+    args = parser.parse_args()
+
+    records = list(read_capture(args.capture))
+    if not records or records[0].kind != CAPTURE_SNAPSHOT:
+        sys.exit(f"{args.capture} doesn't start with a snapshot, is it a capture?")
+
+    span = timedelta(seconds=records[-1].at - records[0].at)
+    print(
+        f"{len(records) - 1} payloads captured over {span} from "
+        f"{datetime.fromtimestamp(records[0].at, timezone.utc):%Y-%m-%d %H:%M:%S} UTC"
+    )
+
+    report = {"states": replay_states(records, args.speed)}
+    if not args.no_coordinator:
+        report["coordinator"] = replay_coordinator(records, args.speed)
+
+    for name, result in report.items():
+        if result is None:
+            print(f"\n{name}: skipped, Home Assistant isn't installed")
+            continue
+        print(f"\n{name}:")
+        for key, value in result.items():
+            if key == "entity_updates_by_type":
+                for entity_type, count in value.items():
+                    print(f"  {entity_type:55} {count}")
+            elif isinstance(value, float):
+                print(f"  {key:22} {value:.4f}")
+            else:
+                print(f"  {key:22} {value}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    checksums = {result["checksum"] for result in report.values() if result is not None}
+    if len(checksums) > 1:
+        sys.exit("\nFAILED: the coordinator finished on different states to the data layer")
+    if args.expect_checksum and args.expect_checksum not in checksums:
+        sys.exit(f"\nFAILED: final states don't match {args.expect_checksum}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""A local stand-in for the Nimbus cloud, with latency and fault injection.
+
+Usage:
+    python benchmarks/standin.py [--port 8080] [--systems 2] [--zones 8]
+        [--status-file status.json ...] [--latency 0.2] [--jitter 0.1]
+        [--error-rate 0.05] [--throttle-rate 0.05] [--slow-body 1.0]
+
+Then point the integration (the host in the config flow) or an
+ActronAirAPIClient (base_url=) at http://localhost:8080.
+
+Systems come from status/latest responses saved with --status-file, or
+are synthetic (see fixtures.py). Each system's state keeps changing:
+every --event-interval seconds a status-change-broadcast event is
+generated and applied, and settings sent with cmds/send are applied and
+broadcast the same way. That makes events/newer, status/latest and
+commands all behave as they would against the real cloud.
+
+Faults are injected before any route is handled. They are independent
+and can be combined:
+- --latency, --jitter: add a delay to every response
+- --error-rate: the fraction of requests answered with a 500
+- --throttle-rate: the fraction answered with a 429 and Retry-After
+- --slow-body: spread each response body over this many seconds
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import sys
+import time
+
+from collections import deque
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fixtures import build_delta_events, build_status, serial_for  # noqa: E402
+
+# how many events each system remembers, for events/newer and events/older
+EVENT_HISTORY_SIZE = 500
+# how many events events/latest and events/older return at most
+EVENT_PAGE_SIZE = 20
+
+TOKEN_LIFETIME_SECONDS = 3600
+
+API = "/api/v0"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _set_in(state, key: str, value) -> None:
+    """Set a dotted/indexed event key (e.g. RemoteZoneInfo[3].LiveTemp_oC) in place."""
+    parts = [
+        int(part) if part.isdigit() else part
+        for part in key.replace("[", ".").replace("]", "").split(".")
+        if part
+    ]
+    node = state
+    for part in parts[:-1]:
+        node = node[part]
+    node[parts[-1]] = value
+
+
+class SimulatedSystem:
+    """One AC system - its state and the events that have changed it."""
+
+    def __init__(self, serial: str, status: dict, zones: int, seed: int):
+        self.serial = serial
+        self.status = status
+        self.events: deque[dict] = deque(maxlen=EVENT_HISTORY_SIZE)
+        self._next_id = 1
+
+        # a pool of realistic changes to draw from as time passes
+        self._changes = build_delta_events(serial, zones=zones, count=200, seed=seed)
+        self._next_change = 0
+        self._last_tick = time.monotonic()
+
+        self.broadcast("full-status-broadcast", copy.deepcopy(status["lastKnownState"]))
+
+    def broadcast(self, event_type: str, data: dict) -> dict:
+        event = {
+            "id": str(self._next_id),
+            "type": event_type,
+            "timestamp": _now(),
+            "data": data,
+        }
+        self._next_id += 1
+        self.events.append(event)
+        self.status["lastStatusUpdate"] = event["timestamp"]
+        return event
+
+    def apply(self, data: dict) -> None:
+        """Apply changes to the state and broadcast them."""
+        for key, value in data.items():
+            if key.startswith("@"):
+                continue
+            try:
+                _set_in(self.status["lastKnownState"], key, value)
+            except (KeyError, IndexError, TypeError):
+                continue
+        self.broadcast("status-change-broadcast", data)
+
+    def tick(self, event_interval: float) -> None:
+        """Generate the events that would have happened since the last tick."""
+        if event_interval <= 0:
+            return
+        now = time.monotonic()
+        while now - self._last_tick >= event_interval:
+            self._last_tick += event_interval
+            change = self._changes[self._next_change % len(self._changes)]
+            self._next_change += 1
+            self.apply(dict(change["data"]))
+
+    def events_after(self, event_id: str) -> list[dict]:
+        position = self._position(event_id)
+        return list(self.events)[position + 1 :] if position is not None else list(self.events)
+
+    def events_before(self, event_id: str) -> list[dict]:
+        position = self._position(event_id)
+        events = list(self.events)[: position if position is not None else 0]
+        return events[-EVENT_PAGE_SIZE:]
+
+    def _position(self, event_id: str) -> int | None:
+        for position, event in enumerate(self.events):
+            if event["id"] == event_id:
+                return position
+        return None
+
+
+class NimbusStandIn:
+    """The stand-in cloud, as an aiohttp application."""
+
+    def __init__(
+        self,
+        systems: list[SimulatedSystem],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        slow_body: float = 0.0,
+        event_interval: float = 5.0,
+        seed: int = 0,
+    ):
+        self.systems = {system.serial: system for system in systems}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.slow_body = slow_body
+        self.event_interval = event_interval
+        self._rng = random.Random(seed)
+        self._tokens: dict[str, float] = {}
+
+        # requests handled, by route, and faults injected
+        self.counts: dict[str, int] = {}
+
+    @classmethod
+    def synthetic(cls, systems: int = 1, zones: int = 8, seed: int = 0, **kwargs):
+        return cls(
+            [
+                SimulatedSystem(
+                    serial_for(index),
+                    build_status(serial_for(index), zones=zones, seed=seed + index),
+                    zones=zones,
+                    seed=seed + index,
+                )
+                for index in range(systems)
+            ],
+            seed=seed,
+            **kwargs,
+        )
+
+    @classmethod
+    def from_status_files(cls, paths: list[str], seed: int = 0, **kwargs):
+        systems = []
+        for index, path in enumerate(paths):
+            with open(path) as file:
+                status = json.load(file)
+            state = status["lastKnownState"]
+            # the wall controller's own section is keyed by its serial, e.g. "<24I06570>"
+            serial = next(key for key in state if key.startswith("<")).strip("<>").lower()
+            zones = sum(1 for zone in state["RemoteZoneInfo"] if zone.get("NV_Exists"))
+            systems.append(SimulatedSystem(serial, status, zones=max(zones, 1), seed=seed + index))
+        return cls(systems, seed=seed, **kwargs)
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._faults, self._auth])
+        app.add_routes(
+            [
+                web.post(f"{API}/oauth/token", self.token),
+                web.get(f"{API}/client/ac-systems", self.ac_systems),
+                web.get(f"{API}/client/ac-systems/status/latest", self.status_latest),
+                web.get(f"{API}/client/ac-systems/events/latest", self.events_latest),
+                web.get(f"{API}/client/ac-systems/events/newer", self.events_newer),
+                web.get(f"{API}/client/ac-systems/events/older", self.events_older),
+                web.post(f"{API}/client/ac-systems/cmds/send", self.send_command),
+            ]
+        )
+        return app
+
+    def _count(self, name: str) -> None:
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    @web.middleware
+    async def _faults(self, request: web.Request, handler):
+        delay = self.latency + self._rng.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self._rng.random() < self.throttle_rate:
+            self._count("fault:429")
+            return web.json_response(
+                {"message": "Too many requests"},
+                status=429,
+                headers={"Retry-After": str(self._rng.randint(1, 5))},
+            )
+        if self._rng.random() < self.error_rate:
+            self._count("fault:500")
+            return web.json_response({"message": "Internal server error"}, status=500)
+
+        response = await handler(request)
+        if self.slow_body > 0 and isinstance(response, web.Response) and response.body:
+            return await self._slow(request, response)
+        return response
+
+    @web.middleware
+    async def _auth(self, request: web.Request, handler):
+        if request.path.startswith(f"{API}/client/"):
+            token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+            if self._tokens.get(token, 0) < time.monotonic():
+                self._count("fault:401")
+                return web.json_response({"message": "Unauthorized"}, status=401)
+        self._count(request.path)
+        return await handler(request)
+
+    async def _slow(self, request: web.Request, response: web.Response) -> web.StreamResponse:
+        """Dribble a body out in chunks over slow_body seconds."""
+        body = response.body
+        stream = web.StreamResponse(status=response.status, headers=response.headers)
+        stream.content_length = len(body)
+        await stream.prepare(request)
+        chunks = 10
+        size = max(len(body) // chunks, 1)
+        for start in range(0, len(body), size):
+            await stream.write(body[start : start + size])
+            await asyncio.sleep(self.slow_body / chunks)
+        await stream.write_eof()
+        return stream
+
+    def _system(self, request: web.Request) -> SimulatedSystem:
+        system = self.systems.get(request.query.get("serial", "").lower())
+        if system is None:
+            raise web.HTTPNotFound(text="Unknown serial")
+        system.tick(self.event_interval)
+        return system
+
+    async def token(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        if form.get("grant_type") != "refresh_token" or not form.get("refresh_token"):
+            return web.json_response({"error": "invalid_grant"}, status=400)
+        token = f"standin-{self._rng.getrandbits(64):016x}"
+        self._tokens[token] = time.monotonic() + TOKEN_LIFETIME_SECONDS
+        return web.json_response(
+            {
+                "access_token": token,
+                "token_type": "bearer",
+                "expires_in": TOKEN_LIFETIME_SECONDS,
+            }
+        )
+
+    async def ac_systems(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "_embedded": {
+                    "ac-system": [
+                        {
+                            "type": "neo",
+                            "serial": serial,
+                            "description": f"NEO_{serial.upper()}",
+                        }
+                        for serial in self.systems
+                    ]
+                }
+            }
+        )
+
+    async def status_latest(self, request: web.Request) -> web.Response:
+        return web.json_response(self._system(request).status)
+
+    async def events_latest(self, request: web.Request) -> web.Response:
+        events = list(self._system(request).events)[-EVENT_PAGE_SIZE:]
+        # newest first, as the real API does
+        return web.json_response({"events": events[::-1]})
+
+    async def events_newer(self, request: web.Request) -> web.Response:
+        system = self._system(request)
+        events = system.events_after(request.query.get("newerThanEventId", ""))
+        return web.json_response({"events": events[::-1]})
+
+    async def events_older(self, request: web.Request) -> web.Response:
+        system = self._system(request)
+        events = system.events_before(request.query.get("olderThanEventId", ""))
+        return web.json_response({"events": events[::-1]})
+
+    async def send_command(self, request: web.Request) -> web.Response:
+        system = self._system(request)
+        command = (await request.json()).get("command", {})
+        if command.get("type") != "set-settings":
+            return web.json_response({"message": "Unsupported command"}, status=400)
+        system.apply({key: value for key, value in command.items() if key != "type"})
+        return web.json_response({"type": "ack"})
+
+
+async def start(stand_in: NimbusStandIn, host: str = "localhost", port: int = 8080) -> web.AppRunner:
+    """Start serving, returning the runner to clean up with."""
+    runner = web.AppRunner(stand_in.app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--systems", type=int, default=1)
+    parser.add_argument("--zones", type=int, default=8)
+    parser.add_argument(
+        "--status-file",
+        action="append",
+        default=[],
+        help="a saved status/latest response to serve (repeat for more systems)",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--slow-body", type=float, default=0.0, help="seconds")
+    parser.add_argument("--event-interval", type=float, default=5.0, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    faults = dict(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        slow_body=args.slow_body,
+        event_interval=args.event_interval,
+    )
+    if args.status_file:
+        stand_in = NimbusStandIn.from_status_files(args.status_file, seed=args.seed, **faults)
+    else:
+        stand_in = NimbusStandIn.synthetic(
+            systems=args.systems, zones=args.zones, seed=args.seed, **faults
+        )
+
+    print(f"Serving {len(stand_in.systems)} systems on http://{args.host}:{args.port}")
+    web.run_app(stand_in.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
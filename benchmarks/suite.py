@@ -0,0 +1,418 @@
+"""Micro-benchmarks for the hot paths of the api data layer.
+
+Usage:
+    python benchmarks/suite.py                      # run and compare to baseline.json
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --update-baseline    # accept the current numbers
+    python benchmarks/suite.py --runs 5 --update-baseline   # as baseline.json was made
+
+Every case is run against synthetic fixtures of several sizes (see
+fixtures.py). Results are written as JSON, keyed by case and size, and
+compared against a baseline - any case more than --tolerance slower than
+its baseline is reported and the run exits non-zero, as is any case with a
+baseline that couldn't be run (the coordinator cases need Home Assistant).
+
+Timings depend on the machine. To take out most of the difference every
+result is also divided by the time of a fixed reference workload run at the
+start, and it is these relative costs that are compared. Even so the
+baseline is best regenerated (--update-baseline) on the machine the
+comparison runs on. A single run can be thrown by whatever else the
+machine was doing, so --runs repeats the whole suite and reports the
+median of each case; the settings used are recorded with the results.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "custom_components", "actronair_nimbus")
+)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from api.data import ActronAdvanceState  # noqa: E402
+from api.parser import ParsedData  # noqa: E402
+from api.paths import ChangeSet  # noqa: E402
+from fixtures import (  # noqa: E402
+    build_delta_events,
+    build_full_event,
+    build_status,
+    serial_for,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# how much slower than the baseline a case may be before it counts as a regression
+DEFAULT_TOLERANCE = 0.5
+
+ZONE_COUNTS = (1, 4, 8, 16)
+SYSTEM_COUNTS = (1, 4, 8)
+
+# how long to spend timing each repeat, and how many repeats to take the best of
+TARGET_SECONDS = 0.2
+REPEATS = 7
+
+
+def _time_per_op(func, setup=None) -> float:
+    """Best of REPEATS, in microseconds per call of func.
+
+    setup, if given, is called before each repeat and its result passed to
+    func on every call, so per-repeat state doesn't leak between repeats.
+    """
+    # work out how many calls fill TARGET_SECONDS
+    arg = setup() if setup else None
+    count = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(count):
+            func(arg)
+        elapsed = time.perf_counter() - start
+        if elapsed >= TARGET_SECONDS / 10:
+            break
+        count *= 2
+    count = max(int(count * TARGET_SECONDS / elapsed), 1)
+
+    best = float("inf")
+    for _ in range(REPEATS):
+        arg = setup() if setup else None
+        # as timeit does, keep garbage collection from landing in one repeat
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(count):
+                func(arg)
+            best = min(best, (time.perf_counter() - start) / count)
+        finally:
+            gc.enable()
+    return best * 1e6
+
+
+def bench_reference() -> float:
+    """A fixed pure Python workload that results are measured relative to."""
+    items = [{"key": f"item{index}", "value": index % 17} for index in range(200)]
+
+    def run(_):
+        ordered = sorted(items, key=lambda item: (item["value"], item["key"]))
+        return {item["key"]: item["value"] for item in ordered}
+
+    return _time_per_op(run)
+
+
+def bench_update_from_status(zones: int) -> float:
+    statuses = [build_status(serial_for(1), zones=zones, seed=seed) for seed in range(2)]
+    state = ActronAdvanceState()
+    flip = [0]
+
+    def run(_):
+        # alternate between two statuses so there is always something to diff
+        flip[0] ^= 1
+        state.copy().update_from_status(statuses[flip[0]])
+
+    state.update_from_status(statuses[0])
+    return _time_per_op(run)
+
+
+def bench_update_from_event_full(zones: int) -> float:
+    events = [
+        build_full_event(serial_for(1), zones=zones, event_id=seed, seed=seed)
+        for seed in range(2)
+    ]
+    state = ActronAdvanceState()
+    state.update_from_event(events[0])
+    flip = [0]
+
+    def run(_):
+        flip[0] ^= 1
+        state.copy().update_from_event(events[flip[0]])
+
+    return _time_per_op(run)
+
+
+def bench_update_from_event_delta(zones: int) -> float:
+    serial = serial_for(1)
+    full = build_full_event(serial, zones=zones)
+    events = build_delta_events(serial, zones=zones, count=500, keys_per_event=4)
+
+    def setup():
+        state = ActronAdvanceState()
+        state.update_from_event(full)
+        return SimpleNamespace(state=state, position=0)
+
+    def run(context):
+        event = events[context.position % len(events)]
+        context.position += 1
+        # as the coordinator does - copy, then merge into the copy
+        context.state = context.state.copy()
+        context.state.update_from_event(event)
+
+    return _time_per_op(run, setup)
+
+
+def bench_parse_data(zones: int) -> float:
+    status = build_status(serial_for(1), zones=zones)
+    return _time_per_op(lambda _: ParsedData._parse_data(status))
+
+
+def bench_apply_changes(zones: int) -> float:
+    serial = serial_for(1)
+    status = build_status(serial, zones=zones)
+    events = build_delta_events(serial, zones=zones, count=500, keys_per_event=4)
+
+    def setup():
+        state = ActronAdvanceState()
+        state.update_from_status(status)
+        return SimpleNamespace(
+            state=state, parsed=ParsedData.from_state(state), position=0
+        )
+
+    def run(context):
+        event = events[context.position % len(events)]
+        context.position += 1
+        context.state = context.state.copy()
+        changes = context.state.update_from_event(event)
+        context.parsed.apply_changes(
+            context.state, ChangeSet(key for key, _, _ in changes)
+        )
+
+    return _time_per_op(run, setup)
+
+
+def check_apply_changes(zones: int) -> list[str]:
+    """Describe every delta after which apply_changes disagrees with a full parse."""
+    serial = serial_for(1)
+    state = ActronAdvanceState()
+    state.update_from_status(build_status(serial, zones=zones))
+    parsed = ParsedData.from_state(state)
+
+    failures = []
+    updates = [
+        (f"event {event['id']}", lambda state, event=event: state.update_from_event(event))
+        for event in build_delta_events(serial, zones=zones, count=200, keys_per_event=2)
+    ]
+    updates.append(
+        (
+            "full status",
+            lambda state: state.update_from_status(build_status(serial, zones=zones, seed=1)),
+        )
+    )
+    for name, update in updates:
+        state = state.copy()
+        changes = ChangeSet(key for key, _, _ in update(state))
+        parsed.apply_changes(state, changes)
+        if parsed != ParsedData.from_state(state):
+            failures.append(f"apply_changes[zones={zones}] differs from a full parse after {name}")
+            parsed = ParsedData.from_state(state)
+    return failures
+
+
+class FakeClient:
+    """Enough of ActronAirAPIClient for the coordinator, answering from fixtures."""
+
+    def __init__(self, systems: int, zones: int):
+        from api.ledger import PendingSettingsLedger
+
+        self.serials = [serial_for(index) for index in range(systems)]
+        self.statuses = {
+            serial: [build_status(serial, zones=zones, seed=seed) for seed in range(2)]
+            for serial in self.serials
+        }
+        self.calls = {serial: 0 for serial in self.serials}
+        self.pending_settings = PendingSettingsLedger()
+        self.settings_coalescer = SimpleNamespace(state_provider=None)
+        self.adapter = None
+
+    async def get_ac_systems(self):
+        return {"_embedded": {"ac-system": [{"serial": serial} for serial in self.serials]}}
+
+    async def get_ac_status(self, serial: str):
+        # alternate between two statuses so every refresh has changes to merge
+        self.calls[serial] += 1
+        return self.statuses[serial][self.calls[serial] % 2]
+
+
+def bench_async_update_data(systems: int, zones: int) -> float | None:
+    """Time a coordinator refresh of every system, or None without Home Assistant."""
+    try:
+        from homeassistant.core import HomeAssistant
+        from actronair_nimbus.coordinator import ActronAirNimbusDataUpdateCoordinator
+    except ImportError:
+        return None
+
+    async def run_all(config_dir: str) -> float:
+        hass = HomeAssistant(config_dir)
+        config_entry = SimpleNamespace(
+            entry_id="benchmark",
+            options={},
+            # event streams aren't part of what's being measured
+            async_create_background_task=lambda hass, coro, name: coro.close(),
+            # the coordinator registers its shutdown, which is called directly
+            async_on_unload=lambda func: None,
+        )
+        client = FakeClient(systems, zones)
+        coordinator = ActronAirNimbusDataUpdateCoordinator(
+            hass=hass, config_entry=config_entry, actron_api_client=client
+        )
+        await coordinator._async_setup()
+
+        async def refresh():
+            coordinator._refresh_all = True
+            coordinator.data = await coordinator._async_update_data()
+
+        # warm up so the first (everything is new) refresh isn't measured
+        await refresh()
+
+        count = 50
+        best = float("inf")
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            for _ in range(count):
+                await refresh()
+            best = min(best, (time.perf_counter() - start) / count)
+        await hass.async_stop(force=True)
+        return best * 1e6
+
+    # keep the snapshots the coordinator saves out of the way
+    with tempfile.TemporaryDirectory() as config_dir:
+        return asyncio.run(run_all(config_dir))
+
+
+def run_suite() -> dict[str, float | None]:
+    """Run every case, returning microseconds per operation by case id."""
+    results = {}
+    for zones in ZONE_COUNTS:
+        results[f"update_from_status[zones={zones}]"] = bench_update_from_status(zones)
+        results[f"update_from_event_full[zones={zones}]"] = bench_update_from_event_full(zones)
+        results[f"update_from_event_delta[zones={zones}]"] = bench_update_from_event_delta(zones)
+        results[f"parse_data[zones={zones}]"] = bench_parse_data(zones)
+        results[f"apply_changes[zones={zones}]"] = bench_apply_changes(zones)
+    for systems in SYSTEM_COUNTS:
+        for zones in (1, 8, 16):
+            results[f"async_update_data[systems={systems},zones={zones}]"] = (
+                bench_async_update_data(systems, zones)
+            )
+    return results
+
+
+def _median(values: list[float | None]) -> float | None:
+    """The median, or None if any run skipped the case."""
+    if any(value is None for value in values):
+        return None
+    return statistics.median(values)
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Describe every case that is more than tolerance slower than baseline,
+    or that was skipped despite having a baseline.
+
+    Cases are compared relative to each run's reference workload.
+    """
+    scale = baseline["reference"] / report["reference"]
+    regressions = []
+    for case, us_per_op in report["results"].items():
+        expected = baseline["results"].get(case)
+        if expected is None:
+            continue
+        if us_per_op is None:
+            # a case that can't run here can't be shown not to have regressed
+            regressions.append(f"{case}: skipped, but has a baseline of {expected:.1f}us/op")
+            continue
+        relative = us_per_op * scale
+        if relative > expected * (1 + tolerance):
+            regressions.append(
+                f"{case}: {us_per_op:.1f}us/op ({relative:.1f} relative) vs baseline "
+                f"{expected:.1f}us/op (+{(relative / expected - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="write the results to the baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=1,
+        help="run the suite this many times and report the median of each case",
+    )
+    args = parser.parse_args()
+
+    # a fast wrong answer is no use, check the incremental paths first
+    failures = [failure for zones in ZONE_COUNTS for failure in check_apply_changes(zones)]
+    if failures:
+        print("INCORRECT:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+    references = []
+    runs = []
+    for _ in range(args.runs):
+        references.append(bench_reference())
+        runs.append(run_suite())
+    results = {case: _median([run[case] for run in runs]) for case in runs[0]}
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "unit": "us/op",
+        "settings": {
+            "runs": args.runs,
+            "repeats": REPEATS,
+            "target_seconds": TARGET_SECONDS,
+            "statistic": "median of runs of the best of repeats",
+        },
+        "reference": statistics.median(references),
+        "results": results,
+    }
+
+    for case, us_per_op in results.items():
+        value = "skipped" if us_per_op is None else f"{us_per_op:10.1f} us/op"
+        print(f"{case:55} {value}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --update-baseline to create one")
+        return
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+
+    regressions = compare(report, baseline, args.tolerance)
+    if regressions:
+        print(f"\nREGRESSIONS (more than {args.tolerance:.0%} slower than baseline):")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+    print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import logging
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     Platform,
@@ -11,11 +13,19 @@ from homeassistant.const import (
     CONF_API_TOKEN,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
-from .coordinator import ActronAirNimbusDataUpdateCoordinator
+from .const import DOMAIN, NIMBUS_DEFAULT_URL, TOKEN_STORAGE_KEY, TOKEN_STORAGE_VERSION
+from .coordinator import ActronAirNimbusDataUpdateCoordinator, snapshot_store
 from .api.adapter import APIAdapter
 from .api.client import ActronAirAPIClient
 from .api.data import ActronAdvanceState
+from .services import async_setup_services
+
+_LOGGER = logging.getLogger(__name__)
 
 # TODO List the platforms that you want to support.
 # For your initial PR, limit it to 1 platform.
@@ -32,6 +42,15 @@ _PLATFORMS: list[Platform] = [
 type ActronAirNimbusConfigEntry = ConfigEntry[ActronAirNimbusDataUpdateCoordinator]
 
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Actron Air Nimbus integration."""
+    async_setup_services(hass)
+    return True
+
+
 # TODO Update entry annotation
 async def async_setup_entry(
     hass: HomeAssistant, entry: ActronAirNimbusConfigEntry
@@ -49,25 +68,116 @@ async def async_setup_entry(
     # )
     actron_api_adapter = APIAdapter(max_attempts=5)
     actron_api_client = ActronAirAPIClient(
-        adapter=actron_api_adapter, pairing_token=entry.data[CONF_API_TOKEN]
+        adapter=actron_api_adapter,
+        pairing_token=entry.data[CONF_API_TOKEN],
+        base_url=entry.data.get(CONF_HOST) or NIMBUS_DEFAULT_URL,
     )
+    await _async_setup_token_storage(hass, entry, actron_api_client)
 
     coordinator = ActronAirNimbusDataUpdateCoordinator(
         hass=hass,
         config_entry=entry,
         actron_api_client=actron_api_client,
     )
-    await coordinator.async_config_entry_first_refresh()
+    # start from what we knew before a restart if we can, so entities are
+    # available straight away rather than waiting on the cloud
+    restored = await coordinator.async_restore_snapshot()
+    if not restored:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            # setup will be retried with a fresh adapter so don't leak this session
+            await actron_api_client.close()
+            raise
     entry.runtime_data = coordinator
 
+    # keep the token fresh so no request has to wait on a refresh, stopping
+    # when the entry is unloaded
+    actron_api_client.start_token_renewal(
+        lambda coro: entry.async_create_background_task(
+            hass, coro, f"{DOMAIN} token renewal {entry.entry_id}"
+        )
+    )
+
     await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
 
+    if restored:
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh_restored(),
+            f"{DOMAIN} refresh {entry.entry_id}",
+        )
+
+    # poll intervals are only read at setup so reload when they change
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+async def _async_update_listener(
+    hass: HomeAssistant, entry: ActronAirNimbusConfigEntry
+) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 # TODO Update entry annotation
 async def async_unload_entry(
     hass: HomeAssistant, entry: ActronAirNimbusConfigEntry
 ) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, _PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, _PLATFORMS)
+
+    if unload_ok:
+        # stop token renewal and release the pooled connections
+        await entry.runtime_data.actron_api_client.close()
+
+    return unload_ok
+
+
+async def async_remove_entry(
+    hass: HomeAssistant, entry: ActronAirNimbusConfigEntry
+) -> None:
+    """Remove anything stored for a config entry."""
+    await _token_store(hass, entry).async_remove()
+    await snapshot_store(hass, entry).async_remove()
+
+
+def _token_store(hass: HomeAssistant, entry: ActronAirNimbusConfigEntry) -> Store:
+    return Store(
+        hass, TOKEN_STORAGE_VERSION, TOKEN_STORAGE_KEY.format(entry_id=entry.entry_id)
+    )
+
+
+async def _async_setup_token_storage(
+    hass: HomeAssistant,
+    entry: ActronAirNimbusConfigEntry,
+    actron_api_client: ActronAirAPIClient,
+) -> None:
+    """Reuse the access token from before a restart and save any new one."""
+    store = _token_store(hass, entry)
+
+    stored = await store.async_load()
+    if stored is not None:
+        expires_at = dt_util.parse_datetime(stored["expires_at"])
+        if expires_at is None:
+            _LOGGER.debug("Discarding stored access token with an unreadable expiry")
+        else:
+            # tokens used to be saved with a naive expiry, in UTC
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=dt_util.UTC)
+            actron_api_client.restore_access_token(
+                access_token=stored["access_token"],
+                token_expiration_timestamp=expires_at,
+            )
+
+    def _token_refreshed(access_token, token_expiration_timestamp) -> None:
+        store.async_delay_save(
+            lambda: {
+                "access_token": access_token,
+                "expires_at": token_expiration_timestamp.isoformat(),
+            },
+            1,
+        )
+
+    actron_api_client.token_listener = _token_refreshed
@@ -1,53 +1,177 @@
 import aiohttp
 import asyncio
+import json
 import logging
 
-from asyncio import Lock
+from typing import Any, Callable
+
+from .metrics import RequestMetrics
+from .retry import CircuitBreaker, RetryPolicy
+from .scheduler import RequestScheduler
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# decodes a response body - orjson is much quicker on full status payloads
+DEFAULT_DECODER: Callable[[bytes], Any] = orjson.loads if orjson else json.loads
+
+# connection pool tuning for the long-lived session - everything goes to a
+# single host so keep a small number of warm connections to it
+CONNECTION_LIMIT_PER_HOST = 4
+KEEPALIVE_TIMEOUT_SECONDS = 60
+DNS_CACHE_TTL_SECONDS = 300
+
 
 class APIAdapter:
-    def __init__(self, max_attempts=3):
-        self.max_attempts = max_attempts
-        self.lock = Lock()
+    def __init__(
+        self,
+        max_attempts=3,
+        session: aiohttp.ClientSession = None,
+        max_concurrent_reads: int = 4,
+        retry_policy: RetryPolicy = None,
+        circuit_breaker: CircuitBreaker = None,
+        decoder: Callable[[bytes], Any] = DEFAULT_DECODER,
+    ):
+        self.decoder = decoder
+        self.metrics = RequestMetrics()
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=max_attempts)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.scheduler = RequestScheduler(max_concurrent_reads=max_concurrent_reads)
+
+        # a session passed in is borrowed (e.g. Home Assistant's shared session)
+        # and is never closed by us, otherwise we lazily create and own one
+        self._session = session
+        self._owns_session = session is None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS,
+                ttl_dns_cache=DNS_CACHE_TTL_SECONDS,
+                use_dns_cache=True,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        """Close the underlying session if we created it."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    async def _execute_request(
+        self, session, method, url, endpoint: str = None, serial: str = None, **kwargs
+    ):
+        policy = self.retry_policy
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + policy.overall_timeout
+        self.metrics.record_request(endpoint or url, serial)
 
-    async def _execute_request(self, session, method, url, **kwargs):
         attempt = 0
-        while attempt < self.max_attempts:
+        while True:
+            self.circuit_breaker.before_request()
+            started_at = None
             try:
-                async with session.request(
-                    method=method, url=url, raise_for_status=True, **kwargs
-                ) as response:
-                    logger.debug(
-                        f"Response status: {response.status}, Response text: {await response.text()}"
+                # only hold a slot while on the wire, never while backing off,
+                # and give up waiting for one at the deadline
+                async with self.scheduler.slot(method, deadline):
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        # a zero timeout would mean no timeout at all to aiohttp
+                        raise asyncio.TimeoutError()
+                    timeout = aiohttp.ClientTimeout(
+                        total=min(policy.attempt_timeout, remaining)
+                    )
+                    started_at = loop.time()
+                    async with session.request(
+                        method=method,
+                        url=url,
+                        raise_for_status=True,
+                        timeout=timeout,
+                        **kwargs,
+                    ) as response:
+                        # read and decode the body exactly once, while still connected
+                        body = await response.read()
+                        self.metrics.record(
+                            endpoint or url,
+                            serial,
+                            latency=loop.time() - started_at,
+                            bytes_received=len(body),
+                        )
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(
+                                f"Response status: {response.status}, Response text: {body.decode(errors='replace')}"
+                            )
+                        self.circuit_breaker.record_success()
+                        return self.decoder(body) if body else None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.metrics.record(
+                    endpoint or url,
+                    serial,
+                    latency=None if started_at is None else loop.time() - started_at,
+                    error=str(getattr(e, "status", None) or type(e).__name__),
+                )
+                if started_at is None:
+                    # out of time before it could be sent, which says nothing
+                    # about whether the API is up
+                    self.circuit_breaker.record_abandoned()
+                    logger.warning(
+                        f"API call ran out of time waiting to be sent, after {attempt} attempts."
                     )
-                    return response
-            except aiohttp.ClientError as e:
-                # at max attempts or an uretryable error raise exception and stop
-                if attempt == self.max_attempts - 1 or not self._exception_is_retryable(
-                    e
+                    raise e from None
+
+                attempt += 1
+                retryable = policy.is_retryable(e)
+                if retryable:
+                    self.circuit_breaker.record_failure()
+                else:
+                    # the API answered, it just didn't like the request
+                    self.circuit_breaker.record_success()
+
+                wait_time = policy.backoff(attempt - 1, policy.retry_after(e))
+                # at max attempts, out of time or an unretryable error raise exception and stop
+                if (
+                    not retryable
+                    or attempt >= policy.max_attempts
+                    or loop.time() + wait_time >= deadline
                 ):
                     logger.exception(f"API call failed after {attempt} attempts.")
                     raise e from None
 
-                wait_time = 2**attempt
-                attempt += 1
+                self.metrics.record_retry(endpoint or url, serial)
                 logger.warning(
-                    f"API call encountered an error: {e}. Attempt {attempt}/{self.max_attempts}, retrying after {wait_time} seconds..."
+                    f"API call encountered an error: {e!r}. Attempt {attempt}/{policy.max_attempts}, retrying after {wait_time:.1f} seconds..."
                 )
-                await asyncio.sleep(wait_time)
-        return None
-
-    async def request(self, method, url, **kwargs):
-        async with self.lock, aiohttp.ClientSession() as session:
-            return await self._execute_request(session, method, url, **kwargs)
-        return None
-
-    def _exception_is_retryable(self, e):
-        # if our exception has a status code then check it
-        if hasattr(e, "status"):
-            return e.status not in [400]
-        # if not then always retry
-        return True
+            except BaseException:
+                self.circuit_breaker.record_abandoned()
+                raise
+
+            await asyncio.sleep(wait_time)
+
+    async def request(
+        self,
+        method,
+        url,
+        key: str = None,
+        endpoint: str = None,
+        serial: str = None,
+        **kwargs,
+    ):
+        """Perform a request, retrying on failure, and return the decoded body.
+
+        Writes sharing the same key (e.g. AC serial) are sent strictly in order.
+        Metrics are recorded against the endpoint name (the URL if not given)
+        and serial.
+        """
+        async with self.scheduler.ordered(method, key):
+            return await self._execute_request(
+                self.session, method, url, endpoint=endpoint, serial=serial, **kwargs
+            )
@@ -0,0 +1,105 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from .data import ActronAdvanceState
+from .frozen import thaw
+
+# what a captured payload is
+CAPTURE_SNAPSHOT = "snapshot"  # the systems and their states when capture started
+CAPTURE_STATUS = "status"  # a status/latest response
+CAPTURE_EVENTS = "events"  # an events latest/newer response from a poll
+CAPTURE_STREAM = "stream"  # a batch of events from an event stream, oldest first
+
+
+@dataclass(slots=True)
+class CaptureRecord:
+    """A single payload as it was received."""
+
+    # wall clock time it was received
+    at: float
+    kind: str
+    serial: str | None
+    payload: Any
+
+
+class CaptureWriter:
+    """Record the raw payloads a coordinator receives to a gzipped JSONL file.
+
+    record() only buffers, so it can be called from the event loop. The
+    (blocking) encoding and writing is done by flush(), which can be run from
+    any thread at the same time as record(). Payloads must not be changed
+    once recorded.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self._clock = clock
+        self._pending: list[tuple] = []
+        self._file = None
+        # guards _pending, only ever held briefly so record() doesn't block
+        self._lock = threading.Lock()
+        # held while writing, so concurrent flushes write in order
+        self._write_lock = threading.Lock()
+        self.records = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def record(self, kind: str, serial: str | None, payload: Any) -> None:
+        with self._lock:
+            self._pending.append((self._clock(), kind, serial, payload))
+            self.records += 1
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return
+            if self._file is None:
+                self._file = gzip.open(self.path, "at", encoding="utf-8")
+            for at, kind, serial, payload in pending:
+                self._file.write(
+                    json.dumps(
+                        {"at": at, "kind": kind, "serial": serial, "payload": payload},
+                        separators=(",", ":"),
+                        default=str,
+                    )
+                    + "\n"
+                )
+            self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_capture(path: str) -> Iterator[CaptureRecord]:
+    """The records in a capture, in the order they were received."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield CaptureRecord(**json.loads(line))
+
+
+def state_checksum(states: dict[str, ActronAdvanceState]) -> str:
+    """A digest of the raw state of every system, to compare replays by."""
+    digest = hashlib.sha256()
+    for serial in sorted(states):
+        digest.update(serial.encode())
+        digest.update(
+            json.dumps(
+                thaw(states[serial]._state), sort_keys=True, separators=(",", ":")
+            ).encode()
+        )
+    return digest.hexdigest()
@@ -1,10 +1,24 @@
+import aiohttp
 import asyncio
 import logging
 
-from datetime import datetime, timedelta
-from typing import List
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import Callable, Coroutine, List
 
 from .adapter import APIAdapter
+from .commands import COALESCE_WINDOW_SECONDS, SettingsCoalescer
+from .ledger import PendingSettingsLedger
+from .metrics import (
+    ENDPOINT_AC_SYSTEMS,
+    ENDPOINT_COMMANDS,
+    ENDPOINT_EVENTS_LATEST,
+    ENDPOINT_EVENTS_NEWER,
+    ENDPOINT_EVENTS_OLDER,
+    ENDPOINT_OAUTH,
+    ENDPOINT_STATUS,
+    ENDPOINT_USER_DEVICES,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -15,17 +29,63 @@ class ActronAirAPIClient:
 
     TOKEN_EXPIRATION_LEEWAY_SECONDS = 60
 
+    # renew this long before the leeway window so no request waits on a refresh
+    TOKEN_RENEWAL_MARGIN_SECONDS = 120
 
-    def __init__(self, adapter: APIAdapter, pairing_token: str):
+    # how long to wait before trying again when a background renewal fails
+    TOKEN_RENEWAL_RETRY_SECONDS = 30
+
+    def __init__(self, adapter: APIAdapter, pairing_token: str, coalesce_window: float = COALESCE_WINDOW_SECONDS, base_url: str = BASE_URL):
         self.adapter = adapter
 
+        # e.g. a local stand-in for testing, rather than the real cloud
+        self.base_url = base_url.rstrip('/')
+
+        # settings that have been asked for but not yet confirmed by the AC
+        self.pending_settings = PendingSettingsLedger()
+
+        # settings for the same system sent in quick succession go as one command
+        self.settings_coalescer = SettingsCoalescer(send=self._send_settings, ledger=self.pending_settings, window=coalesce_window)
+
         self.pairing_token = pairing_token
 
         self.access_token = None
         self.token_expiration_timestamp = None
 
+        # called with (access_token, expiration timestamp) whenever the token is refreshed
+        self.token_listener: Callable[[str, datetime], None] | None = None
+
+        self._token_refresh: asyncio.Task | None = None
+        self._token_renewal: asyncio.Task | None = None
+
+    def restore_access_token(self, access_token: str, token_expiration_timestamp: datetime):
+        """Reuse a previously issued token if it is still valid.
+
+        token_expiration_timestamp must be timezone aware.
+        """
+        renew_at_timestamp = token_expiration_timestamp - timedelta(seconds=self.TOKEN_EXPIRATION_LEEWAY_SECONDS)
+        if datetime.now(timezone.utc) >= renew_at_timestamp:
+            logger.debug("Stored access token has expired, ignoring")
+            return
+        self.access_token = access_token
+        self.token_expiration_timestamp = token_expiration_timestamp
+        logger.debug(f"Restored access token expiring at {token_expiration_timestamp}")
+
     async def refresh_access_token(self):
-        url = f"{self.BASE_URL}/api/v0/oauth/token"
+        # single flight - everyone asking while a refresh is in progress shares it
+        if self._token_refresh is None:
+            self._token_refresh = asyncio.ensure_future(self._refresh_access_token())
+            self._token_refresh.add_done_callback(self._token_refresh_done)
+        return await asyncio.shield(self._token_refresh)
+
+    def _token_refresh_done(self, task: asyncio.Task):
+        self._token_refresh = None
+        # nobody may be waiting to retrieve a failure, don't warn about it
+        if not task.cancelled():
+            task.exception()
+
+    async def _refresh_access_token(self):
+        url = f"{self.base_url}/api/v0/oauth/token"
         payload = {
             "grant_type": "refresh_token",
             "refresh_token": self.pairing_token,
@@ -35,13 +95,14 @@ class ActronAirAPIClient:
             "Content-Type": "application/x-www-form-urlencoded",
         }
 
-        response = await self.adapter.request(method='POST', url=url, data=payload, headers=headers)
-        if response is not None:
-            data = await response.json()
+        data = await self.adapter.request(method='POST', url=url, key='oauth', endpoint=ENDPOINT_OAUTH, data=payload, headers=headers)
+        if data is not None:
             self.access_token = data["access_token"]
             expires_in = data["expires_in"]
-            self.token_expiration_timestamp = datetime.utcnow() + timedelta(seconds=expires_in)
+            self.token_expiration_timestamp = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
             logger.info(f"Access token refreshed successfully. Will expire at {self.token_expiration_timestamp} (in {expires_in} seconds)")
+            if self.token_listener is not None:
+                self.token_listener(self.access_token, self.token_expiration_timestamp)
         else:
             logger.error("Failed to refresh access token")
             raise Exception("Failed to refresh access token")
@@ -51,7 +112,7 @@ class ActronAirAPIClient:
         if self.access_token is None:
             await self.refresh_access_token()
 
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         renew_at_timestamp = self.token_expiration_timestamp - timedelta(seconds=self.TOKEN_EXPIRATION_LEEWAY_SECONDS)
         seconds_until_renewal = int((renew_at_timestamp - now).total_seconds())
         logger.debug(f'Will renew token at {renew_at_timestamp} (in {seconds_until_renewal} seconds)')
@@ -60,8 +121,46 @@ class ActronAirAPIClient:
         if now >= renew_at_timestamp:
             await self.refresh_access_token()
 
+    def start_token_renewal(self, create_task: Callable[[Coroutine], asyncio.Task] = asyncio.ensure_future):
+        """Renew the token in the background ahead of it expiring.
+
+        create_task starts the renewal, so it can be tied to whatever owns
+        the client (e.g. a config entry's background tasks).
+        """
+        if self._token_renewal is None:
+            self._token_renewal = create_task(self._renew_token_periodically())
+
+    async def _renew_token_periodically(self):
+        # never renew more often than this, even if tokens are very short lived
+        minimum_delay = 0
+        while True:
+            if self.token_expiration_timestamp is None:
+                delay = minimum_delay
+            else:
+                renew_at_timestamp = self.token_expiration_timestamp - timedelta(
+                    seconds=self.TOKEN_EXPIRATION_LEEWAY_SECONDS + self.TOKEN_RENEWAL_MARGIN_SECONDS
+                )
+                delay = max((renew_at_timestamp - datetime.now(timezone.utc)).total_seconds(), minimum_delay)
+            minimum_delay = self.TOKEN_RENEWAL_RETRY_SECONDS
+            logger.debug(f"Renewing access token in {int(delay)} seconds")
+            await asyncio.sleep(delay)
+
+            try:
+                await self.refresh_access_token()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Background access token renewal failed, will retry: {e}")
+
+    async def close(self):
+        """Stop background renewal and release the adapter's connections."""
+        if self._token_renewal is not None:
+            self._token_renewal.cancel()
+            self._token_renewal = None
+        await self.adapter.close()
+
     async def request_pairing_token(self, username: str, password: str, client: str, device_name: str, device_unique_id: str):
-        url = f"{self.BASE_URL}/api/v0/client/user-devices"
+        url = f"{self.base_url}/api/v0/client/user-devices"
         payload = {
             "username": username,
             "password": password,
@@ -70,28 +169,36 @@ class ActronAirAPIClient:
             "deviceUniqueIdentifier": device_unique_id,
         }
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        response = await self.adapter.request(method='POST', url=url, data=payload, headers=headers)
-
-        data = await response.json()
+        data = await self.adapter.request(method='POST', url=url, endpoint=ENDPOINT_USER_DEVICES, data=payload, headers=headers)
         return data["pairingToken"]
 
     async def get_ac_systems(self):
-        return await self._request(method='GET', path='/api/v0/client/ac-systems?includeNeo=true')
+        return await self._request(method='GET', path='/api/v0/client/ac-systems?includeNeo=true', endpoint=ENDPOINT_AC_SYSTEMS)
 
     async def get_ac_events(self, serial: str, event_type: str = 'latest', event_id: str = None):
         if event_type == 'latest':
             path = f'/api/v0/client/ac-systems/events/latest?serial={serial}'
+            endpoint = ENDPOINT_EVENTS_LATEST
         elif event_type == 'newer':
             path = f'/api/v0/client/ac-systems/events/newer?serial={serial}&newerThanEventId={event_id}'
+            endpoint = ENDPOINT_EVENTS_NEWER
         elif event_type == 'older':
             path = f'/api/v0/client/ac-systems/events/older?serial={serial}&olderThanEventId={event_id}'
+            endpoint = ENDPOINT_EVENTS_OLDER
         else:
             raise ValueError(f"Invalid event type: {event_type}")
 
-        return await self._request(method='GET', path=path)
+        return await self._request(method='GET', path=path, endpoint=endpoint, serial=serial)
+
+    async def stream_ac_events(self, serial: str, event_id: str = None, refresh_secs: float | Callable[[], float] = 15, wakeup: asyncio.Event = None):
+        """Poll for new events, yielding each non-empty batch oldest first.
 
-    async def stream_ac_events(self, serial: str, refresh_secs: int = 15):
-        latest_event_id = None
+        Starts after event_id if given, otherwise from the latest events.
+        refresh_secs can be a callable, asked before each wait, so the
+        caller can speed up or slow down the stream as it goes. Setting
+        wakeup cuts the current wait short.
+        """
+        latest_event_id = event_id
         while True:
             if latest_event_id is None:
                 events_data = await self.get_ac_events(serial=serial)
@@ -104,19 +211,28 @@ class ActronAirAPIClient:
             # remember latest event
             if len(events) > 0:
                 latest_event_id = events[-1]['id']
-
-            for event in events:
-                yield event
-
-            await asyncio.sleep(refresh_secs)
+                yield events
+
+            delay = refresh_secs() if callable(refresh_secs) else refresh_secs
+            if wakeup is None:
+                await asyncio.sleep(delay)
+                continue
+            try:
+                await asyncio.wait_for(wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
 
     async def get_ac_status(self, serial: str):
-        return await self._request(method='GET', path=f'/api/v0/client/ac-systems/status/latest?serial={serial}')
+        return await self._request(method='GET', path=f'/api/v0/client/ac-systems/status/latest?serial={serial}', endpoint=ENDPOINT_STATUS, serial=serial)
 
     async def send_command(self, serial: str, command: dict):
-        return await self._request(method='POST', path=f'/api/v0/client/ac-systems/cmds/send?serial={serial}', json=command)
+        return await self._request(method='POST', path=f'/api/v0/client/ac-systems/cmds/send?serial={serial}', key=serial, endpoint=ENDPOINT_COMMANDS, serial=serial, json=command)
 
     async def set_settings(self, serial: str, settings: dict):
+        return await self.settings_coalescer.set_settings(serial=serial, settings=settings)
+
+    async def _send_settings(self, serial: str, settings: dict):
         return await self.send_command(serial=serial, command={"command": ({"type": "set-settings"} | settings)})
 
     async def set_enabled_zones(self, serial: str, enabled_zones: List[bool]):
@@ -160,7 +276,20 @@ class ActronAirAPIClient:
 
     async def _request(self, method: str, path: str, *args, **kwargs):
         await self.ensure_valid_token()
-        url = f"{self.BASE_URL}{path}"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-        response = await self.adapter.request(method=method, url=url, headers=headers, *args, **kwargs)
-        return await response.json()
+        url = f"{self.base_url}{path}"
+        access_token = self.access_token
+        try:
+            return await self.adapter.request(method=method, url=url, headers={"Authorization": f"Bearer {access_token}"}, *args, **kwargs)
+        except aiohttp.ClientResponseError as e:
+            if e.status != HTTPStatus.UNAUTHORIZED:
+                raise
+
+        # the token was rejected before it was due to expire (e.g. revoked).
+        # Only forget it if nobody has replaced it already, so every request
+        # rejected at the same time shares the one refresh
+        logger.info("Access token was rejected, refreshing it and trying again")
+        if self.access_token == access_token:
+            self.access_token = None
+            self.token_expiration_timestamp = None
+        await self.ensure_valid_token()
+        return await self.adapter.request(method=method, url=url, headers={"Authorization": f"Bearer {self.access_token}"}, *args, **kwargs)
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+
+from typing import Awaitable, Callable
+
+from .frozen import freeze
+from .ledger import PendingSettingsLedger
+from .paths import compile_path
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# how long to wait for more settings before sending a command
+COALESCE_WINDOW_SECONDS = 0.3
+
+_MISSING = object()
+
+
+class SettingsCoalescer:
+    """Merge settings sent to the same AC in quick succession into one command.
+
+    Settings are collected per serial for a short window, with later values for
+    the same key replacing earlier ones. When the window closes any setting
+    that already matches the known state is dropped and the rest are sent as a
+    single set-settings command. Everyone who contributed to the batch waits
+    on, and gets the result of, that one command.
+
+    Every setting is recorded in the ledger as soon as it's asked for, and
+    removed again if it turns out to be a no-op or fails to send.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, dict], Awaitable],
+        ledger: PendingSettingsLedger,
+        window: float = COALESCE_WINDOW_SECONDS,
+    ):
+        self._send = send
+        self.ledger = ledger
+        self.window = window
+
+        # returns the current confirmed raw state for a serial, if known
+        self.state_provider: Callable[[str], dict | None] = lambda serial: None
+
+        self._pending: dict[str, dict] = {}
+        self._batches: dict[str, asyncio.Task] = {}
+
+    async def set_settings(self, serial: str, settings: dict):
+        # last write wins
+        self._pending.setdefault(serial, {}).update(settings)
+        self.ledger.record(serial, settings)
+
+        batch = self._batches.get(serial)
+        if batch is None:
+            batch = asyncio.ensure_future(self._send_after_window(serial))
+            self._batches[serial] = batch
+
+        # shield so one caller being cancelled doesn't cancel everyone's command
+        return await asyncio.shield(batch)
+
+    async def _send_after_window(self, serial: str):
+        try:
+            if self.window > 0:
+                await asyncio.sleep(self.window)
+        except BaseException:
+            # cancelled before sending - everyone waiting on the batch gets the
+            # cancellation, and the next setting starts a new batch rather
+            # than waiting on this one
+            self._roll_back(serial, self._take_batch(serial))
+            raise
+
+        # anything arriving from here on goes into the next batch
+        settings = self._without_unchanged(serial, self._take_batch(serial))
+        if not settings:
+            logger.debug(f'All settings for "{serial}" already applied, not sending')
+            return None
+
+        logger.debug(f'Sending {len(settings)} coalesced settings to "{serial}"')
+        # marked before sending so anything queued meanwhile knows it follows a send
+        self.ledger.mark_sent(serial, settings)
+        try:
+            return await self._send(serial, settings)
+        except BaseException:
+            self._roll_back(serial, settings)
+            raise
+
+    def _take_batch(self, serial: str) -> dict:
+        """Close the batch being collected for serial, returning its settings."""
+        self._batches.pop(serial, None)
+        return self._pending.pop(serial, {})
+
+    def _roll_back(self, serial: str, settings: dict) -> None:
+        """Forget settings that weren't sent, unless asked for again since."""
+        entries = self.ledger.get(serial)
+        self.ledger.discard(
+            serial,
+            [
+                key
+                for key, value in settings.items()
+                if key in entries and entries[key].value == freeze(value)
+            ],
+        )
+
+    def _without_unchanged(self, serial: str, settings: dict) -> dict:
+        state = self.state_provider(serial)
+        if not state:
+            return settings
+
+        entries = self.ledger.get(serial)
+        changed = {}
+        unchanged = []
+        for key, value in settings.items():
+            entry = entries.get(key)
+            # if an earlier value was sent and the state hasn't caught up yet we
+            # can't trust it to tell us whether this setting is a no-op
+            if (entry is None or not entry.follows_send) and freeze(
+                value
+            ) == compile_path(key).get(state, _MISSING):
+                unchanged.append(key)
+            else:
+                changed[key] = value
+
+        if unchanged:
+            self.ledger.discard(serial, unchanged)
+
+        return changed
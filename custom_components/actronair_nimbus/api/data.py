@@ -1,20 +1,112 @@
-import re
-import copy
 import logging
 
 from datetime import datetime, timezone, timedelta
 from zoneinfo import ZoneInfo
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import List
 
+from .frozen import FrozenDict, freeze, thaw
+from .paths import compile_path
+
 logger = logging.getLogger(__name__)
 
+# how far behind we can be and still catch up from the last event we saw,
+# rather than starting again from the latest events
+MAX_EVENT_RESUME_GAP_SECONDS = 3600
+
+
+class PeripheralIndex:
+    """Lookups over a state's peripherals and zones.
+
+    Built from the Peripherals and RemoteZoneInfo of a state. As state is
+    structurally shared, whether either has changed is a simple identity
+    check, so each half is only rebuilt when what it is built from changes.
+    """
+
+    __slots__ = ("peripherals", "zones", "by_zone", "by_serial", "existing_zones")
+
+    def __init__(self, peripherals=(), zones=(), previous: "PeripheralIndex" = None):
+        self.peripherals = peripherals
+        self.zones = zones
+
+        if previous is not None and previous.peripherals is peripherals:
+            self.by_zone = previous.by_zone
+            self.by_serial = previous.by_serial
+        else:
+            # zone sensors in zone order, so the nth belongs to zone n
+            zone_sensors = sorted(
+                (
+                    peripheral
+                    for peripheral in peripherals
+                    if peripheral["DeviceType"] == "Zone Sensor"
+                ),
+                key=lambda x: x["ZoneAssignment"][0],
+            )
+            self.by_zone: dict[int, dict] = dict(enumerate(zone_sensors))
+            self.by_serial: dict[str, dict] = {
+                peripheral["SerialNumber"]: peripheral for peripheral in peripherals
+            }
+
+        if previous is not None and previous.zones is zones:
+            self.existing_zones = previous.existing_zones
+        else:
+            self.existing_zones: tuple[int, ...] = tuple(
+                zone_id for zone_id, zone in enumerate(zones) if zone["NV_Exists"]
+            )
+
 
 @dataclass
 class ActronAdvanceState:
-    _state: dict = field(default_factory=dict)
+    # read-only and structurally shared between copies - never modified in place
+    _state: FrozenDict = field(default_factory=FrozenDict)
     _timestamp: datetime = None
     _event_id: str = None
+    # when the event with _event_id happened
+    _event_timestamp: datetime = None
+    # shared between copies, rebuilt on demand when what it indexes changes
+    _index: PeripheralIndex = field(default=None, repr=False, compare=False)
+
+    def copy(self) -> "ActronAdvanceState":
+        """Return a cheap copy that can be updated without affecting this one."""
+        return replace(self)
+
+    def with_settings(self, settings: dict) -> "ActronAdvanceState":
+        """Return a copy with settings (keyed as in commands/events) applied."""
+        state = self._state
+        for key, value in settings.items():
+            try:
+                state = compile_path(key).set(state, freeze(value))
+            except (KeyError, IndexError, TypeError):
+                logger.debug(f"Unable to apply {key} to state, skipping")
+        return replace(self, _state=state)
+
+    def as_snapshot(self) -> dict:
+        """A JSON serialisable copy, to restore with from_snapshot."""
+        return {
+            "state": thaw(self._state),
+            "timestamp": self._timestamp.isoformat() if self._timestamp else None,
+            "event_id": self._event_id,
+            "event_timestamp": (
+                self._event_timestamp.isoformat() if self._event_timestamp else None
+            ),
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict) -> "ActronAdvanceState":
+        return cls(
+            _state=freeze(snapshot["state"]),
+            _timestamp=(
+                datetime.fromisoformat(snapshot["timestamp"])
+                if snapshot["timestamp"]
+                else None
+            ),
+            _event_id=snapshot["event_id"],
+            _event_timestamp=(
+                datetime.fromisoformat(snapshot["event_timestamp"])
+                if snapshot.get("event_timestamp")
+                else None
+            ),
+        )
 
     @property
     def is_on(self) -> bool:
@@ -64,6 +156,21 @@ class ActronAdvanceState:
     def peripherals(self) -> List[dict]:
         return self._state["AirconSystem"]["Peripherals"]
 
+    @property
+    def index(self) -> PeripheralIndex:
+        """Peripheral and zone lookups, kept in step with the state."""
+        peripherals = self._state.get("AirconSystem", {}).get("Peripherals", ())
+        zones = self._state.get("RemoteZoneInfo", ())
+
+        index = self._index
+        if (
+            index is None
+            or index.peripherals is not peripherals
+            or index.zones is not zones
+        ):
+            index = self._index = PeripheralIndex(peripherals, zones, index)
+        return index
+
     @property
     def servicing(self) -> dict:
         return self._state["Servicing"]
@@ -81,7 +188,10 @@ class ActronAdvanceState:
             .replace(tzinfo=timezone.utc)
             .astimezone(aedt_zone)
         )
-        self._state = copy.deepcopy(status["lastKnownState"])
+        changes = []
+        self._state = freeze(status["lastKnownState"], self._state, changes)
+
+        return changes
 
     def update_from_event(self, event: dict):
         if event["type"] not in ["full-status-broadcast", "status-change-broadcast"]:
@@ -104,55 +214,71 @@ class ActronAdvanceState:
             .astimezone(aedt_zone)
         )
         self._event_id = event["id"]
+        self._event_timestamp = self._timestamp
 
         if event["type"] == "full-status-broadcast":
+            # formatting the times costs more than merging a small event, so
+            # only do it when it will be logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Found full status broadcast from %s which was %s ago",
+                    self.event_timestamp(event),
+                    self.event_time_ago(event),
+                )
+            self._state = freeze(event["data"], self._state, changes)
+            return changes
+
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"Found full status broadcast from {self.event_timestamp(event)} which was {self.event_time_ago(event)} ago"
+                "Merging status-change-broadcast from %s which was %s ago",
+                self.event_timestamp(event),
+                self.event_time_ago(event),
             )
-            self._state = event["data"]
-            return
-
-        logger.debug(
-            f"Merging status-change-broadcast from {self.event_timestamp(event)} which was {self.event_time_ago(event)} ago"
-        )
 
-        def recursive_merge(state, keys, value, full_key):
-            # if at the final key, set the value
-            if len(keys) == 1:
-                # record changes - path, before, after
-                # state could be a dict or a list here
-                before = state[keys[0]]
-                after = value
-                if before != after:
-                    changes.append((full_key, state[keys[0]], value))
-                # keys[0] will be the final remaining key, so set the value
-                state[keys[0]] = value
-                return state
-
-            # get the next key
-            key = keys.pop(0)
-            # merge the value
-            state[key] = recursive_merge(state[key], keys, value, full_key)
-
-            return state
-
-        new_state = copy.deepcopy(self._state)
+        new_state = self._state
         for key, value in event["data"].items():
             # keys that start with @ are metadata - skip as not required
             if key.startswith("@"):
                 continue
 
-            # Split the key into parts
-            parts = re.split(r"\.|\[|\]", key)
-            # convert index numbers to integers
-            parts = [int(part) if part.isdigit() else part for part in parts if part]
+            path = compile_path(key)
 
-            new_state = recursive_merge(new_state, parts, value, key)
+            # record changes - path, before, after
+            before = path.get(new_state)
+            after = freeze(value, before)
+            if after is before:
+                continue
+            changes.append((key, before, after))
+
+            # copy only the path to the changed value, the rest is shared
+            new_state = path.set(new_state, after)
 
         self._state = new_state
 
         return changes
 
+    def is_older_than_state(self, event: dict) -> bool:
+        """Whether an event predates the state we already have."""
+        if self._timestamp is None:
+            return False
+        event_time = datetime.fromisoformat(event["timestamp"][:19]).replace(
+            tzinfo=timezone.utc
+        )
+        return event_time < self._timestamp
+
+    def resume_event_id(self, now: datetime) -> str | None:
+        """The event id to fetch newer events after, or None for the latest.
+
+        Only the latest events can reach back before the state we have, so
+        only they need checking with is_older_than_state.
+        """
+        if self._event_id is None or self._event_timestamp is None:
+            return None
+        # too far behind and catching up would cost more than starting again
+        if now - self._event_timestamp > timedelta(seconds=MAX_EVENT_RESUME_GAP_SECONDS):
+            return None
+        return self._event_id
+
     @staticmethod
     def event_timestamp(event):
         # event['timestamp'] example 2025-03-07T16:35:07.3687629+00:00
@@ -0,0 +1,137 @@
+"""Immutable, structurally shared containers for decoded API state.
+
+State is stored as FrozenDict/tuple trees. Updating a value copies only the
+containers on the path to it, every other subtree is shared with the previous
+state. That makes taking a snapshot free and means nothing holding a snapshot
+(e.g. an entity) can corrupt it.
+"""
+
+from typing import Any, Iterable
+
+_MISSING = object()
+
+
+class FrozenDict(dict):
+    """A dict that can't be modified once built.
+
+    Subclasses dict (rather than wrapping one) so lookups stay at native speed
+    and it can still be handed straight to json.dumps.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"'{type(self).__name__}' object is read-only")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __repr__(self):
+        return f"FrozenDict({dict.__repr__(self)})"
+
+
+def format_path(parts: Iterable) -> str:
+    """Format path parts in the same style as event keys, e.g. RemoteZoneInfo[3].LiveTemp_oC."""
+    key = ""
+    for part in parts:
+        if isinstance(part, int):
+            key += f"[{part}]"
+        elif key:
+            key += f".{part}"
+        else:
+            key = part
+    return key
+
+
+def freeze(value: Any, previous: Any = _MISSING, changes: list = None, path: list = None) -> Any:
+    """Return an immutable copy of a decoded JSON value.
+
+    Any subtree that is equal to the matching subtree of `previous` is reused
+    as-is rather than copied. If `changes` is given, a (path, before, after)
+    tuple is appended for every value that differs from `previous`.
+    """
+    if path is None:
+        path = []
+
+    if isinstance(value, dict):
+        if not isinstance(previous, dict):
+            frozen = FrozenDict((k, freeze(v)) for k, v in value.items())
+            if changes is not None and previous is not _MISSING:
+                changes.append((format_path(path), previous, frozen))
+            return frozen
+
+        same = len(previous) == len(value)
+        items = {}
+        for k, v in value.items():
+            path.append(k)
+            before = previous.get(k, _MISSING)
+            after = freeze(v, before, changes, path)
+            if before is _MISSING and changes is not None:
+                changes.append((format_path(path), None, after))
+            path.pop()
+            items[k] = after
+            if after is not before:
+                same = False
+
+        if same:
+            return previous
+
+        if changes is not None:
+            # record keys that have gone away entirely
+            for k in previous.keys() - items.keys():
+                changes.append((format_path(path + [k]), previous[k], None))
+
+        return FrozenDict(items)
+
+    if isinstance(value, (list, tuple)):
+        if not isinstance(previous, tuple) or len(previous) != len(value):
+            frozen = tuple(freeze(v) for v in value)
+            if changes is not None and previous is not _MISSING:
+                changes.append((format_path(path), previous, frozen))
+            return frozen
+
+        same = True
+        items = []
+        for i, v in enumerate(value):
+            path.append(i)
+            before = previous[i]
+            after = freeze(v, before, changes, path)
+            path.pop()
+            items.append(after)
+            if after is not before:
+                same = False
+
+        return previous if same else tuple(items)
+
+    # scalar - keep the previous object if nothing changed
+    if previous is not _MISSING and type(previous) is type(value) and previous == value:
+        return previous
+
+    if changes is not None and previous is not _MISSING:
+        changes.append((format_path(path), previous, value))
+
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a plain, mutable dict/list copy of a frozen value."""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    return value
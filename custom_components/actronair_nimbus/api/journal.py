@@ -0,0 +1,194 @@
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from .frozen import FrozenDict, format_path
+from .paths import KeyPath, compile_path
+
+# changes remembered per system - a day or more of a typical system's events
+JOURNAL_SIZE = 2000
+
+# changes between checkpoints, bounding how many have to be undone to answer
+# what a key was at some time
+CHECKPOINT_INTERVAL = 250
+
+# a key's before or after value when it didn't exist, as distinct from None
+ABSENT = object()
+
+
+@dataclass(slots=True)
+class JournalEntry:
+    """A single key that changed."""
+
+    seq: int
+    # when we merged the change
+    at: datetime
+    key: str
+    # ABSENT if the key didn't exist before, or doesn't after
+    before: Any
+    after: Any
+
+
+@dataclass(slots=True)
+class Checkpoint:
+    """A system's full state as of a journal entry."""
+
+    seq: int
+    at: datetime
+    # shares everything unchanged with the states before and after it, so
+    # costs little more than what changed in between
+    state: FrozenDict
+
+
+def _get(value: Any, parts: tuple, default: Any = None) -> Any:
+    for part in parts:
+        try:
+            value = value[part]
+        except (KeyError, IndexError, TypeError):
+            return default
+    return value
+
+
+def _without(value: Any, parts: tuple) -> Any:
+    """A copy of value with the key at parts removed, if it's there."""
+    parent = _get(value, parts[:-1], ABSENT)
+    if not isinstance(parent, dict) or parts[-1] not in parent:
+        return value
+    items = dict(parent)
+    del items[parts[-1]]
+    return KeyPath(format_path(parts[:-1])).set(value, FrozenDict(items))
+
+
+class EventJournal:
+    """A fixed size history of what changed in a system's state, and when.
+
+    Keeps the most recent change tuples the state already works out as
+    updates are merged, along with a checkpoint of the full state every
+    CHECKPOINT_INTERVAL changes. That's enough to say what changed over a
+    period, and what any key was at any time since the oldest change kept.
+    """
+
+    def __init__(
+        self,
+        size: int = JOURNAL_SIZE,
+        checkpoint_interval: int = CHECKPOINT_INTERVAL,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.size = size
+        self.checkpoint_interval = checkpoint_interval
+        self._clock = clock
+
+        self.entries: deque[JournalEntry] = deque(maxlen=size)
+        # checkpoints older than the oldest entry are no use so keep only
+        # as many as the entries cover
+        self.checkpoints: deque[Checkpoint] = deque(
+            maxlen=size // checkpoint_interval + 1
+        )
+        self._state = FrozenDict()
+        self._seq = 0
+        self._since_checkpoint = 0
+        self._started = clock()
+
+    @property
+    def horizon(self) -> datetime:
+        """How far back the journal can answer for."""
+        if self.entries and self.entries[0].seq > 1:
+            # older entries have been dropped
+            return self.entries[0].at
+        return self._started
+
+    def record(self, state: FrozenDict, changes: list) -> None:
+        """Record the (key, before, after) changes that produced state."""
+        previous, self._state = self._state, state
+        if not changes:
+            return
+
+        at = self._clock()
+        for key, before, after in changes:
+            # added and removed keys come through as None, tell them apart
+            # from keys that really are None
+            if before is None or after is None:
+                parts = compile_path(key).parts
+                if before is None and _get(previous, parts, ABSENT) is ABSENT:
+                    before = ABSENT
+                if after is None and _get(state, parts, ABSENT) is ABSENT:
+                    after = ABSENT
+            self._seq += 1
+            self.entries.append(JournalEntry(self._seq, at, key, before, after))
+
+        self._since_checkpoint += len(changes)
+        if self._since_checkpoint >= self.checkpoint_interval:
+            self.checkpoints.append(Checkpoint(self._seq, at, state))
+            self._since_checkpoint = 0
+
+    def changes_since(self, since: datetime, key: str = None) -> list[JournalEntry]:
+        """Every change after since, oldest first, optionally only those affecting key."""
+        parts = compile_path(key).parts if key else None
+        changes = []
+        for entry in reversed(self.entries):
+            if entry.at <= since:
+                break
+            if parts is None or self._related(parts, compile_path(entry.key).parts):
+                changes.append(entry)
+        changes.reverse()
+        return changes
+
+    def value_at(self, key: str, at: datetime) -> Any:
+        """What key was at a time, raising LookupError if that's beyond the horizon.
+
+        A key that didn't exist at the time is None.
+        """
+        if at < self.horizon:
+            raise LookupError(f"Journal only goes back to {self.horizon}")
+
+        # start from the first checkpoint after the time (or the current
+        # state) and undo back to it
+        seq, state = self._seq, self._state
+        for checkpoint in self.checkpoints:
+            if checkpoint.at >= at:
+                seq, state = checkpoint.seq, checkpoint.state
+                break
+
+        target = compile_path(key).parts
+        value = _get(state, target, ABSENT)
+        for entry in reversed(self.entries):
+            if entry.at <= at:
+                break
+            if entry.seq > seq:
+                continue
+            value = self._undo(value, target, compile_path(entry.key).parts, entry.before)
+        return None if value is ABSENT else value
+
+    @staticmethod
+    def _related(target: tuple, changed: tuple) -> bool:
+        """Whether a change at changed is at, above or below target."""
+        shortest = min(len(target), len(changed))
+        return target[:shortest] == changed[:shortest]
+
+    @staticmethod
+    def _undo(value: Any, target: tuple, changed: tuple, before: Any) -> Any:
+        """The value at target before a change at changed."""
+        if target[: len(changed)] == changed:
+            # the change was at or above the target
+            return _get(before, target[len(changed) :], ABSENT)
+        if changed[: len(target)] == target:
+            # the change was inside the target
+            if before is ABSENT:
+                # the key was added, so take it out again
+                return _without(value, changed[len(target) :])
+            try:
+                return KeyPath(format_path(changed[len(target) :])).set(value, before)
+            except (KeyError, IndexError, TypeError):
+                return value
+        return value
+
+    def as_dict(self) -> dict:
+        hour_ago = self._clock() - timedelta(hours=1)
+        return {
+            "entries": len(self.entries),
+            "size": self.size,
+            "checkpoints": len(self.checkpoints),
+            "horizon": self.horizon,
+            "changes_last_hour": len(self.changes_since(hour_ago)),
+        }
@@ -0,0 +1,117 @@
+import logging
+import time
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from .data import ActronAdvanceState
+from .frozen import freeze
+from .paths import compile_path
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# how long to show a setting before giving up on the AC ever confirming it
+PENDING_SETTING_TIMEOUT_SECONDS = 120
+
+_MISSING = object()
+
+
+@dataclass(slots=True)
+class PendingSetting:
+    value: Any
+    expires_at: float
+    # whether the value has been sent to the AC (rather than waiting to be sent)
+    sent: bool = False
+    # whether an earlier value for the same key was sent and not yet confirmed
+    follows_send: bool = False
+
+
+class PendingSettingsLedger:
+    """Settings that have been asked for but not yet confirmed by the AC.
+
+    The coordinator overlays these on the state it publishes so the UI
+    reflects a command as soon as it's made, and keeps doing so until an
+    event or status shows the AC has applied it (or it times out).
+    """
+
+    def __init__(
+        self,
+        timeout: float = PENDING_SETTING_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.timeout = timeout
+        self._clock = clock
+        self._pending: dict[str, dict[str, PendingSetting]] = {}
+
+        # called with (serial, keys) whenever the pending settings for a serial change
+        self.listener: Callable[[str, list[str]], None] | None = None
+
+    def get(self, serial: str) -> dict[str, PendingSetting]:
+        return self._pending.get(serial, {})
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._pending.values())
+
+    def record(self, serial: str, settings: dict) -> None:
+        """Record settings that are about to be sent."""
+        entries = self._pending.setdefault(serial, {})
+        expires_at = self._clock() + self.timeout
+        for key, value in settings.items():
+            previous = entries.get(key)
+            entries[key] = PendingSetting(
+                value=freeze(value),
+                expires_at=expires_at,
+                follows_send=previous is not None
+                and (previous.sent or previous.follows_send),
+            )
+        self._notify(serial, list(settings))
+
+    def mark_sent(self, serial: str, keys) -> None:
+        entries = self.get(serial)
+        for key in keys:
+            if key in entries:
+                entries[key].sent = True
+
+    def discard(self, serial: str, keys) -> None:
+        """Forget settings, e.g. because sending them failed."""
+        entries = self.get(serial)
+        removed = [key for key in keys if entries.pop(key, None) is not None]
+        if removed:
+            self._notify(serial, removed)
+
+    def reconcile(self, serial: str, state: dict) -> list[str]:
+        """Drop settings the state confirms, or that have timed out.
+
+        Returns the keys that were removed.
+        """
+        entries = self.get(serial)
+        now = self._clock()
+        removed = []
+        for key, entry in list(entries.items()):
+            if not entry.sent:
+                continue
+            if compile_path(key).get(state, _MISSING) == entry.value:
+                logger.debug(f'Setting {key} for "{serial}" confirmed')
+            elif now >= entry.expires_at:
+                logger.warning(
+                    f'Setting {key}={entry.value} for "{serial}" was never confirmed, giving up'
+                )
+            else:
+                continue
+            del entries[key]
+            removed.append(key)
+        return removed
+
+    def apply(self, serial: str, state: ActronAdvanceState) -> ActronAdvanceState:
+        """Return state with any pending settings overlaid on it."""
+        entries = self.get(serial)
+        if not entries:
+            return state
+        return state.with_settings(
+            {key: entry.value for key, entry in entries.items()}
+        )
+
+    def _notify(self, serial: str, keys: list[str]) -> None:
+        if self.listener is not None:
+            self.listener(serial, keys)
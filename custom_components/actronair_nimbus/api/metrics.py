@@ -0,0 +1,137 @@
+import time
+
+from collections import deque
+from dataclasses import dataclass, field
+
+ENDPOINT_OAUTH = "oauth"
+ENDPOINT_USER_DEVICES = "user-devices"
+ENDPOINT_AC_SYSTEMS = "ac-systems"
+ENDPOINT_STATUS = "status"
+ENDPOINT_EVENTS_LATEST = "events-latest"
+ENDPOINT_EVENTS_NEWER = "events-newer"
+ENDPOINT_EVENTS_OLDER = "events-older"
+ENDPOINT_COMMANDS = "cmds-send"
+
+# endpoints used on behalf of the whole account rather than a single system
+ACCOUNT_ENDPOINTS = (ENDPOINT_OAUTH, ENDPOINT_AC_SYSTEMS)
+# endpoints used for a single system
+SYSTEM_ENDPOINTS = (
+    ENDPOINT_STATUS,
+    ENDPOINT_EVENTS_LATEST,
+    ENDPOINT_EVENTS_NEWER,
+    ENDPOINT_EVENTS_OLDER,
+    ENDPOINT_COMMANDS,
+)
+
+# how many of the most recent latencies percentiles are calculated from
+LATENCY_SAMPLE_SIZE = 256
+
+# how many individual requests are remembered, for diagnostics
+RECENT_REQUEST_COUNT = 50
+
+
+@dataclass(slots=True)
+class RequestTiming:
+    """A single attempt at a request."""
+
+    endpoint: str
+    serial: str | None
+    # wall clock time the attempt finished
+    at: float
+    # None if it failed before anything was sent
+    latency: float | None
+    bytes_received: int
+    error: str | None
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    """Counters for every request made to a single endpoint."""
+
+    # however many attempts each took
+    requests: int = 0
+    retries: int = 0
+    bytes_received: int = 0
+    # failed attempts keyed by HTTP status, or exception name if there wasn't one
+    errors: dict[str, int] = field(default_factory=dict)
+    # seconds, most recent last
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLE_SIZE))
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        """Nearest-rank percentile (0-100) of the sampled latencies in seconds."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        rank = max(round(percentile / 100 * len(ordered)) - 1, 0)
+        return ordered[min(rank, len(ordered) - 1)]
+
+    def as_dict(self) -> dict:
+        def ms(value):
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            "requests": self.requests,
+            "errors": self.error_count,
+            "errors_by_status": dict(self.errors),
+            "retries": self.retries,
+            "bytes_received": self.bytes_received,
+            "latency_p50_ms": ms(self.latency_percentile(50)),
+            "latency_p90_ms": ms(self.latency_percentile(90)),
+            "latency_p99_ms": ms(self.latency_percentile(99)),
+        }
+
+
+class RequestMetrics:
+    """Per endpoint (and per system, where relevant) request metrics.
+
+    Recorded by the adapter for every request, and every attempt at it, so
+    we can see how the integration is using the API.
+    """
+
+    def __init__(self):
+        self._endpoints: dict[tuple[str, str | None], EndpointMetrics] = {}
+        # most recent last
+        self.recent: deque[RequestTiming] = deque(maxlen=RECENT_REQUEST_COUNT)
+
+    def endpoint(self, endpoint: str, serial: str = None) -> EndpointMetrics:
+        key = (endpoint, serial)
+        metrics = self._endpoints.get(key)
+        if metrics is None:
+            metrics = self._endpoints[key] = EndpointMetrics()
+        return metrics
+
+    def items(self):
+        return self._endpoints.items()
+
+    def record_request(self, endpoint: str, serial: str) -> None:
+        self.endpoint(endpoint, serial).requests += 1
+
+    def record(
+        self,
+        endpoint: str,
+        serial: str,
+        latency: float | None,
+        bytes_received: int = 0,
+        error: str = None,
+    ) -> None:
+        """Record a single attempt at a request.
+
+        latency is None if the attempt failed before anything was sent, so
+        there's nothing to sample.
+        """
+        metrics = self.endpoint(endpoint, serial)
+        metrics.bytes_received += bytes_received
+        if latency is not None:
+            metrics.latencies.append(latency)
+        if error is not None:
+            metrics.errors[error] = metrics.errors.get(error, 0) + 1
+        self.recent.append(
+            RequestTiming(endpoint, serial, time.time(), latency, bytes_received, error)
+        )
+
+    def record_retry(self, endpoint: str, serial: str) -> None:
+        self.endpoint(endpoint, serial).retries += 1
@@ -1,17 +1,21 @@
 import json
-from dataclasses import dataclass
-from typing import List, Any
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Any, Callable
 from datetime import timedelta, datetime, timezone
 
+from .paths import ChangeSet, KeyPath, compile_path
 
-@dataclass
+
+@dataclass(slots=True)
 class FirmwareVersions:
     indoor: str
     controller: str
+    master_controller: str
     outdoor: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Outdoor:
     capacity: int
     chasing_temperature: float
@@ -32,19 +36,21 @@ class Outdoor:
     family: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CommonHumidityTemperature:
     humidity: float
     temperature: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Limits:
     min: int
     max: int
+    heat_min: int
+    heat_max: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Zone:
     title: str
     position: int
@@ -53,51 +59,54 @@ class Zone:
     connected: bool
     serial_number: str
     rssi: str
-    battery: str
+    signal: int
+    battery: int
+    connection_state: str
     temperature_setpoint_cool: float
     temperature_setpoint_heat: float
 
 
-@dataclass
+@dataclass(slots=True)
 class VFT:
     airflow: int
     static_pressure: int
     max_static_pressure: int
 
 
-@dataclass
+@dataclass(slots=True)
 class TouchScreen:
     last_touch_time: datetime
     controller_model: str
     screen_active: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class QuietMode:
     enabled: bool
     active: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class TemperatureSetpoints:
     cool: float
     heat: float
     variance: float
 
 
-@dataclass
+@dataclass(slots=True)
 class LEDIndicators:
     wall_glow: bool
     on_off_button: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedData:
     """
     Data class to hold parsed data from JSON.
     """
     cloud_connected: str
     uptime: timedelta
+    wifi_strength: int
     firmware_versions: FirmwareVersions
     outdoor: Outdoor
     common_humidity_temperature: CommonHumidityTemperature
@@ -111,17 +120,23 @@ class ParsedData:
     away_mode: bool
     fan_mode: str
     quiet_mode: QuietMode
+    enabled_zones: List[bool]
     last_status_update: datetime
     time_since_last_contact: str
     zones: List[Zone]
     touchscreen: TouchScreen
     master_wc_model: str
+    master_serial: str
     indoor_model_number: str
     is_on: bool
     temperature_setpoints: TemperatureSetpoints
     system_name: str
     led_indicators: LEDIndicators
     mode: str
+    # key of the wall controller's own section of the state, e.g. "<24I06570>"
+    aircon_id: str = field(default=None, repr=False, compare=False)
+    # zone id of each entry in zones
+    zone_ids: List[int] = field(default_factory=list, repr=False, compare=False)
 
     @staticmethod
     def from_json(file_path: str) -> 'ParsedData':
@@ -143,115 +158,279 @@ class ParsedData:
             'lastStatusUpdate': state._timestamp,
             'lastKnownState': state._state,
         }
-        return ParsedData._parse_data(status)
+        return ParsedData._parse_data(status, peripherals=state.index.by_serial)
 
     @staticmethod
-    def _parse_data(data: dict) -> 'ParsedData':
+    def _parse_data(data: dict, peripherals: dict = None) -> 'ParsedData':
         """
         Parse data dictionary and return a ParsedData object.
 
         :param data: Data dictionary.
+        :param peripherals: Peripherals by serial number, built from data if not given.
         :return: ParsedData object.
         """
+        state = data["lastKnownState"]
+
         # Get the aircon ID dynamically
-        aircon_id = next(iter(data["lastKnownState"]))
-        aircon_id_no_brackets = aircon_id.strip('<>')
+        aircon_id = next(iter(state))
 
         # Create a mapping of serial numbers to peripherals for quick lookup
-        peripherals = {p["SerialNumber"]: p for p in data["lastKnownState"]["AirconSystem"]["Peripherals"]}
-
-        zones = []
-        for zone in data["lastKnownState"]["RemoteZoneInfo"]:
-            if zone["NV_Exists"]:
-                title = zone["NV_Title"]
-                sensor_data = zone["Sensors"].get(aircon_id_no_brackets, {})
-                serial_number = sensor_data.get("NV_Kind", "").split(": ")[-1]
-                peripheral_data = peripherals.get(serial_number, {})
-                battery = peripheral_data.get("RemainingBatteryCapacity_pc", "N/A")
-                zones.append(Zone(
-                    title=title,
-                    position=zone["ZonePosition"],
-                    humidity=zone["LiveHumidity_pc"],
-                    temperature=zone["LiveTemp_oC"],
-                    connected=sensor_data.get("Connected"),
-                    serial_number=serial_number,
-                    rssi=sensor_data.get("lastRssi"),
-                    battery=battery,
-                    temperature_setpoint_cool=zone["TemperatureSetpoint_Cool_oC"],
-                    temperature_setpoint_heat=zone["TemperatureSetpoint_Heat_oC"]
-                ))
+        if peripherals is None:
+            peripherals = {p["SerialNumber"]: p for p in state["AirconSystem"]["Peripherals"]}
+
+        # read every field, grouping those of the nested classes
+        values = {}
+        nested = {name: {} for name in _NESTED}
+        for attribute, path, convert in _fields(aircon_id):
+            value = convert(path.get(state))
+            name, _, child = attribute.partition('.')
+            if child:
+                nested[name][child] = value
+            else:
+                values[name] = value
+
+        for name, cls in _NESTED.items():
+            values[name] = cls(**nested[name])
+
+        zone_ids, zones = _parse_zones(state, aircon_id, peripherals)
 
         return ParsedData(
-            cloud_connected=data["lastKnownState"][aircon_id]["Cloud"]["ConnectionState"],
-            uptime=timedelta(seconds=data["lastKnownState"][aircon_id]["SystemStatus_Local"]["Uptime_s"]),
-            firmware_versions=FirmwareVersions(
-                indoor=data["lastKnownState"]["AirconSystem"]["IndoorUnit"]["IndoorFW"],
-                controller=data["lastKnownState"][aircon_id]["SystemState"]["WCFirmwareVersion"],
-                outdoor=data["lastKnownState"]["AirconSystem"]["OutdoorUnit"]["SoftwareVersion"]
-            ),
-            outdoor=Outdoor(
-                capacity=data["lastKnownState"]["LiveAircon"]["CompressorCapacity"],
-                chasing_temperature=data["lastKnownState"]["LiveAircon"]["CompressorChasingTemperature"],
-                live_temperature=data["lastKnownState"]["LiveAircon"]["CompressorLiveTemperature"],
-                mode=data["lastKnownState"]["LiveAircon"]["CompressorMode"],
-                pwm=data["lastKnownState"]["LiveAircon"]["FanPWM"],
-                rpm=data["lastKnownState"]["LiveAircon"]["FanRPM"],
-                defrost=data["lastKnownState"]["LiveAircon"]["Defrost"],
-                drm=data["lastKnownState"]["LiveAircon"]["DRM"],
-                ambient_temperature=data["lastKnownState"]["LiveAircon"]["OutdoorUnit"]["AmbTemp"],
-                coil_temperature=data["lastKnownState"]["LiveAircon"]["OutdoorUnit"]["CoilTemp"],
-                power=data["lastKnownState"]["LiveAircon"]["OutdoorUnit"]["CompPower"],
-                speed=data["lastKnownState"]["LiveAircon"]["OutdoorUnit"]["CompSpeed"],
-                compressor_on=data["lastKnownState"]["LiveAircon"]["OutdoorUnit"]["CompressorOn"],
-                discharge_temperature=data["lastKnownState"]["LiveAircon"]["OutdoorUnit"]["DischargeTemp"],
-                reverse_valve_position=data["lastKnownState"]["LiveAircon"]["OutdoorUnit"]["ReverseValvePosition"],
-                model_number=data["lastKnownState"]["AirconSystem"]["OutdoorUnit"]["ModelNumber"],
-                family=data["lastKnownState"]["AirconSystem"]["OutdoorUnit"]["Family"]
-            ),
-            common_humidity_temperature=CommonHumidityTemperature(
-                humidity=data["lastKnownState"]["MasterInfo"]["LiveHumidity_pc"],
-                temperature=data["lastKnownState"]["MasterInfo"]["LiveTemp_oC"]
-            ),
-            clean_filter=data["lastKnownState"]["Alerts"]["CleanFilter"],
-            defrosting=data["lastKnownState"]["Alerts"]["Defrosting"],
-            fan_running=data["lastKnownState"]["LiveAircon"]["AmRunningFan"],
-            coil_inlet_temperature=data["lastKnownState"]["LiveAircon"]["CoilInlet"],
-            limits=Limits(
-                min=data["lastKnownState"]["NV_Limits"]["UserSetpoint_oC"]["setCool_Min"],
-                max=data["lastKnownState"]["NV_Limits"]["UserSetpoint_oC"]["setCool_Max"]
-            ),
-            vft=VFT(
-                airflow=data["lastKnownState"]["UserAirconSettings"]["VFT"]["Airflow"],
-                static_pressure=data["lastKnownState"]["UserAirconSettings"]["VFT"]["StaticPressure"],
-                max_static_pressure=data["lastKnownState"]["UserAirconSettings"]["VFT"]["SelfLearn"]["MaxStaticPressure"]
-            ),
-            turbo_mode=data["lastKnownState"]["UserAirconSettings"]["TurboMode"]["Enabled"],
-            away_mode=data["lastKnownState"]["UserAirconSettings"]["AwayMode"],
-            fan_mode=data["lastKnownState"]["UserAirconSettings"]["FanMode"],
-            quiet_mode=QuietMode(
-                enabled=data["lastKnownState"]["UserAirconSettings"]["QuietModeEnabled"],
-                active=data["lastKnownState"]["UserAirconSettings"]["QuietModeActive"]
-            ),
+            **values,
             last_status_update=data["lastStatusUpdate"],
             time_since_last_contact=data["timeSinceLastContact"],
             zones=zones,
-            touchscreen=TouchScreen(
-                last_touch_time=datetime.fromisoformat(data["lastKnownState"][aircon_id]["SystemStatus_Local"]["TouchScreen"]["LastTouchTime"]).astimezone(timezone.utc),
-                controller_model=data["lastKnownState"][aircon_id]["SystemStatus_Local"]["TouchScreen"]["ControllerModel"],
-                screen_active=data["lastKnownState"][aircon_id]["SystemStatus_Local"]["GUI"]["ActiveScreen"] != "DISPLAY OFF"
-            ),
-            master_wc_model=data["lastKnownState"]["AirconSystem"]["MasterWCModel"],
-            indoor_model_number=data["lastKnownState"]["AirconSystem"]["IndoorUnit"]["NV_ModelNumber"],
-            is_on=data["lastKnownState"]["UserAirconSettings"]["isOn"],
-            temperature_setpoints=TemperatureSetpoints(
-                cool=data["lastKnownState"]["UserAirconSettings"]["TemperatureSetpoint_Cool_oC"],
-                heat=data["lastKnownState"]["UserAirconSettings"]["TemperatureSetpoint_Heat_oC"],
-                variance=data["lastKnownState"]["UserAirconSettings"]["ZoneTemperatureSetpointVariance_oC"]
-            ),
-            system_name=data["lastKnownState"]["NV_SystemSettings"]["SystemName"],
-            led_indicators=LEDIndicators(
-                wall_glow=data["lastKnownState"]["NV_SystemSettings"]["LEDIndicators"]["WallGlow"]["Enabled"],
-                on_off_button=data["lastKnownState"]["NV_SystemSettings"]["LEDIndicators"]["OnOffButton"]["Enabled"]
-            ),
-            mode=data["lastKnownState"]["UserAirconSettings"]["Mode"]
+            aircon_id=aircon_id,
+            zone_ids=zone_ids,
         )
+
+    def zone(self, zone_id: int) -> Zone:
+        """
+        The zone with the given zone id.
+
+        :param zone_id: Position of the zone in RemoteZoneInfo.
+        :return: Zone object.
+        """
+        return self.zones[self.zone_ids.index(zone_id)]
+
+    def apply_changes(self, state, changes: ChangeSet) -> None:
+        """
+        Update in place from the changes returned by an update of state.
+
+        Only the fields whose part of the state changed are read again, and
+        only the zones that changed are rebuilt.
+
+        :param state: The ActronAdvanceState the changes were made to.
+        :param changes: The keys that changed.
+        """
+        self.last_status_update = state._timestamp
+        if not changes:
+            return
+
+        raw = state._state
+        index = _field_index(self.aircon_id)
+        fields = {}
+        rebuild_all_zones = False
+        zones = set()
+        peripherals = set()
+        for parts in changes:
+            if not parts:
+                # the whole state was replaced
+                fields = {attribute: (path, convert) for attribute, path, convert in _fields(self.aircon_id)}
+                rebuild_all_zones = True
+                break
+
+            # only the fields under the same top level key can be affected
+            for attribute, path, convert in index.get(parts[0], ()):
+                if _related(parts, path.parts):
+                    fields[attribute] = (path, convert)
+
+            if parts[0] == "RemoteZoneInfo":
+                if len(parts) == 1:
+                    rebuild_all_zones = True
+                else:
+                    zones.add(parts[1])
+            elif _related(parts, _PERIPHERALS_PATH.parts):
+                # a single peripheral changing only affects its own zone
+                if len(parts) > 3 and parts[3] != "SerialNumber":
+                    peripherals.add(parts[2])
+                else:
+                    rebuild_all_zones = True
+
+        for attribute, (path, convert) in fields.items():
+            target = self
+            name, _, child = attribute.partition('.')
+            if child:
+                target = getattr(self, name)
+                name = child
+            setattr(target, name, convert(path.get(raw)))
+
+        # which zones exist decides which zones there are at all
+        existing_zones = list(state.index.existing_zones)
+        if rebuild_all_zones or existing_zones != self.zone_ids:
+            self.zone_ids, self.zones = _parse_zones(raw, self.aircon_id, state.index.by_serial)
+            return
+
+        if peripherals:
+            serial_numbers = {
+                _PERIPHERALS_PATH.get(raw)[position]["SerialNumber"]
+                for position in peripherals
+            }
+            zones.update(
+                zone_id
+                for zone_id, zone in zip(self.zone_ids, self.zones)
+                if zone.serial_number in serial_numbers
+            )
+
+        for position, zone_id in enumerate(self.zone_ids):
+            if zone_id in zones:
+                self.zones[position] = _parse_zone(
+                    raw["RemoteZoneInfo"][zone_id], self.aircon_id, state.index.by_serial
+                )
+
+
+def _same(value):
+    return value
+
+
+def _seconds(value):
+    return None if value is None else timedelta(seconds=value)
+
+
+def _utc_datetime(value):
+    return None if value is None else datetime.fromisoformat(value).astimezone(timezone.utc)
+
+
+def _screen_active(value):
+    return value != "DISPLAY OFF"
+
+
+# nested classes, by the ParsedData field holding them
+_NESTED = {
+    "firmware_versions": FirmwareVersions,
+    "outdoor": Outdoor,
+    "common_humidity_temperature": CommonHumidityTemperature,
+    "limits": Limits,
+    "vft": VFT,
+    "quiet_mode": QuietMode,
+    "touchscreen": TouchScreen,
+    "temperature_setpoints": TemperatureSetpoints,
+    "led_indicators": LEDIndicators,
+}
+
+# (attribute, state key, conversion) for every field read straight from the
+# state. {aircon_id} is the wall controller's own section of the state.
+_FIELDS = (
+    ("cloud_connected", "{aircon_id}.Cloud.ConnectionState", _same),
+    ("uptime", "{aircon_id}.SystemStatus_Local.Uptime_s", _seconds),
+    ("wifi_strength", "{aircon_id}.SystemStatus_Local.WifiStrength_of3", _same),
+    ("firmware_versions.indoor", "AirconSystem.IndoorUnit.IndoorFW", _same),
+    ("firmware_versions.controller", "{aircon_id}.SystemState.WCFirmwareVersion", _same),
+    ("firmware_versions.master_controller", "AirconSystem.MasterWCFirmwareVersion", _same),
+    ("firmware_versions.outdoor", "AirconSystem.OutdoorUnit.SoftwareVersion", _same),
+    ("outdoor.capacity", "LiveAircon.CompressorCapacity", _same),
+    ("outdoor.chasing_temperature", "LiveAircon.CompressorChasingTemperature", _same),
+    ("outdoor.live_temperature", "LiveAircon.CompressorLiveTemperature", _same),
+    ("outdoor.mode", "LiveAircon.CompressorMode", _same),
+    ("outdoor.pwm", "LiveAircon.FanPWM", _same),
+    ("outdoor.rpm", "LiveAircon.FanRPM", _same),
+    ("outdoor.defrost", "LiveAircon.Defrost", _same),
+    ("outdoor.drm", "LiveAircon.DRM", _same),
+    ("outdoor.ambient_temperature", "LiveAircon.OutdoorUnit.AmbTemp", _same),
+    ("outdoor.coil_temperature", "LiveAircon.OutdoorUnit.CoilTemp", _same),
+    ("outdoor.power", "LiveAircon.OutdoorUnit.CompPower", _same),
+    ("outdoor.speed", "LiveAircon.OutdoorUnit.CompSpeed", _same),
+    ("outdoor.compressor_on", "LiveAircon.OutdoorUnit.CompressorOn", _same),
+    ("outdoor.discharge_temperature", "LiveAircon.OutdoorUnit.DischargeTemp", _same),
+    ("outdoor.reverse_valve_position", "LiveAircon.OutdoorUnit.ReverseValvePosition", _same),
+    ("outdoor.model_number", "AirconSystem.OutdoorUnit.ModelNumber", _same),
+    ("outdoor.family", "AirconSystem.OutdoorUnit.Family", _same),
+    ("common_humidity_temperature.humidity", "MasterInfo.LiveHumidity_pc", _same),
+    ("common_humidity_temperature.temperature", "MasterInfo.LiveTemp_oC", _same),
+    ("clean_filter", "Alerts.CleanFilter", _same),
+    ("defrosting", "Alerts.Defrosting", _same),
+    ("fan_running", "LiveAircon.AmRunningFan", _same),
+    ("coil_inlet_temperature", "LiveAircon.CoilInlet", _same),
+    ("limits.min", "NV_Limits.UserSetpoint_oC.setCool_Min", _same),
+    ("limits.max", "NV_Limits.UserSetpoint_oC.setCool_Max", _same),
+    ("limits.heat_min", "NV_Limits.UserSetpoint_oC.setHeat_Min", _same),
+    ("limits.heat_max", "NV_Limits.UserSetpoint_oC.setHeat_Max", _same),
+    ("vft.airflow", "UserAirconSettings.VFT.Airflow", _same),
+    ("vft.static_pressure", "UserAirconSettings.VFT.StaticPressure", _same),
+    ("vft.max_static_pressure", "UserAirconSettings.VFT.SelfLearn.MaxStaticPressure", _same),
+    ("turbo_mode", "UserAirconSettings.TurboMode.Enabled", _same),
+    ("away_mode", "UserAirconSettings.AwayMode", _same),
+    ("fan_mode", "UserAirconSettings.FanMode", _same),
+    ("enabled_zones", "UserAirconSettings.EnabledZones", _same),
+    ("quiet_mode.enabled", "UserAirconSettings.QuietModeEnabled", _same),
+    ("quiet_mode.active", "UserAirconSettings.QuietModeActive", _same),
+    ("touchscreen.last_touch_time", "{aircon_id}.SystemStatus_Local.TouchScreen.LastTouchTime", _utc_datetime),
+    ("touchscreen.controller_model", "{aircon_id}.SystemStatus_Local.TouchScreen.ControllerModel", _same),
+    ("touchscreen.screen_active", "{aircon_id}.SystemStatus_Local.GUI.ActiveScreen", _screen_active),
+    ("master_wc_model", "AirconSystem.MasterWCModel", _same),
+    ("master_serial", "AirconSystem.MasterSerial", _same),
+    ("indoor_model_number", "AirconSystem.IndoorUnit.NV_ModelNumber", _same),
+    ("is_on", "UserAirconSettings.isOn", _same),
+    ("temperature_setpoints.cool", "UserAirconSettings.TemperatureSetpoint_Cool_oC", _same),
+    ("temperature_setpoints.heat", "UserAirconSettings.TemperatureSetpoint_Heat_oC", _same),
+    ("temperature_setpoints.variance", "UserAirconSettings.ZoneTemperatureSetpointVariance_oC", _same),
+    ("system_name", "NV_SystemSettings.SystemName", _same),
+    ("led_indicators.wall_glow", "NV_SystemSettings.LEDIndicators.WallGlow.Enabled", _same),
+    ("led_indicators.on_off_button", "NV_SystemSettings.LEDIndicators.OnOffButton.Enabled", _same),
+    ("mode", "UserAirconSettings.Mode", _same),
+)
+
+_PERIPHERALS_PATH = compile_path("AirconSystem.Peripherals")
+
+
+@lru_cache(maxsize=16)
+def _fields(aircon_id: str) -> tuple[tuple[str, KeyPath, Callable[[Any], Any]], ...]:
+    """The fields with their keys compiled for a wall controller."""
+    return tuple(
+        (attribute, compile_path(key.format(aircon_id=aircon_id)), convert)
+        for attribute, key, convert in _FIELDS
+    )
+
+
+@lru_cache(maxsize=16)
+def _field_index(aircon_id: str) -> dict[str, tuple[tuple[str, KeyPath, Callable[[Any], Any]], ...]]:
+    """The fields for a wall controller, by the top level key they are under."""
+    index = {}
+    for field_ in _fields(aircon_id):
+        index.setdefault(field_[1].parts[0], []).append(field_)
+    return {key: tuple(fields) for key, fields in index.items()}
+
+
+def _related(changed: tuple, path: tuple) -> bool:
+    """Whether a change at changed is at, above or below path."""
+    shortest = min(len(changed), len(path))
+    return changed[:shortest] == path[:shortest]
+
+
+def _parse_zones(state: dict, aircon_id: str, peripherals: dict) -> tuple[List[int], List[Zone]]:
+    zone_ids = []
+    zones = []
+    for zone_id, zone in enumerate(state["RemoteZoneInfo"]):
+        if zone["NV_Exists"]:
+            zone_ids.append(zone_id)
+            zones.append(_parse_zone(zone, aircon_id, peripherals))
+    return zone_ids, zones
+
+
+def _parse_zone(zone: dict, aircon_id: str, peripherals: dict) -> Zone:
+    sensor_data = zone["Sensors"].get(aircon_id.strip('<>'), {})
+    serial_number = sensor_data.get("NV_Kind", "").split(": ")[-1]
+    peripheral_data = peripherals.get(serial_number, {})
+    return Zone(
+        title=zone["NV_Title"],
+        position=zone["ZonePosition"],
+        humidity=zone["LiveHumidity_pc"],
+        temperature=zone["LiveTemp_oC"],
+        connected=sensor_data.get("Connected"),
+        serial_number=serial_number,
+        rssi=sensor_data.get("lastRssi"),
+        signal=sensor_data.get("Signal_of3"),
+        battery=peripheral_data.get("RemainingBatteryCapacity_pc"),
+        connection_state=peripheral_data.get("ConnectionState"),
+        temperature_setpoint_cool=zone["TemperatureSetpoint_Cool_oC"],
+        temperature_setpoint_heat=zone["TemperatureSetpoint_Heat_oC"],
+    )
@@ -0,0 +1,128 @@
+"""Compiled state key paths.
+
+Event keys such as ``RemoteZoneInfo[3].LiveTemp_oC`` repeat endlessly, so each
+one is parsed once into a KeyPath and cached. Getting or setting a value is
+then a plain loop over the pre-split parts.
+"""
+
+import re
+
+from functools import lru_cache
+from typing import Any, Iterable
+
+from .frozen import FrozenDict
+
+# more than enough for every key a system reports, while still being bounded
+PATH_CACHE_SIZE = 2048
+
+_KEY_SPLIT = re.compile(r"\.|\[|\]")
+
+
+class KeyPath:
+    """A parsed state key that can read or write its value in a state tree."""
+
+    __slots__ = ("key", "parts", "_parents", "_reversed_parts")
+
+    def __init__(self, key: str):
+        self.key = key
+        # convert index numbers to integers
+        self.parts = tuple(
+            int(part) if part.isdigit() else part
+            for part in _KEY_SPLIT.split(key)
+            if part
+        )
+        self._parents = self.parts[:-1]
+        self._reversed_parts = self.parts[::-1]
+
+    def __repr__(self):
+        return f"KeyPath({self.key!r})"
+
+    def get(self, root: Any, default: Any = None) -> Any:
+        """Return the value at this path, or default if any part is missing."""
+        node = root
+        try:
+            for part in self.parts:
+                node = node[part]
+        except (KeyError, IndexError, TypeError):
+            return default
+        return node
+
+    def set(self, root: Any, value: Any) -> Any:
+        """Return a copy of root with the value at this path replaced.
+
+        Only the containers along the path are copied, everything else is
+        shared with root. Intermediate containers must already exist.
+        """
+        # walk down remembering each container on the way
+        nodes = [root]
+        node = root
+        for part in self._parents:
+            node = node[part]
+            nodes.append(node)
+
+        # then rebuild them from the bottom up
+        for part in self._reversed_parts:
+            node = nodes.pop()
+            if type(node) is tuple:
+                items = list(node)
+                items[part] = value
+                value = tuple(items)
+            else:
+                items = dict(node)
+                items[part] = value
+                value = FrozenDict(items)
+
+        return value
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def compile_path(key: str) -> KeyPath:
+    """Return the (cached) compiled path for a state key."""
+    return KeyPath(key)
+
+
+class ChangeSet:
+    """The set of state keys that changed in an update.
+
+    Answers "did anything under these paths change" without scanning the
+    change list for every listener.
+    """
+
+    __slots__ = ("_exact", "_touched")
+
+    def __init__(self, keys: Iterable[str] = ()):
+        # every changed path
+        self._exact = set()
+        # every changed path and all of their ancestors
+        self._touched = set()
+        for key in keys:
+            self.add(key)
+
+    def add(self, key: str) -> None:
+        parts = compile_path(key).parts
+        self._exact.add(parts)
+        for i in range(1, len(parts) + 1):
+            self._touched.add(parts[:i])
+
+    def __bool__(self):
+        return bool(self._exact)
+
+    def __len__(self):
+        return len(self._exact)
+
+    def __iter__(self):
+        # the parts of every changed path
+        return iter(self._exact)
+
+    def affects(self, paths: Iterable[KeyPath]) -> bool:
+        """Whether any change is at, below or above one of paths."""
+        for path in paths:
+            parts = path.parts
+            # changed at or below this path
+            if parts in self._touched:
+                return True
+            # a parent of this path was replaced wholesale
+            for i in range(len(parts)):
+                if parts[:i] in self._exact:
+                    return True
+        return False
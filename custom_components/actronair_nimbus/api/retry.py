@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import random
+import time
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable
+
+import aiohttp
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# statuses worth trying again - the request may well succeed next time
+RETRYABLE_STATUSES = frozenset([408, 425, 429, 500, 502, 503, 504])
+
+DEFAULT_BASE_DELAY_SECONDS = 1
+DEFAULT_MAX_DELAY_SECONDS = 30
+DEFAULT_ATTEMPT_TIMEOUT_SECONDS = 30
+DEFAULT_OVERALL_TIMEOUT_SECONDS = 120
+
+# consecutive failures before we stop sending requests for a while
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT_SECONDS = 60
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the API is known to be down."""
+
+
+class RetryPolicy:
+    """Decide whether, and after how long, a failed request is retried.
+
+    Only failures that might go away are retried - connection problems,
+    timeouts, throttling and server errors. Anything else (bad request,
+    unauthorised, not found...) fails straight away. Delays grow
+    exponentially up to a cap with full jitter, unless the server says how
+    long to wait with Retry-After.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = DEFAULT_BASE_DELAY_SECONDS,
+        max_delay: float = DEFAULT_MAX_DELAY_SECONDS,
+        attempt_timeout: float = DEFAULT_ATTEMPT_TIMEOUT_SECONDS,
+        overall_timeout: float = DEFAULT_OVERALL_TIMEOUT_SECONDS,
+        rng: random.Random = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempt_timeout = attempt_timeout
+        self.overall_timeout = overall_timeout
+        self._rng = rng or random.Random()
+
+    @staticmethod
+    def is_retryable(e: BaseException) -> bool:
+        status = getattr(e, "status", None)
+        if status is not None:
+            return status in RETRYABLE_STATUSES or status >= 500
+        # connection errors, timeouts and the like
+        return isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError))
+
+    def backoff(self, attempt: int, retry_after: float = None) -> float:
+        """How long to wait before the attempt after attempt (counting from 0)."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    @staticmethod
+    def retry_after(e: BaseException) -> float | None:
+        """The delay asked for by a Retry-After header, if there was one."""
+        headers = getattr(e, "headers", None)
+        value = headers.get("Retry-After") if headers else None
+        if value is None:
+            return None
+
+        # either a number of seconds or an HTTP date
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            logger.debug(f"Ignoring unparseable Retry-After: {value}")
+            return None
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+class CircuitBreaker:
+    """Fail fast while the API is down instead of queueing doomed requests.
+
+    After enough consecutive failures the circuit opens and requests are
+    refused outright. Once the reset timeout has passed a single trial
+    request is let through - if it succeeds the circuit closes again,
+    otherwise it stays open for another timeout.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError if a request shouldn't be sent right now."""
+        if self._opened_at is None:
+            return
+
+        remaining = self._opened_at + self.reset_timeout - self._clock()
+        if remaining > 0 or self._trial_in_flight:
+            raise CircuitOpenError(
+                f"API unavailable after {self.failures} consecutive failures, "
+                f"not retrying for another {max(remaining, 0):.0f} seconds"
+            )
+
+        logger.debug("Circuit half open, letting a trial request through")
+        self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("API available again, closing circuit")
+        self.failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_abandoned(self) -> None:
+        """A request ended without telling us anything, e.g. it was cancelled."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None:
+            # the trial failed, wait another full timeout
+            self._opened_at = self._clock()
+        elif self.failures >= self.failure_threshold:
+            logger.warning(
+                f"API failed {self.failures} times in a row, opening circuit for {self.reset_timeout} seconds"
+            )
+            self._opened_at = self._clock()
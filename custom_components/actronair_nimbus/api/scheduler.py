@@ -0,0 +1,65 @@
+import asyncio
+import contextlib
+import logging
+
+from collections import defaultdict
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+READ_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+
+
+class RequestScheduler:
+    """Decide when a request may go out on the wire.
+
+    Reads (GETs) run in parallel up to a configurable limit. Writes are
+    serialised per key (the AC serial) so commands for a system are applied
+    in the order they were issued, while writes for different systems and
+    all reads carry on independently. Slots are only held for the duration
+    of a single attempt, so a call that is backing off between retries does
+    not hold up anyone else.
+    """
+
+    def __init__(self, max_concurrent_reads: int = 4, max_concurrent_writes: int = 2):
+        self.max_concurrent_reads = max_concurrent_reads
+        self.max_concurrent_writes = max_concurrent_writes
+
+        self._read_slots = asyncio.Semaphore(max_concurrent_reads)
+        self._write_slots = asyncio.Semaphore(max_concurrent_writes)
+        self._write_order = defaultdict(asyncio.Lock)
+
+    @staticmethod
+    def is_read(method: str) -> bool:
+        return method.upper() in READ_METHODS
+
+    @contextlib.asynccontextmanager
+    async def ordered(self, method: str, key: str = None):
+        """Hold the ordering lock for the whole lifetime of a request, retries included.
+
+        Only writes are ordered, reads can be answered in any order.
+        """
+        if self.is_read(method):
+            yield
+            return
+
+        lock = self._write_order[key]
+        if lock.locked():
+            logger.debug(f'Waiting for earlier write to "{key}" to complete')
+        async with lock:
+            yield
+
+    @contextlib.asynccontextmanager
+    async def slot(self, method: str, deadline: float = None):
+        """Hold a concurrency slot for a single attempt of a request.
+
+        Raises TimeoutError if none comes free by deadline (in event loop
+        time), if one is given.
+        """
+        slots = self._read_slots if self.is_read(method) else self._write_slots
+        async with asyncio.timeout_at(deadline):
+            await slots.acquire()
+        try:
+            yield
+        finally:
+            slots.release()
@@ -1,4 +1,4 @@
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
@@ -20,7 +20,7 @@ async def async_setup_entry(
     coordinator = config_entry.runtime_data
 
     entities: list[ActronAirNimbusEntity] = []
-    for unique_id, state in coordinator.data.items():
+    for unique_id, state in coordinator.parsed.items():
         entities.extend(
             [
                 ActronAirNimbusQuiteModeActiveBinarySensor(
@@ -40,8 +40,7 @@ async def async_setup_entry(
                 ActronAirNimbusZoneSensorConnectedBinarySensor(
                     coordinator, state, unique_id, zone_id
                 )
-                for zone_id, zone in enumerate(state.zones)
-                if zone["NV_Exists"]
+                for zone_id in state.zone_ids
             ]
         )
 
@@ -56,6 +55,8 @@ class ActronAirNimbusQuiteModeActiveBinarySensor(
     _attr_translation_key = "quite_mode_active"
     _attr_device_class = BinarySensorDeviceClass.RUNNING
 
+    _state_paths = ("UserAirconSettings.QuietModeActive",)
+
     def __init__(
         self,
         coordinator,
@@ -72,16 +73,8 @@ class ActronAirNimbusQuiteModeActiveBinarySensor(
         )
         self._update_internal_state(initial_state)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        state = self.coordinator.data[self.ac_serial]
-
-        self._update_internal_state(state)
-
-        return super()._handle_coordinator_update()
-
     def _update_internal_state(self, state):
-        self._attr_is_on = state._state["UserAirconSettings"]["QuietModeActive"]
+        self._attr_is_on = state.quiet_mode.active
 
 
 class ActronAirNimbusCleanFilterAlertBinarySensor(
@@ -92,6 +85,8 @@ class ActronAirNimbusCleanFilterAlertBinarySensor(
     _attr_translation_key = "clean_filter_alert"
     _attr_device_class = BinarySensorDeviceClass.PROBLEM
 
+    _state_paths = ("Alerts.CleanFilter",)
+
     def __init__(
         self,
         coordinator,
@@ -109,17 +104,9 @@ class ActronAirNimbusCleanFilterAlertBinarySensor(
 
         self._update_internal_state(initial_state)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        state = self.coordinator.data[self.ac_serial]
-
-        self._update_internal_state(state)
-
-        return super()._handle_coordinator_update()
-
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_is_on = state._state["Alerts"]["CleanFilter"]
+        self._attr_is_on = state.clean_filter
 
 
 class ActronAirNimbusDefrostingAlertBinarySensor(
@@ -130,6 +117,8 @@ class ActronAirNimbusDefrostingAlertBinarySensor(
     _attr_translation_key = "defrosting_alert"
     _attr_device_class = BinarySensorDeviceClass.PROBLEM
 
+    _state_paths = ("Alerts.Defrosting",)
+
     def __init__(
         self,
         coordinator,
@@ -147,17 +136,9 @@ class ActronAirNimbusDefrostingAlertBinarySensor(
 
         self._update_internal_state(initial_state)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        state = self.coordinator.data[self.ac_serial]
-
-        self._update_internal_state(state)
-
-        return super()._handle_coordinator_update()
-
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_is_on = state._state["Alerts"]["Defrosting"]
+        self._attr_is_on = state.defrosting
 
 
 class ActronAirNimbusZoneSensorConnectedBinarySensor(
@@ -168,6 +149,8 @@ class ActronAirNimbusZoneSensorConnectedBinarySensor(
     _attr_translation_key = "zone_sensor_connected"
     _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
 
+    _state_paths = ("AirconSystem.Peripherals",)
+
     def __init__(
         self,
         coordinator,
@@ -189,21 +172,6 @@ class ActronAirNimbusZoneSensorConnectedBinarySensor(
 
         self._update_internal_state(initial_state)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        state = self.coordinator.data[self.ac_serial]
-
-        self._update_internal_state(state)
-
-        return super()._handle_coordinator_update()
-
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        peripherals = [
-            peripheral
-            for peripheral in state._state["AirconSystem"]["Peripherals"]
-            if peripheral["DeviceType"] == "Zone Sensor"
-        ]
-        peripherals.sort(key=lambda x: x["ZoneAssignment"][0])
-
-        self._attr_is_on = peripherals[self.zone_id]["ConnectionState"] == "Connected"
+        self._attr_is_on = state.zone(self.zone_id).connection_state == "Connected"
@@ -14,13 +14,14 @@ from homeassistant.const import (
     ATTR_TEMPERATURE,
     UnitOfTemperature,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.device_registry import DeviceInfo
 
 from . import ActronAirNimbusConfigEntry
-from .api.data import ActronAdvanceState
+from .api.parser import ParsedData
 from .const import DOMAIN
+from .deadband import DEADBAND_HUMIDITY, DEADBAND_TEMPERATURE
 from .entity import ActronAirNimbusEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -76,7 +77,7 @@ async def async_setup_entry(
 
     entities: list[ActronAirNimbusClimateEntity] = []
 
-    for unique_id, state in coordinator.data.items():
+    for unique_id, state in coordinator.parsed.items():
         entities.append(
             ActronAirNimbusAirConditioner(
                 coordinator=coordinator, initial_state=state, unique_id=unique_id
@@ -91,8 +92,7 @@ async def async_setup_entry(
                     ac_serial=unique_id,
                     zone_id=i,
                 )
-                for i, zone in enumerate(state.zones)
-                if zone["NV_Exists"]
+                for i in state.zone_ids
             ]
         )
 
@@ -123,6 +123,23 @@ class ActronAirNimbusAirConditioner(ActronAirNimbusClimateEntity):
     _attr_fan_modes = [FAN_AUTO, FAN_LOW, FAN_MEDIUM, FAN_HIGH]
     _attr_translation_key = "air_conditioner"
 
+    _state_paths = (
+        "UserAirconSettings.isOn",
+        "UserAirconSettings.Mode",
+        "UserAirconSettings.FanMode",
+        "UserAirconSettings.TemperatureSetpoint_Cool_oC",
+        "UserAirconSettings.TemperatureSetpoint_Heat_oC",
+        "LiveAircon.Defrost",
+        "LiveAircon.CompressorMode",
+        "MasterInfo.LiveTemp_oC",
+        "MasterInfo.LiveHumidity_pc",
+        "NV_Limits.UserSetpoint_oC",
+    )
+    _deadbands = {
+        "_attr_current_temperature": DEADBAND_TEMPERATURE,
+        "_attr_current_humidity": DEADBAND_HUMIDITY,
+    }
+
     def __init__(self, coordinator, initial_state, unique_id) -> None:
         super().__init__(coordinator, unique_id)
 
@@ -131,34 +148,26 @@ class ActronAirNimbusAirConditioner(ActronAirNimbusClimateEntity):
 
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, unique_id)},
-            name=initial_state._state["NV_SystemSettings"]["SystemName"],
+            name=initial_state.system_name,
             manufacturer="Actron Air",
-            model=initial_state._state["AirconSystem"]["MasterWCModel"],
-            serial_number=initial_state._state["AirconSystem"]["MasterSerial"],
-            sw_version=initial_state._state["AirconSystem"]["MasterWCFirmwareVersion"],
+            model=initial_state.master_wc_model,
+            serial_number=initial_state.master_serial,
+            sw_version=initial_state.firmware_versions.master_controller,
         )
 
         self._update_internal_state(initial_state)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        state = self.coordinator.data[self.unique_id]
-
-        self._update_internal_state(state)
-
-        return super()._handle_coordinator_update()
-
-    def _update_internal_state(self, state: ActronAdvanceState) -> None:
+    def _update_internal_state(self, state: ParsedData) -> None:
         _LOGGER.debug("Updating state for %s: %s", self.unique_id, state)
 
         # data
-        is_on = state._state["UserAirconSettings"]["isOn"]
-        mode = state._state["UserAirconSettings"]["Mode"]
-        fan_mode = state._state["UserAirconSettings"]["FanMode"]
-        continuous_fan = state._state["UserAirconSettings"]["FanMode"].endswith("+CONT")
+        is_on = state.is_on
+        mode = state.mode
+        fan_mode = state.fan_mode
+        continuous_fan = state.fan_mode.endswith("+CONT")
         fan_mode = fan_mode.replace("+CONT", "")
-        defrost = state._state["LiveAircon"]["Defrost"]
-        compressor_mode = state._state["LiveAircon"]["CompressorMode"]
+        defrost = state.outdoor.defrost
+        compressor_mode = state.outdoor.mode
 
         def _hvac_mode(mode: str, is_on: bool) -> HVACMode:
             """Convert Actron mode to Home Assistant HVAC mode."""
@@ -193,36 +202,36 @@ class ActronAirNimbusAirConditioner(ActronAirNimbusClimateEntity):
             """Convert Actron fan mode to Home Assistant fan mode."""
             return FAN_MODE_ACTRON_TO_HA[fan_mode]
 
-        def _current_temperature(state: ActronAdvanceState) -> float:
+        def _current_temperature(state: ParsedData) -> float:
             """Get the current temperature from the state."""
-            return state._state["MasterInfo"]["LiveTemp_oC"]
+            return state.common_humidity_temperature.temperature
 
-        def _current_humidity(state: ActronAdvanceState) -> float:
+        def _current_humidity(state: ParsedData) -> float:
             """Get the current humidity from the state."""
-            return state._state["MasterInfo"]["LiveHumidity_pc"]
+            return state.common_humidity_temperature.humidity
 
-        def _target_temperature(state: ActronAdvanceState, mode: str) -> float:
+        def _target_temperature(state: ParsedData, mode: str) -> float:
             """Get the target temperature from the state."""
             if mode == "HEAT":
-                return state._state["UserAirconSettings"]["TemperatureSetpoint_Heat_oC"]
+                return state.temperature_setpoints.heat
             elif mode == "COOL":
-                return state._state["UserAirconSettings"]["TemperatureSetpoint_Cool_oC"]
+                return state.temperature_setpoints.cool
             return None
 
-        def _min_temp(state: ActronAdvanceState, mode: str) -> float:
+        def _min_temp(state: ParsedData, mode: str) -> float:
             """Get the minimum temperature from the state."""
             if mode == "HEAT":
-                return state._state["NV_Limits"]["UserSetpoint_oC"]["setHeat_Min"]
+                return state.limits.heat_min
             elif mode == "COOL":
-                return state._state["NV_Limits"]["UserSetpoint_oC"]["setCool_Min"]
+                return state.limits.min
             return None
 
-        def _max_temp(state: ActronAdvanceState, mode: str) -> float:
+        def _max_temp(state: ParsedData, mode: str) -> float:
             """Get the minimum temperature from the state."""
             if mode == "HEAT":
-                return state._state["NV_Limits"]["UserSetpoint_oC"]["setHeat_Max"]
+                return state.limits.heat_max
             elif mode == "COOL":
-                return state._state["NV_Limits"]["UserSetpoint_oC"]["setCool_Max"]
+                return state.limits.max
             return None
 
         self._attr_hvac_mode = _hvac_mode(mode, is_on)
@@ -244,17 +253,6 @@ class ActronAirNimbusAirConditioner(ActronAirNimbusClimateEntity):
             is_on=hvac_mode != HVACMode.OFF,
         )
 
-        # pre-emptively update local values given actron events can be slow
-        self._attr_hvac_mode = hvac_mode
-        # update hvac_action if we're confident
-        if hvac_mode == HVACMode.OFF:
-            self._attr_hvac_action = HVACAction.OFF
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
     async def async_turn_on(self):
         """Turn the entity on."""
         await self.coordinator.actron_api_client.set_system_mode(
@@ -262,17 +260,6 @@ class ActronAirNimbusAirConditioner(ActronAirNimbusClimateEntity):
             is_on=True,
         )
 
-        # pre-emptively update local values given actron events can be slow
-        mode = self.coordinator.data[self.ac_serial]._state["UserAirconSettings"][
-            "Mode"
-        ]
-        self._attr_hvac_mode = HVAC_MODE_ACTRON_TO_HA[mode]
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
     async def async_turn_off(self):
         """Turn the entity off."""
         await self.coordinator.actron_api_client.set_system_mode(
@@ -280,37 +267,16 @@ class ActronAirNimbusAirConditioner(ActronAirNimbusClimateEntity):
             is_on=False,
         )
 
-        # pre-emptively update local values given actron events can be slow
-        self._attr_hvac_mode = HVACMode.OFF
-        self._attr_hvac_action = HVACAction.OFF
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Set new target fan mode."""
         # for continuous mode we want to use whatever the current setting is
-        continuous = (
-            self.coordinator.data[self.ac_serial]
-            ._state["UserAirconSettings"]["FanMode"]
-            .endswith("+CONT")
-        )
+        continuous = self.coordinator.parsed[self.ac_serial].fan_mode.endswith("+CONT")
         await self.coordinator.actron_api_client.set_fan_mode(
             serial=self.unique_id,
             mode=FAN_MODE_HA_TO_ACTRON[fan_mode],
             continuous=continuous,
         )
 
-        # pre-emptively update local values given actron events can be slow
-        self._attr_fan_mode = fan_mode
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
         temperature = kwargs[ATTR_TEMPERATURE]
@@ -321,14 +287,6 @@ class ActronAirNimbusAirConditioner(ActronAirNimbusClimateEntity):
             zone_number=None,  # None means it's for the whole system
         )
 
-        # pre-emptively update local values given actron events can be slow
-        self._attr_target_temperature = temperature
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
 
 class ActronAirNimbusZone(ActronAirNimbusClimateEntity):
     """Representation of an Actron Air Nimbus zone."""
@@ -340,6 +298,23 @@ class ActronAirNimbusZone(ActronAirNimbusClimateEntity):
     )
     _attr_translation_key = "zone"
 
+    _state_paths = (
+        "UserAirconSettings.isOn",
+        "UserAirconSettings.Mode",
+        "UserAirconSettings.FanMode",
+        "UserAirconSettings.EnabledZones",
+        "UserAirconSettings.TemperatureSetpoint_Cool_oC",
+        "UserAirconSettings.TemperatureSetpoint_Heat_oC",
+        "UserAirconSettings.ZoneTemperatureSetpointVariance_oC",
+        "LiveAircon.Defrost",
+        "LiveAircon.CompressorMode",
+        "RemoteZoneInfo[{zone_id}]",
+    )
+    _deadbands = {
+        "_attr_current_temperature": DEADBAND_TEMPERATURE,
+        "_attr_current_humidity": DEADBAND_HUMIDITY,
+    }
+
     def __init__(self, coordinator, initial_state, ac_serial, zone_id) -> None:
         super().__init__(coordinator, zone_id)
 
@@ -347,48 +322,36 @@ class ActronAirNimbusZone(ActronAirNimbusClimateEntity):
         self.ac_serial = ac_serial
         self.zone_id = zone_id
 
-        peripherals = [
-            peripheral
-            for peripheral in initial_state._state["AirconSystem"]["Peripherals"]
-            if peripheral["DeviceType"] == "Zone Sensor"
-        ]
-        peripherals.sort(key=lambda x: x["ZoneAssignment"][0])
+        zone_sensor = coordinator.data[ac_serial].index.by_zone[zone_id]
 
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, self.unique_id)},
             via_device=(DOMAIN, ac_serial),
-            name=f"{initial_state.zones[zone_id]['NV_Title']} zone",
+            name=f"{initial_state.zone(zone_id).title} zone",
             manufacturer="Actron Air",
-            model=peripherals[zone_id]["DeviceType"],
-            serial_number=peripherals[zone_id]["SerialNumber"],
-            sw_version=peripherals[zone_id]["Firmware"]["InstalledVersion"]["NRF52"],
+            model=zone_sensor["DeviceType"],
+            serial_number=zone_sensor["SerialNumber"],
+            sw_version=zone_sensor["Firmware"]["InstalledVersion"]["NRF52"],
         )
 
         self._update_internal_state(initial_state)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        state = self.coordinator.data[self.ac_serial]
-
-        self._update_internal_state(state)
-
-        return super()._handle_coordinator_update()
-
-    def _update_internal_state(self, state: ActronAdvanceState) -> None:
+    def _update_internal_state(self, state: ParsedData) -> None:
         _LOGGER.debug(
             "Updating state for %s - zone %s: %s", self.unique_id, self.zone_id, state
         )
 
         # data
-        is_on = state._state["UserAirconSettings"]["isOn"]
-        mode = state._state["UserAirconSettings"]["Mode"]
-        fan_mode = state._state["UserAirconSettings"]["FanMode"]
-        continuous_fan = state._state["UserAirconSettings"]["FanMode"].endswith("+CONT")
+        zone = state.zone(self.zone_id)
+        is_on = state.is_on
+        mode = state.mode
+        fan_mode = state.fan_mode
+        continuous_fan = state.fan_mode.endswith("+CONT")
         fan_mode = fan_mode.replace("+CONT", "")
-        defrost = state._state["LiveAircon"]["Defrost"]
-        compressor_mode = state._state["LiveAircon"]["CompressorMode"]
-        zone_enabled = state._state["UserAirconSettings"]["EnabledZones"][self.zone_id]
-        zone_damper_open = state.zones[self.zone_id]["ZonePosition"] != 0
+        defrost = state.outdoor.defrost
+        compressor_mode = state.outdoor.mode
+        zone_enabled = state.enabled_zones[self.zone_id]
+        zone_damper_open = zone.position != 0
 
         def _hvac_modes(mode: str) -> list[HVACMode]:
             return [
@@ -434,56 +397,38 @@ class ActronAirNimbusZone(ActronAirNimbusClimateEntity):
             # Default to idle if no specific action is found
             return HVACAction.IDLE
 
-        def _current_temperature(state: ActronAdvanceState) -> float:
+        def _current_temperature(state: ParsedData) -> float:
             """Get the current temperature from the state."""
-            return state.zones[self.zone_id]["LiveTemp_oC"]
+            return zone.temperature
 
-        def _current_humidity(state: ActronAdvanceState) -> float:
+        def _current_humidity(state: ParsedData) -> float:
             """Get the current humidity from the state."""
-            return state.zones[self.zone_id]["LiveHumidity_pc"]
+            return zone.humidity
 
-        def _target_temperature(state: ActronAdvanceState, mode: str) -> float:
+        def _target_temperature(state: ParsedData, mode: str) -> float:
             """Get the target temperature from the state."""
             if mode == "HEAT":
-                return state.zones[self.zone_id]["TemperatureSetpoint_Heat_oC"]
+                return zone.temperature_setpoint_heat
             elif mode == "COOL":
-                return state.zones[self.zone_id]["TemperatureSetpoint_Cool_oC"]
+                return zone.temperature_setpoint_cool
             return None
 
-        def _min_temp(state: ActronAdvanceState, mode: str) -> float:
+        def _min_temp(state: ParsedData, mode: str) -> float:
             """Get the minimum temperature from the state."""
+            setpoints = state.temperature_setpoints
             if mode == "HEAT":
-                return (
-                    state._state["UserAirconSettings"]["TemperatureSetpoint_Heat_oC"]
-                    - state._state["UserAirconSettings"][
-                        "ZoneTemperatureSetpointVariance_oC"
-                    ]
-                )
+                return setpoints.heat - setpoints.variance
             elif mode == "COOL":
-                return (
-                    state._state["UserAirconSettings"]["TemperatureSetpoint_Cool_oC"]
-                    - state._state["UserAirconSettings"][
-                        "ZoneTemperatureSetpointVariance_oC"
-                    ]
-                )
+                return setpoints.cool - setpoints.variance
             return None
 
-        def _max_temp(state: ActronAdvanceState, mode: str) -> float:
+        def _max_temp(state: ParsedData, mode: str) -> float:
             """Get the maximum temperature from the state."""
+            setpoints = state.temperature_setpoints
             if mode == "HEAT":
-                return (
-                    state._state["UserAirconSettings"]["TemperatureSetpoint_Heat_oC"]
-                    + state._state["UserAirconSettings"][
-                        "ZoneTemperatureSetpointVariance_oC"
-                    ]
-                )
+                return setpoints.heat + setpoints.variance
             elif mode == "COOL":
-                return (
-                    state._state["UserAirconSettings"]["TemperatureSetpoint_Cool_oC"]
-                    + state._state["UserAirconSettings"][
-                        "ZoneTemperatureSetpointVariance_oC"
-                    ]
-                )
+                return setpoints.cool + setpoints.variance
             return None
 
         self._attr_hvac_mode = _hvac_mode(mode, zone_enabled)
@@ -505,11 +450,18 @@ class ActronAirNimbusZone(ActronAirNimbusClimateEntity):
         # can only select either the mode that the parent is in, or off
         self._attr_hvac_modes = _hvac_modes(mode)
 
+    def _enabled_zones(self) -> list[bool]:
+        """Get a modifiable copy of the enabled zones.
+
+        Coordinator data includes zone changes that haven't been confirmed yet
+        so toggling several zones quickly doesn't undo the earlier toggles.
+        """
+        # coordinator state is read-only, take a copy to modify
+        return list(self.coordinator.parsed[self.ac_serial].enabled_zones)
+
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
-        enabled_zones = self.coordinator.data[self.ac_serial]._state[
-            "UserAirconSettings"
-        ]["EnabledZones"]
+        enabled_zones = self._enabled_zones()
 
         enabled_zones[self.zone_id] = hvac_mode != HVACMode.OFF
 
@@ -518,59 +470,24 @@ class ActronAirNimbusZone(ActronAirNimbusClimateEntity):
             enabled_zones=enabled_zones,
         )
 
-        # pre-emptively update local values given actron events can be slow
-        self._attr_hvac_mode = hvac_mode
-        # update hvac_action if we're confident
-        if hvac_mode == HVACMode.OFF:
-            self._attr_hvac_action = HVACAction.OFF
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
     async def async_turn_on(self):
         """Turn the entity on."""
-        enabled_zones = self.coordinator.data[self.ac_serial]._state[
-            "UserAirconSettings"
-        ]["EnabledZones"]
+        enabled_zones = self._enabled_zones()
         enabled_zones[self.zone_id] = True
         await self.coordinator.actron_api_client.set_enabled_zones(
             serial=self.ac_serial,
             enabled_zones=enabled_zones,
         )
 
-        # pre-emptively update local values given actron events can be slow
-        mode = self.coordinator.data[self.ac_serial]._state["UserAirconSettings"][
-            "Mode"
-        ]
-        self._attr_hvac_mode = HVAC_MODE_ACTRON_TO_HA[mode]
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
     async def async_turn_off(self):
         """Turn the entity off."""
-        enabled_zones = self.coordinator.data[self.ac_serial]._state[
-            "UserAirconSettings"
-        ]["EnabledZones"]
+        enabled_zones = self._enabled_zones()
         enabled_zones[self.zone_id] = False
         await self.coordinator.actron_api_client.set_enabled_zones(
             serial=self.ac_serial,
             enabled_zones=enabled_zones,
         )
 
-        # pre-emptively update local values given actron events can be slow
-        self._attr_hvac_mode = HVACMode.OFF
-        self._attr_hvac_action = HVACAction.OFF
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
         temperature = kwargs[ATTR_TEMPERATURE]
@@ -580,12 +497,3 @@ class ActronAirNimbusZone(ActronAirNimbusClimateEntity):
             heat=temperature,
             zone_number=self.zone_id,
         )
-
-        # pre-emptively update local values given actron events can be slow
-        self._attr_target_temperature = temperature
-        # TODO: should also update min/max temps too
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
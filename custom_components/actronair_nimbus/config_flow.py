@@ -7,12 +7,45 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, CONF_API_TOKEN
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_API_TOKEN,
+    CONF_SCAN_INTERVAL,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN, NIMBUS_DEFAULT_URL
+from .const import (
+    DOMAIN,
+    NIMBUS_DEFAULT_URL,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_HUMIDITY_DEADBAND,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_POWER_DEADBAND,
+    CONF_SPEED_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND,
+)
+from .deadband import (
+    DEFAULT_HUMIDITY_DEADBAND,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_POWER_DEADBAND,
+    DEFAULT_SPEED_DEADBAND,
+    DEFAULT_TEMPERATURE_DEADBAND,
+)
+from .polling import (
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -73,6 +106,12 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -96,6 +135,77 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
 
+class OptionsFlowHandler(OptionsFlow):
+    """Handle options for Actron Air Nimbus."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the poll intervals and how often noisy readings are written."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            # each interval is the rate of a slower state than the one before
+            if (
+                user_input[CONF_FAST_SCAN_INTERVAL]
+                <= user_input[CONF_SCAN_INTERVAL]
+                <= user_input[CONF_IDLE_SCAN_INTERVAL]
+            ):
+                return self.async_create_entry(data=user_input)
+            errors["base"] = "interval_order"
+
+        options = self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_FAST_SCAN_INTERVAL,
+                    default=options.get(
+                        CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Required(
+                    CONF_SCAN_INTERVAL,
+                    default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                vol.Required(
+                    CONF_IDLE_SCAN_INTERVAL,
+                    default=options.get(
+                        CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=30)),
+                vol.Required(
+                    CONF_TEMPERATURE_DEADBAND,
+                    default=options.get(
+                        CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                vol.Required(
+                    CONF_HUMIDITY_DEADBAND,
+                    default=options.get(
+                        CONF_HUMIDITY_DEADBAND, DEFAULT_HUMIDITY_DEADBAND
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=20)),
+                vol.Required(
+                    CONF_POWER_DEADBAND,
+                    default=options.get(CONF_POWER_DEADBAND, DEFAULT_POWER_DEADBAND),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=50)),
+                vol.Required(
+                    CONF_SPEED_DEADBAND,
+                    default=options.get(CONF_SPEED_DEADBAND, DEFAULT_SPEED_DEADBAND),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=50)),
+                vol.Required(
+                    CONF_MIN_WRITE_INTERVAL,
+                    default=options.get(
+                        CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+            }
+        )
+        if user_input is not None:
+            # show what was entered again rather than the saved options
+            schema = self.add_suggested_values_to_schema(schema, user_input)
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
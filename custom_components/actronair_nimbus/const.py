@@ -3,3 +3,20 @@
 DOMAIN = "actronair_nimbus"
 
 NIMBUS_DEFAULT_URL = "https://nimbus.actronair.com.au"
+
+CONF_FAST_SCAN_INTERVAL = "fast_scan_interval"
+CONF_IDLE_SCAN_INTERVAL = "idle_scan_interval"
+
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+CONF_HUMIDITY_DEADBAND = "humidity_deadband"
+CONF_POWER_DEADBAND = "power_deadband"
+CONF_SPEED_DEADBAND = "speed_deadband"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+
+# access token persisted between restarts
+TOKEN_STORAGE_VERSION = 1
+TOKEN_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.token"
+
+# last known systems and state persisted between restarts
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.snapshot"
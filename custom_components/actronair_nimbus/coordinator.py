@@ -1,18 +1,48 @@
-import copy
+import asyncio
 import logging
+import time
 
-from typing import Any
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.components.climate import SCAN_INTERVAL
+from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.debounce import Debouncer
-
-from .const import DOMAIN
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_IDLE_SCAN_INTERVAL,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+)
 from .alert import create_notification
 
 from .api.data import ActronAdvanceState
+from .api.frozen import freeze
+from .api.journal import EventJournal
+from .api.parser import ParsedData
+from .api.capture import (
+    CAPTURE_EVENTS,
+    CAPTURE_SNAPSHOT,
+    CAPTURE_STATUS,
+    CAPTURE_STREAM,
+    CaptureWriter,
+)
+from .api.paths import ChangeSet, KeyPath
+from .deadband import Deadband, deadbands_from_options
+from .polling import (
+    AdaptivePollScheduler,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,10 +51,41 @@ REQUEST_REFRESH_DELAY = (
     10.0  # seconds to wait before allowing another request to refresh data
 )
 
+# how many systems may be refreshed at the same time
+MAX_CONCURRENT_SYSTEM_REFRESHES = 4
+
+# how long to wait before reopening an event stream that failed
+EVENT_STREAM_RETRY_SECONDS = 30
+
+# how long to wait after a change before saving the snapshot, so a burst of
+# updates is only written once
+SNAPSHOT_SAVE_DELAY_SECONDS = 30
+
+# how many refresh durations are remembered, for diagnostics
+REFRESH_HISTORY_SIZE = 20
+
+# how many captured payloads are buffered before being written out
+CAPTURE_FLUSH_SIZE = 20
+
 DATA_MODE_EVENT = "event"
 DATA_MODE_STATUS = "status"
 
 
+@dataclass(slots=True)
+class SystemStats:
+    """How updates to a single system have been going."""
+
+    # events merged into the state
+    events_merged: int = 0
+    # individual keys changed by those events (or by status updates)
+    changes_merged: int = 0
+    # seconds between the newest event in a batch happening and us merging
+    # it, never negative even if the server's clock is ahead of ours
+    event_lag: float | None = None
+    # when the state last actually changed
+    last_changed: datetime | None = None
+
+
 class ActronAirNimbusDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the ActronAir Nimbus device."""
 
@@ -39,21 +100,94 @@ class ActronAirNimbusDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER,
             config_entry=config_entry,
             name=DOMAIN,
-            update_interval=SCAN_INTERVAL,
-            # customise debouncer and always update to fix UI responsiveness
+            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            # customise debouncer to fix UI responsiveness
             request_refresh_debouncer=Debouncer(
                 hass, _LOGGER, cooldown=REQUEST_REFRESH_DELAY, immediate=False
             ),
+            # always broadcast, as a refresh can matter even when the states
+            # compare equal (a system recovering from stale, the refresh
+            # stats). Entities skip writes themselves (see has_changed).
             always_update=True,
         )
 
         self.actron_api_client = actron_api_client
+        # let the client skip sending settings that are already in effect
+        actron_api_client.settings_coalescer.state_provider = self._known_state
+
+        # settings sent but not yet confirmed are overlaid on the published data
+        self.pending_settings = actron_api_client.pending_settings
+        self.pending_settings.listener = self._handle_pending_settings_changed
 
         self.systems = None
 
         self.data_mode = DATA_MODE_STATUS
 
-        self.servicing = None
+        self.max_concurrent_refreshes = MAX_CONCURRENT_SYSTEM_REFRESHES
+
+        # serials whose last refresh failed and are showing their last good state
+        self.stale_systems: set[str] = set()
+
+        # servicing data per serial so we know which errors have been alerted on
+        self.servicing: dict[str, dict] = {}
+
+        # what changed per serial in the last update, None meaning everything
+        self.changes: dict[str, ChangeSet | None] = {}
+
+        # state as last reported by each system, without pending settings
+        self.confirmed: dict[str, ActronAdvanceState] = {}
+
+        # typed view of the published state of each system, for entities
+        self.parsed: dict[str, ParsedData] = {}
+
+        options = config_entry.options
+        self.poll_scheduler = AdaptivePollScheduler(
+            fast_interval=options.get(
+                CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL
+            ),
+            interval=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            idle_interval=options.get(
+                CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL
+            ),
+        )
+        # how much noisy readings must change by before entities write them
+        self.deadbands: dict[str, Deadband] = deadbands_from_options(options)
+
+        # set when every system should be refreshed regardless of schedule
+        self._refresh_all = False
+        # systems to bring back in step with a status poll, having skipped
+        # an event that couldn't be merged
+        self._resync_systems: set[str] = set()
+
+        # background tasks pushing each system's events in as they arrive
+        self._event_streams: dict[str, asyncio.Task] = {}
+        # set to have a system's stream fetch now rather than wait
+        self._stream_wakeups: dict[str, asyncio.Event] = {}
+        # serials whose event stream is currently healthy
+        self.streaming: set[str] = set()
+
+        # performance of updates, for diagnostics
+        self.stats: dict[str, SystemStats] = {}
+        # recent history of what changed in each system
+        self.journals: dict[str, EventJournal] = {}
+        # seconds each refresh took, most recent last
+        self.refresh_durations: deque[float] = deque(maxlen=REFRESH_HISTORY_SIZE)
+
+        # payloads received are recorded here while capturing, for replaying
+        self.capture: CaptureWriter | None = None
+        self._cancel_capture_timeout: Callable[[], None] | None = None
+
+        # what we knew before a restart
+        self._snapshot_store = snapshot_store(hass, config_entry)
+
+        # follow up a command with a poll once the AC has had time to act on it
+        self._command_refresh_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=self.poll_scheduler.fast_interval,
+            immediate=False,
+            function=self.async_refresh,
+        )
 
     async def _async_setup(self):
         _LOGGER.debug("Fetching systems")
@@ -63,32 +197,493 @@ class ActronAirNimbusDataUpdateCoordinator(DataUpdateCoordinator):
         """Fetch updates and merge incremental changes into the full state."""
 
         _LOGGER.debug(f"Performing data update using mode {self.data_mode}")
+        started_at = time.monotonic()
+
+        previous = self.confirmed
+        all_serial_numbers = [
+            system["serial"] for system in self.systems["_embedded"]["ac-system"]
+        ]
+
+        # only poll the systems that are due, everything else keeps its state
+        if self._refresh_all:
+            self._refresh_all = False
+            serial_numbers = all_serial_numbers
+        else:
+            serial_numbers = self.poll_scheduler.due(all_serial_numbers)
+        _LOGGER.debug(f"Refreshing {len(serial_numbers)}/{len(all_serial_numbers)} systems")
+
+        # refresh every system at once, bounded so a large account doesn't
+        # flood the API. Each system is isolated so one failing doesn't stop
+        # the others from updating.
+        semaphore = asyncio.Semaphore(self.max_concurrent_refreshes)
+
+        async def _refresh(
+            serial_number: str,
+        ) -> tuple[ActronAdvanceState, list, list[dict]]:
+            async with semaphore:
+                return await self._async_update_system(
+                    serial_number=serial_number, previous=previous.get(serial_number)
+                )
+
+        results = await asyncio.gather(
+            *(_refresh(serial_number) for serial_number in serial_numbers),
+            return_exceptions=True,
+        )
+
+        data = {}
+        changes = {}
+        stale_systems = set()
+        for serial_number, result in zip(serial_numbers, results):
+            if isinstance(result, BaseException):
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                _LOGGER.warning(
+                    'Failed to update "%s", keeping last known state: %s',
+                    serial_number,
+                    result,
+                    exc_info=result,
+                )
+                stale_systems.add(serial_number)
+                # keep last good state (if we have ever had one), including
+                # any events pushed in while we were refreshing
+                if serial_number in self.confirmed:
+                    data[serial_number] = self.confirmed[serial_number]
+                    changes[serial_number] = ChangeSet()
+                continue
+
+            self._resync_systems.discard(serial_number)
+            state, state_changes, events = result
+            state, state_changes = self._rebase(
+                serial_number, previous.get(serial_number), state, state_changes
+            )
+            # only now is it known what the poll changed from what we had
+            self._record_merge(serial_number, state, events, state_changes)
+            data[serial_number] = state
+            # everything is new if we've not seen this system before or have
+            # been unavailable, otherwise only what we were told changed
+            if (
+                serial_number in previous
+                and self.last_update_success
+                and serial_number not in self.stale_systems
+            ):
+                changes[serial_number] = ChangeSet(key for key, _, _ in state_changes)
+            else:
+                changes[serial_number] = None
+            self._raise_servicing_alerts(serial_number, state)
+
+        # systems that weren't due this time round are unchanged (other than
+        # by any events pushed in while we were refreshing)
+        for serial_number in all_serial_numbers:
+            if serial_number not in serial_numbers and serial_number in self.confirmed:
+                data[serial_number] = self.confirmed[serial_number]
+                changes[serial_number] = ChangeSet()
+
+        # systems that weren't polled stay stale until they are refreshed
+        stale_systems |= self.stale_systems - set(serial_numbers)
+        self.stale_systems = stale_systems
+        self.confirmed = data
+        self.changes = changes
+
+        # publish what the AC told us with anything it hasn't caught up with yet
+        # laid over the top
+        published = {}
+        for serial_number, state in data.items():
+            removed = self.pending_settings.reconcile(serial_number, state._state)
+            if removed and changes[serial_number] is not None:
+                for key in removed:
+                    changes[serial_number].add(key)
+            published[serial_number] = self.pending_settings.apply(
+                serial_number, state
+            )
+
+        # work out when each system we just polled should next be polled
+        for serial_number in serial_numbers:
+            self.poll_scheduler.schedule(
+                serial_number,
+                data.get(serial_number),
+                changes.get(serial_number),
+                pending=bool(self.pending_settings.get(serial_number)),
+                streaming=serial_number in self.streaming,
+            )
+        self.update_interval = timedelta(
+            seconds=self.poll_scheduler.seconds_until_next()
+        )
+        _LOGGER.debug(f"Next poll in {self.update_interval}")
+
+        self.refresh_durations.append(time.monotonic() - started_at)
 
-        # take a copy - update all or nothing
-        data = copy.deepcopy(self.data) if self.data is not None else {}
+        # no system has a current state - treat as a failed update. Only the
+        # systems that were due are polled, so those failing alone isn't
+        # enough while others are still current.
+        if serial_numbers and stale_systems.issuperset(all_serial_numbers):
+            raise UpdateFailed("Failed to update data") from results[0]
 
+        _LOGGER.debug('Data update complete')
+
+        self._update_parsed(published)
+        self._start_event_streams(data)
+        self._schedule_snapshot_save()
+
+        return published
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the systems and their states as saved before a restart.
+
+        Every restored system is marked stale until it has been refreshed.
+        Returns whether there was anything to restore.
+        """
+        snapshot = await self._snapshot_store.async_load()
+        if not snapshot or not snapshot.get("states"):
+            return False
+
+        self.restore(snapshot)
+        _LOGGER.debug(f"Restored {len(self.confirmed)} systems from snapshot")
+        return True
+
+    @callback
+    def restore(self, snapshot: dict) -> None:
+        """Restore systems and their states from a snapshot, marking them stale."""
+        confirmed = {
+            serial_number: ActronAdvanceState.from_snapshot(stored)
+            for serial_number, stored in snapshot["states"].items()
+        }
+        # only alert on errors raised while we were away
+        for serial_number, state in confirmed.items():
+            self.servicing[serial_number] = state._state.get("Servicing")
+
+        self.systems = snapshot["systems"]
+        self.confirmed = confirmed
+        self.stale_systems = set(confirmed)
+        self.changes = {serial_number: None for serial_number in confirmed}
+        self.data = dict(confirmed)
+        self._update_parsed(self.data)
+
+    async def async_refresh_restored(self) -> None:
+        """Bring restored systems up to date."""
         try:
-            for system in self.systems["_embedded"]["ac-system"]:
-                serial_number = system["serial"]
+            await self._async_setup()
+        except Exception as err:
+            # keep going with the systems we restored
+            _LOGGER.warning("Failed to fetch systems, using restored list: %s", err)
+        self._refresh_all = True
+        await self.async_refresh()
+
+    @callback
+    def _schedule_snapshot_save(self) -> None:
+        self._snapshot_store.async_delay_save(
+            self._snapshot_data, SNAPSHOT_SAVE_DELAY_SECONDS
+        )
+
+    def _snapshot_data(self) -> dict:
+        return {
+            "systems": self.systems,
+            "states": {
+                serial_number: state.as_snapshot()
+                for serial_number, state in self.confirmed.items()
+            },
+        }
+
+    async def _async_update_system(
+        self, serial_number: str, previous: ActronAdvanceState | None
+    ) -> tuple[ActronAdvanceState, list, list[dict]]:
+        """Refresh a single system, returning its new state, changes and events.
+
+        The previous state is never touched so a failure part way through
+        leaves it intact.
+        """
+        # take a copy - update all or nothing. The copy shares all unchanged
+        # state with the previous one so this is cheap
+        state = previous.copy() if previous is not None else ActronAdvanceState()
+
+        changes = []
+        events = []
+        if (
+            self.data_mode == DATA_MODE_STATUS
+            or serial_number in self._resync_systems
+        ):
+            changes = await self._async_update_status(
+                serial_number=serial_number, state=state
+            )
+        elif self.data_mode == DATA_MODE_EVENT:
+            changes, events = await self._async_update_event(
+                serial_number=serial_number, state=state
+            )
+
+        return state, changes, events
+
+    def _rebase(
+        self,
+        serial_number: str,
+        polled_from: ActronAdvanceState | None,
+        state: ActronAdvanceState,
+        state_changes: list,
+    ) -> tuple[ActronAdvanceState, list]:
+        """Reconcile a polled state with any events pushed in while polling.
+
+        The poll started from polled_from, but the system's event stream may
+        have moved its confirmed state on since. Keeps whichever is newer,
+        returning it and what changed from the confirmed state.
+        """
+        current = self.confirmed.get(serial_number)
+        if current is None or current is polled_from:
+            return state, state_changes
+
+        if current._timestamp is not None and (
+            state._timestamp is None or state._timestamp <= current._timestamp
+        ):
+            # the stream has brought in everything we polled, if not more
+            return current, []
+
+        # what we polled is newer, so work out what it changes from the
+        # streamed state rather than from where the poll started
+        rebased = state.copy()
+        changes = []
+        rebased._state = freeze(state._state, current._state, changes)
+        if polled_from is None or state._event_id == polled_from._event_id:
+            # a status doesn't move us on through the events, the stream did
+            rebased._event_id = current._event_id
+            rebased._event_timestamp = current._event_timestamp
+        return rebased, changes
+
+    def _known_state(self, serial_number: str) -> dict | None:
+        """The last confirmed raw state for a system, if any."""
+        if serial_number not in self.confirmed:
+            return None
+        return self.confirmed[serial_number]._state
+
+    @callback
+    def _handle_pending_settings_changed(
+        self, serial_number: str, keys: list[str]
+    ) -> None:
+        """Publish a command's expected outcome straight away."""
+        if self.data is None or serial_number not in self.confirmed:
+            return
+
+        data = dict(self.data)
+        data[serial_number] = self.pending_settings.apply(
+            serial_number, self.confirmed[serial_number]
+        )
+
+        # only the entities for what was just set need to update
+        self.changes = {serial: ChangeSet() for serial in data}
+        self.changes[serial_number] = ChangeSet(keys)
+
+        self.data = data
+        self._update_parsed(data)
+        self.async_update_listeners()
+
+        # the event stream will bring in the result, otherwise poll this
+        # system fast for a while to pick it up quickly
+        if serial_number not in self.streaming:
+            self.poll_scheduler.note_activity(serial_number)
+            self._command_refresh_debouncer.async_schedule_call()
+        else:
+            self.poll_scheduler.note_activity(serial_number, poll=False)
+            self._stream_wakeups[serial_number].set()
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh of every system, not only those that are due."""
+        self._refresh_all = True
+        await super().async_request_refresh()
+
+    async def async_shutdown(self) -> None:
+        self._command_refresh_debouncer.async_shutdown()
+        for task in self._event_streams.values():
+            task.cancel()
+        self._event_streams.clear()
+        await self.async_stop_capture()
+        await super().async_shutdown()
+
+    @callback
+    def async_start_capture(self, path: str, duration: timedelta) -> None:
+        """Record every payload received for duration to path."""
+        self.capture = CaptureWriter(path)
+        # what the payloads will be merged into, so the capture can be
+        # replayed from the same starting point
+        self.capture.record(CAPTURE_SNAPSHOT, None, self._snapshot_data())
+        self._cancel_capture_timeout = async_call_later(
+            self.hass, duration, self._async_capture_timed_out
+        )
+
+    async def _async_capture_timed_out(self, _now: datetime) -> None:
+        self._cancel_capture_timeout = None
+        await self.async_stop_capture()
+
+    async def async_stop_capture(self) -> CaptureWriter | None:
+        """Stop capturing, returning the finished capture if there was one."""
+        if self._cancel_capture_timeout is not None:
+            self._cancel_capture_timeout()
+            self._cancel_capture_timeout = None
+        capture, self.capture = self.capture, None
+        if capture is not None:
+            await self.hass.async_add_executor_job(capture.close)
+            _LOGGER.info(f"Captured {capture.records} payloads to {capture.path}")
+        return capture
+
+    @callback
+    def _capture(self, kind: str, serial_number: str, payload: Any) -> None:
+        if self.capture is None:
+            return
+        self.capture.record(kind, serial_number, payload)
+        if self.capture.pending >= CAPTURE_FLUSH_SIZE:
+            self.hass.async_add_executor_job(self.capture.flush)
+
+    def _start_event_streams(self, data: dict[str, ActronAdvanceState]) -> None:
+        """Start streaming events for any system that isn't already."""
+        for serial_number in data:
+            if serial_number in self._event_streams:
+                continue
+            self._stream_wakeups[serial_number] = asyncio.Event()
+            self._event_streams[serial_number] = (
+                self.config_entry.async_create_background_task(
+                    self.hass,
+                    self._async_stream_events(serial_number),
+                    f"{DOMAIN} events {serial_number}",
+                )
+            )
+
+    async def _async_stream_events(self, serial_number: str) -> None:
+        """Merge a system's events into its state as they arrive.
+
+        Each batch costs only the keys that changed rather than the full
+        state. Should the stream fail the system falls back to being polled
+        until it can be reopened.
+        """
+
+        def refresh_secs() -> float:
+            return self.poll_scheduler.stream_interval(
+                serial_number,
+                self.confirmed.get(serial_number),
+                pending=bool(self.pending_settings.get(serial_number)),
+            )
+
+        while True:
+            state = self.confirmed.get(serial_number)
+            try:
+                async for events in self.actron_api_client.stream_ac_events(
+                    serial=serial_number,
+                    event_id=self._resume_event_id(serial_number, state),
+                    refresh_secs=refresh_secs,
+                    wakeup=self._stream_wakeups[serial_number],
+                ):
+                    if serial_number not in self.streaming:
+                        _LOGGER.debug('Streaming events for "%s"', serial_number)
+                        self.streaming.add(serial_number)
+                        # polling is now only needed as a fallback
+                        self.poll_scheduler.schedule(
+                            serial_number, None, streaming=True
+                        )
+                    self._ingest_events(serial_number, events)
+            except asyncio.CancelledError:
+                self.streaming.discard(serial_number)
+                raise
+            except Exception as err:
+                _LOGGER.warning(
+                    'Event stream for "%s" failed, polling until it recovers: %s',
+                    serial_number,
+                    err,
+                )
+
+            self.streaming.discard(serial_number)
+            self.poll_scheduler.note_activity(serial_number)
+            await asyncio.sleep(EVENT_STREAM_RETRY_SECONDS)
+
+    @callback
+    def _ingest_events(self, serial_number: str, events: list[dict]) -> None:
+        """Merge a batch of events (oldest first) and push the result."""
+        previous = self.confirmed.get(serial_number)
+        if previous is None or self.data is None:
+            return
+        self._capture(CAPTURE_STREAM, serial_number, events)
+
+        state = previous.copy()
+        # the first batch can reach back before the status we already have
+        state_changes = self._merge_events(serial_number, state, events)
+        self._record_merge(serial_number, state, events, state_changes)
+
+        confirmed = dict(self.confirmed)
+        confirmed[serial_number] = state
+        self.confirmed = confirmed
+
+        if not state_changes:
+            return
+
+        _LOGGER.debug(
+            'Merged %d changes from %d events for "%s"',
+            len(state_changes),
+            len(events),
+            serial_number,
+        )
+        changed = ChangeSet(key for key, _, _ in state_changes)
+        # keep the stream fast while the compressor is changing state
+        self.poll_scheduler.note_changes(serial_number, changed)
+
+        # a stale system's entities need a full update to stop showing as stale
+        changes = None
+        if serial_number not in self.stale_systems:
+            changes = changed
+            for key in self.pending_settings.reconcile(serial_number, state._state):
+                changes.add(key)
+        else:
+            self.pending_settings.reconcile(serial_number, state._state)
+
+        if state._state.get("Servicing") is not previous._state.get("Servicing"):
+            self._raise_servicing_alerts(serial_number, state)
 
-                # initialise to empty state if we've not seen anything
-                if serial_number not in data:
-                    data[serial_number] = ActronAdvanceState()
+        data = dict(self.data)
+        data[serial_number] = self.pending_settings.apply(serial_number, state)
 
-                if self.data_mode == DATA_MODE_STATUS:
-                    await self._async_update_status(
-                        serial_number=serial_number, data=data
-                    )
-                if self.data_mode == DATA_MODE_EVENT:
-                    await self._async_update_event(
-                        serial_number=serial_number, data=data
-                    )
+        self.changes = {serial: ChangeSet() for serial in data}
+        self.changes[serial_number] = changes
+        self.stale_systems.discard(serial_number)
 
-        except Exception as e:
-            _LOGGER.exception("Failed to update data")
-            raise UpdateFailed("Failed to update data") from e
+        # pushing resets the refresh timer, so keep it pointing at whichever
+        # system is due to be polled next
+        self.update_interval = timedelta(
+            seconds=self.poll_scheduler.seconds_until_next()
+        )
+        self._update_parsed(data)
+        self.async_set_updated_data(data)
+        self._schedule_snapshot_save()
+
+    def _update_parsed(self, data: dict[str, ActronAdvanceState]) -> None:
+        """Bring the parsed view of each system up to date with data.
+
+        Only what changed is parsed again, unless everything did.
+        """
+        parsed = {}
+        for serial_number, state in data.items():
+            changes = self.changes.get(serial_number)
+            system = self.parsed.get(serial_number)
+            if system is None or changes is None:
+                system = ParsedData.from_state(state)
+            else:
+                system.apply_changes(state, changes)
+            parsed[serial_number] = system
+        self.parsed = parsed
+
+    def has_changed(self, serial_number: str, paths: list[KeyPath] | None) -> bool:
+        """Whether anything under paths changed for a system in the last update.
+
+        A paths of None means the caller depends on everything.
+        """
+        # availability has changed, everyone needs to know
+        if not self.last_update_success:
+            return True
+
+        changes = self.changes.get(serial_number)
+        if changes is None or paths is None:
+            return changes is None or bool(changes)
+
+        return changes.affects(paths)
+
+    def _raise_servicing_alerts(
+        self, serial_number: str, state: ActronAdvanceState
+    ) -> None:
+        """Raise a notification for any errors we have not seen before."""
+        seen = self.servicing.get(serial_number)
 
-        _LOGGER.debug(f'Determining if need to raise alerts (have {len(data[serial_number].servicing.get("NV_ErrorHistory", []))} prior errors)')
+        _LOGGER.debug(f'Determining if need to raise alerts for "{serial_number}" (have {len(state.servicing.get("NV_ErrorHistory", []))} prior errors)')
 
         # "Servicing": {
         #         "NV_ErrorHistory": [
@@ -119,13 +714,13 @@ class ActronAirNimbusDataUpdateCoordinator(DataUpdateCoordinator):
         #         ]
         # }
 
-        for error in data[serial_number].servicing.get('NV_ErrorHistory', []):
+        for error in state.servicing.get('NV_ErrorHistory', []):
             # if we haven't seen any errors before, stop! We don't want to flood on past errors
-            if self.servicing is None:
+            if seen is None:
                 _LOGGER.debug('No prior servicing data, skipping alert raising to avoid flood')
                 break
             # if we have seen an error before - stop! The API returns the latest error first, so we can skip the rest
-            if self.servicing is not None and error in self.servicing.get('NV_ErrorHistory', []):
+            if error in seen.get('NV_ErrorHistory', []):
                 _LOGGER.debug(f'Seen error ({error}) before, stopping alert raising to avoid duplicates')
                 break
             # if an error is not an error, skip it
@@ -135,23 +730,24 @@ class ActronAirNimbusDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER.debug(f'Raising alert for ActronAir Nimbus error: {error}')
             create_notification(self.hass, f"{error['Description']} (Severity: {error['Severity']}, Code: {error['Code']}, Time: {error['Time']})", title="ActronAir Nimbus Alert")
 
-
-        # save servicing data so we know what errors we have seen so far
-        self.servicing = copy.deepcopy(data[serial_number].servicing)
-
-        _LOGGER.debug('Data update complete')
-
-        return data
-
-    async def _async_update_status(self, serial_number: str, data: dict) -> dict:
-        data[serial_number].update_from_status(
-            status=await self.actron_api_client.get_ac_status(serial=serial_number)
-        )
-
-    async def _async_update_event(self, serial_number: str, data: dict) -> dict:
-        # if the state is empty then get all events, otherwise just get latest
-        # that we have not seen yet
-        if data[serial_number]._event_id is None:
+        # save servicing data so we know what errors we have seen so far - state
+        # is immutable so no need to copy
+        self.servicing[serial_number] = state.servicing
+
+    async def _async_update_status(
+        self, serial_number: str, state: ActronAdvanceState
+    ) -> list:
+        status = await self.actron_api_client.get_ac_status(serial=serial_number)
+        self._capture(CAPTURE_STATUS, serial_number, status)
+        return state.update_from_status(status=status)
+
+    async def _async_update_event(
+        self, serial_number: str, state: ActronAdvanceState
+    ) -> tuple[list, list[dict]]:
+        # carry on from the last event we saw (even from before a restart) if
+        # we can, otherwise start again from the latest events
+        event_id = self._resume_event_id(serial_number, state)
+        if event_id is None:
             _LOGGER.debug('Getting latest events for "%s"', serial_number)
             events = await self.actron_api_client.get_ac_events(
                 serial=serial_number, event_type="latest"
@@ -160,12 +756,12 @@ class ActronAirNimbusDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER.debug(
                 'Getting newer events for "%s" since event id %s',
                 serial_number,
-                data[serial_number]._event_id,
+                event_id,
             )
             events = await self.actron_api_client.get_ac_events(
                 serial=serial_number,
                 event_type="newer",
-                event_id=data[serial_number]._event_id,
+                event_id=event_id,
             )
             _LOGGER.debug(
                 'Found %d newer events for "%s"',
@@ -173,6 +769,99 @@ class ActronAirNimbusDataUpdateCoordinator(DataUpdateCoordinator):
                 serial_number,
             )
 
+        self._capture(CAPTURE_EVENTS, serial_number, events)
+
         # ensure sorted so that we apply oldest to newest or result will be wrong
-        for event in sorted(events["events"], key=lambda x: x["timestamp"]):
-            data[serial_number].update_from_event(event)
+        changes = self._merge_events(
+            serial_number,
+            state,
+            sorted(events["events"], key=lambda x: x["timestamp"]),
+            # the latest events can reach back before the state we already have
+            skip_older=event_id is None,
+        )
+        return changes, events["events"]
+
+    def _merge_events(
+        self,
+        serial_number: str,
+        state: ActronAdvanceState,
+        events: list[dict],
+        skip_older: bool = True,
+    ) -> list:
+        """Merge events (oldest first) into state, returning what changed.
+
+        An event that can't be merged is skipped rather than failing the
+        rest, which would only be fetched again from the same event forever.
+        The system is then brought back in step with a status poll.
+        """
+        changes = []
+        for event in events:
+            try:
+                if skip_older and state.is_older_than_state(event):
+                    continue
+                changes.extend(state.update_from_event(event) or [])
+            except Exception:
+                _LOGGER.warning(
+                    'Skipping event for "%s" that could not be merged: %s',
+                    serial_number,
+                    event,
+                    exc_info=True,
+                )
+                # carry on from after it, rather than from before it again
+                state._event_id = event.get("id", state._event_id)
+                self._async_resync(serial_number)
+        return changes
+
+    @callback
+    def _async_resync(self, serial_number: str) -> None:
+        """Poll a system's full status soon, whatever the data mode."""
+        self._resync_systems.add(serial_number)
+        self.poll_scheduler.mark_due(serial_number)
+        self._command_refresh_debouncer.async_schedule_call()
+
+    def _record_merge(
+        self,
+        serial_number: str,
+        state: ActronAdvanceState,
+        events: list[dict],
+        changes: list,
+    ) -> None:
+        journal = self.journals.get(serial_number)
+        if journal is None:
+            journal = self.journals[serial_number] = EventJournal()
+        journal.record(state._state, changes)
+
+        stats = self.stats.get(serial_number)
+        if stats is None:
+            stats = self.stats[serial_number] = SystemStats()
+        stats.events_merged += len(events)
+        stats.changes_merged += len(changes)
+        if changes:
+            stats.last_changed = datetime.now(timezone.utc)
+        if events:
+            newest = max(events, key=lambda x: x["timestamp"])
+            stats.event_lag = ActronAdvanceState.event_time_ago(newest).total_seconds()
+
+    def _resume_event_id(
+        self, serial_number: str, state: ActronAdvanceState | None
+    ) -> str | None:
+        """The event id to fetch newer events from, or None for the latest."""
+        if state is None:
+            return None
+
+        event_id = state.resume_event_id(datetime.now(timezone.utc))
+        if event_id is None and state._event_id is not None:
+            _LOGGER.debug(
+                'Last event for "%s" is too old to resume from, using latest',
+                serial_number,
+            )
+        return event_id
+
+
+def snapshot_store(hass: HomeAssistant, config_entry: ConfigEntry) -> Store:
+    """The store holding a config entry's last known systems and states."""
+    return Store(
+        hass,
+        SNAPSHOT_STORAGE_VERSION,
+        SNAPSHOT_STORAGE_KEY.format(entry_id=config_entry.entry_id),
+    )
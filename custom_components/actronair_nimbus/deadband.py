@@ -0,0 +1,82 @@
+"""Deadbands deciding which changes to noisy readings are worth writing."""
+
+from dataclasses import dataclass, replace
+from numbers import Real
+
+from .const import (
+    CONF_HUMIDITY_DEADBAND,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_POWER_DEADBAND,
+    CONF_SPEED_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND,
+)
+
+# kinds of reading sharing a deadband
+DEADBAND_TEMPERATURE = "temperature"
+DEADBAND_HUMIDITY = "humidity"
+DEADBAND_POWER = "power"
+DEADBAND_SPEED = "speed"
+
+DEFAULT_TEMPERATURE_DEADBAND = 0.2  # degrees
+DEFAULT_HUMIDITY_DEADBAND = 1.0  # percentage points
+DEFAULT_POWER_DEADBAND = 5.0  # percent of the last value written
+DEFAULT_SPEED_DEADBAND = 5.0  # percent of the last value written
+DEFAULT_MIN_WRITE_INTERVAL = 30  # seconds
+
+FLOAT_TOLERANCE = 1e-9
+
+# ignore power changes smaller than this however low the power is
+POWER_DEADBAND_FLOOR_WATTS = 20
+
+
+@dataclass(frozen=True, slots=True)
+class Deadband:
+    """When a new value of a noisy reading is significant enough to write.
+
+    A change must be at least the larger of absolute and percent of the
+    last value written. Changes to or from zero (off to on, and back) are
+    always significant, as is anything that isn't a number. Even then a
+    reading is written at most once every min_interval seconds.
+    """
+
+    absolute: float = 0
+    percent: float = 0
+    min_interval: float = 0
+
+    def is_significant(self, last, value) -> bool:
+        if value == last:
+            return False
+        if not isinstance(value, Real) or not isinstance(last, Real):
+            return True
+        if value == 0 or last == 0:
+            return True
+        threshold = max(self.absolute, abs(last) * self.percent / 100)
+        # readings are decimals, so e.g. 21.2 - 21.0 is a hair under 0.2
+        return abs(value - last) >= threshold - FLOAT_TOLERANCE
+
+
+def deadbands_from_options(options) -> dict[str, Deadband]:
+    """The deadband for each kind of reading, as configured."""
+    min_interval = options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL)
+    power_percent = options.get(CONF_POWER_DEADBAND, DEFAULT_POWER_DEADBAND)
+    deadbands = {
+        DEADBAND_TEMPERATURE: Deadband(
+            absolute=options.get(
+                CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND
+            )
+        ),
+        DEADBAND_HUMIDITY: Deadband(
+            absolute=options.get(CONF_HUMIDITY_DEADBAND, DEFAULT_HUMIDITY_DEADBAND)
+        ),
+        DEADBAND_POWER: Deadband(
+            absolute=POWER_DEADBAND_FLOOR_WATTS if power_percent else 0,
+            percent=power_percent,
+        ),
+        DEADBAND_SPEED: Deadband(
+            percent=options.get(CONF_SPEED_DEADBAND, DEFAULT_SPEED_DEADBAND)
+        ),
+    }
+    return {
+        kind: replace(deadband, min_interval=min_interval)
+        for kind, deadband in deadbands.items()
+    }
@@ -0,0 +1,117 @@
+"""Diagnostics support for the Actron Air Nimbus integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+
+from . import ActronAirNimbusConfigEntry
+from .api.paths import compile_path
+
+# identify the account or the systems on it
+TO_REDACT = {"serial", "id", "description", "_links"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ActronAirNimbusConfigEntry
+) -> dict[str, Any]:
+    """Return a performance and health snapshot for a config entry."""
+    coordinator = entry.runtime_data
+    adapter = coordinator.actron_api_client.adapter
+
+    # serials identify a system so label them instead
+    labels = {
+        serial_number: f"system_{index}"
+        for index, serial_number in enumerate(coordinator.confirmed)
+    }
+
+    def label(serial_number: str | None) -> str | None:
+        if serial_number is None:
+            return None
+        return labels.get(serial_number, "unknown")
+
+    def labelled(values: dict[str, Any]) -> dict[str, Any]:
+        return {label(serial_number): value for serial_number, value in values.items()}
+
+    cache = compile_path.cache_info()
+    lookups = cache.hits + cache.misses
+
+    return {
+        "options": dict(entry.options),
+        "systems": async_redact_data(coordinator.systems, TO_REDACT),
+        "coordinator": {
+            "data_mode": coordinator.data_mode,
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval
+                else None
+            ),
+            "poll_intervals": labelled(coordinator.poll_scheduler.intervals),
+            "refresh_durations": list(coordinator.refresh_durations),
+            "streaming": sorted(label(serial) for serial in coordinator.streaming),
+            "stale": sorted(label(serial) for serial in coordinator.stale_systems),
+            "pending_settings": len(coordinator.pending_settings),
+        },
+        "states": {
+            label(serial_number): {
+                "size_bytes": len(json_bytes(state._state)),
+                "timestamp": state._timestamp,
+                "event_timestamp": state._event_timestamp,
+                "has_event_id": state._event_id is not None,
+            }
+            for serial_number, state in coordinator.confirmed.items()
+        },
+        "merges": labelled(
+            {
+                serial_number: asdict(stats)
+                for serial_number, stats in coordinator.stats.items()
+            }
+        ),
+        # only how much history there is - the changes themselves are
+        # available from the get_journal service
+        "journals": labelled(
+            {
+                serial_number: journal.as_dict()
+                for serial_number, journal in coordinator.journals.items()
+            }
+        ),
+        "requests": {
+            "circuit_open": adapter.circuit_breaker.is_open,
+            "consecutive_failures": adapter.circuit_breaker.failures,
+            "endpoints": [
+                {"endpoint": endpoint, "system": label(serial_number)}
+                | metrics.as_dict()
+                for (endpoint, serial_number), metrics in adapter.metrics.items()
+            ],
+            "recent": [
+                {
+                    "endpoint": timing.endpoint,
+                    "system": label(timing.serial),
+                    "at": datetime.fromtimestamp(timing.at, timezone.utc),
+                    "latency_ms": (
+                        None
+                        if timing.latency is None
+                        else round(timing.latency * 1000, 1)
+                    ),
+                    "bytes_received": timing.bytes_received,
+                    "error": timing.error,
+                }
+                for timing in adapter.metrics.recent
+            ],
+        },
+        "caches": {
+            "compiled_paths": {
+                "hits": cache.hits,
+                "misses": cache.misses,
+                "size": cache.currsize,
+                "max_size": cache.maxsize,
+                "hit_rate": cache.hits / lookups if lookups else None,
+            },
+        },
+    }
@@ -1,7 +1,153 @@
+import time
+
+from datetime import datetime
+from typing import Any, Callable
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .api.paths import KeyPath, compile_path
+
 
 class ActronAirNimbusEntity(CoordinatorEntity):
     """Base class for Actron Air Nimbus entities."""
 
     _attr_has_entity_name = True
+
+    # state keys this entity is built from, e.g. "UserAirconSettings.isOn" or
+    # "RemoteZoneInfo[{zone_id}]". The entity is only updated when something
+    # under one of these changes. None means update on any change.
+    _state_paths: tuple[str, ...] | None = None
+
+    # update on every coordinator update, even if no state changed
+    _always_update: bool = False
+
+    # noisy readings that are only written when they change by enough, as
+    # the attribute holding the reading and the kind of deadband to apply
+    # (see deadband.py). Any other change is always written straight away.
+    _deadbands: dict[str, str] = {}
+
+    # what was last written, for changes to noisy readings to be measured against
+    _written: dict[str, Any] | None = None
+    _written_others: dict[str, Any] | None = None
+    _written_at: float = 0
+    _cancel_deferred_write: Callable[[], None] | None = None
+
+    ac_serial: str
+
+    _compiled_paths: list[KeyPath] | None = None
+
+    @property
+    def _compiled_state_paths(self) -> list[KeyPath] | None:
+        if self._state_paths is None:
+            return None
+        # compiled on first use as zone_id is only set after construction
+        if self._compiled_paths is None:
+            self._compiled_paths = [
+                compile_path(path.format(zone_id=getattr(self, "zone_id", None)))
+                for path in self._state_paths
+            ]
+        return self._compiled_paths
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        # flag state restored from before a restart (or kept after a failed
+        # refresh) that hasn't been confirmed by the cloud yet
+        if self.ac_serial in self.coordinator.stale_systems:
+            return {"stale": True}
+        return None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # skip the state write entirely if nothing we show has changed
+        if not self._always_update and not self.coordinator.has_changed(
+            self.ac_serial, self._compiled_state_paths
+        ):
+            return
+
+        self._update_internal_state(self.coordinator.parsed[self.ac_serial])
+
+        if self._deadbands and not self._worth_writing():
+            return
+
+        return super()._handle_coordinator_update()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        if self._deadbands:
+            self._remember_written()
+        super().async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._cancel_deferred_write is not None:
+            self._cancel_deferred_write()
+            self._cancel_deferred_write = None
+        await super().async_will_remove_from_hass()
+
+    def _other_state(self) -> dict[str, Any]:
+        """Everything written other than the noisy readings."""
+        others = {
+            name: value
+            for name, value in vars(self).items()
+            if name.startswith("_attr_") and name not in self._deadbands
+        }
+        others["available"] = self.available
+        return others
+
+    def _remember_written(self) -> None:
+        self._written = {name: getattr(self, name) for name in self._deadbands}
+        self._written_others = self._other_state()
+        self._written_at = time.monotonic()
+        if self._cancel_deferred_write is not None:
+            self._cancel_deferred_write()
+            self._cancel_deferred_write = None
+
+    def _worth_writing(self) -> bool:
+        """Whether an update changed more than noise in the noisy readings.
+
+        A significant change made too soon after the last write is held back
+        and written, at its latest value, once the minimum interval is up.
+        """
+        # everything is new (or availability changed), always write
+        if (
+            self._written is None
+            or not self.coordinator.last_update_success
+            or self.coordinator.changes.get(self.ac_serial) is None
+        ):
+            return True
+
+        if self._other_state() != self._written_others:
+            return True
+
+        deadbands = [
+            self.coordinator.deadbands[kind]
+            for name, kind in self._deadbands.items()
+            if self.coordinator.deadbands[kind].is_significant(
+                self._written[name], getattr(self, name)
+            )
+        ]
+        if not deadbands:
+            return False
+
+        wait = (
+            self._written_at
+            + max(deadband.min_interval for deadband in deadbands)
+            - time.monotonic()
+        )
+        if wait <= 0:
+            return True
+
+        if self._cancel_deferred_write is None:
+            self._cancel_deferred_write = async_call_later(
+                self.hass, wait, self._deferred_write
+            )
+        return False
+
+    @callback
+    def _deferred_write(self, _now: datetime) -> None:
+        self._cancel_deferred_write = None
+        self.async_write_ha_state()
+
+    def _update_internal_state(self, state) -> None:
+        """Update the internal state from the coordinator data."""
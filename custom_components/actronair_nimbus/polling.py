@@ -0,0 +1,148 @@
+"""Adaptive, per-system poll scheduling."""
+
+import logging
+import random
+import time
+
+from typing import Callable, Iterable
+
+from .api.data import ActronAdvanceState
+from .api.paths import ChangeSet, compile_path
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_FAST_SCAN_INTERVAL = 10
+DEFAULT_SCAN_INTERVAL = 60
+DEFAULT_IDLE_SCAN_INTERVAL = 300
+
+# how long to keep polling fast after a command or compressor change
+FAST_POLL_DURATION_SECONDS = 120
+
+# while events are streaming in, polls only reconcile against the full status
+RECONCILE_INTERVAL_SECONDS = 900
+
+# +/- fraction applied to each interval so entries don't poll in lockstep
+JITTER_FRACTION = 0.1
+
+# systems due within this long of each other are refreshed together
+DUE_TOLERANCE_SECONDS = 2
+
+# the compressor is changing state if any of these change
+COMPRESSOR_ACTIVITY_PATHS = [
+    compile_path(key)
+    for key in (
+        "LiveAircon.CompressorMode",
+        "LiveAircon.Defrost",
+        "LiveAircon.OutdoorUnit.CompressorOn",
+        "LiveAircon.OutdoorUnit.CompSpeed",
+    )
+]
+
+
+class AdaptivePollScheduler:
+    """Decide how soon each system should next be polled.
+
+    A system is polled fast for a while after a command is sent to it or its
+    compressor changes state, at the normal rate while it is on, and backs off
+    to the idle rate while it is off.
+    """
+
+    def __init__(
+        self,
+        fast_interval: float = DEFAULT_FAST_SCAN_INTERVAL,
+        interval: float = DEFAULT_SCAN_INTERVAL,
+        idle_interval: float = DEFAULT_IDLE_SCAN_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random = None,
+    ):
+        self.fast_interval = fast_interval
+        self.interval = interval
+        self.idle_interval = idle_interval
+
+        self._clock = clock
+        self._rng = rng or random.Random()
+
+        self._next_due: dict[str, float] = {}
+        self._fast_until: dict[str, float] = {}
+        # last interval chosen per system, for diagnostics
+        self.intervals: dict[str, float] = {}
+
+    def note_activity(self, serial: str, poll: bool = True) -> None:
+        """Poll a system fast for a while, starting now.
+
+        With poll False only its event stream is sped up, leaving when it's
+        next polled alone.
+        """
+        now = self._clock()
+        self._fast_until[serial] = now + FAST_POLL_DURATION_SECONDS
+        if poll:
+            self._next_due[serial] = min(
+                self._next_due.get(serial, now), now + self.fast_interval
+            )
+
+    def note_changes(self, serial: str, changes: ChangeSet | None) -> None:
+        """Poll a system fast for a while if changes show its compressor changing."""
+        if changes and changes.affects(COMPRESSOR_ACTIVITY_PATHS):
+            self._fast_until[serial] = self._clock() + FAST_POLL_DURATION_SECONDS
+
+    def mark_due(self, serial: str) -> None:
+        """Poll a system at the next refresh."""
+        self._next_due[serial] = self._clock()
+
+    def due(self, serials: Iterable[str]) -> list[str]:
+        """The systems that should be refreshed now."""
+        horizon = self._clock() + DUE_TOLERANCE_SECONDS
+        return [
+            serial for serial in serials if self._next_due.get(serial, 0) <= horizon
+        ]
+
+    def schedule(
+        self,
+        serial: str,
+        state: ActronAdvanceState | None,
+        changes: ChangeSet | None = None,
+        pending: bool = False,
+        streaming: bool = False,
+    ) -> float:
+        """Pick when to next poll a system that has just been refreshed.
+
+        A system whose events are streaming in is kept up to date by them, so
+        is only polled occasionally to catch anything the events missed.
+        """
+        now = self._clock()
+        self.note_changes(serial, changes)
+
+        if streaming:
+            interval = max(RECONCILE_INTERVAL_SECONDS, self.idle_interval)
+        else:
+            interval = self._activity_interval(serial, state, pending)
+
+        self.intervals[serial] = interval
+        interval *= 1 + self._rng.uniform(-JITTER_FRACTION, JITTER_FRACTION)
+        self._next_due[serial] = now + interval
+        return interval
+
+    def stream_interval(
+        self, serial: str, state: ActronAdvanceState | None, pending: bool = False
+    ) -> float:
+        """How long a system's event stream should wait between fetches.
+
+        The same as the system would be polled at without the stream, so a
+        system that is off is only checked at the idle rate.
+        """
+        return self._activity_interval(serial, state, pending)
+
+    def _activity_interval(
+        self, serial: str, state: ActronAdvanceState | None, pending: bool
+    ) -> float:
+        if pending or self._clock() < self._fast_until.get(serial, 0):
+            return self.fast_interval
+        if state is not None and state._state and not state.is_on:
+            return self.idle_interval
+        return self.interval
+
+    def seconds_until_next(self) -> float:
+        """How long until the next system is due."""
+        if not self._next_due:
+            return self.interval
+        return max(min(self._next_due.values()) - self._clock(), 1)
@@ -1,6 +1,6 @@
 import logging
 
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.const import (
     REVOLUTIONS_PER_MINUTE,
     PERCENTAGE,
@@ -20,6 +20,8 @@ from homeassistant.components.sensor.const import SensorStateClass, SensorDevice
 from . import ActronAirNimbusConfigEntry
 from .entity import ActronAirNimbusEntity
 from .const import DOMAIN
+from .deadband import DEADBAND_POWER, DEADBAND_SPEED, DEADBAND_TEMPERATURE
+from .api.metrics import ACCOUNT_ENDPOINTS, SYSTEM_ENDPOINTS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,7 +35,7 @@ async def async_setup_entry(
     coordinator = config_entry.runtime_data
     entities: list[ActronAirNimbusSensorEntity] = []
 
-    for ac_serial, state in coordinator.data.items():
+    for ac_serial, state in coordinator.parsed.items():
         entities.extend(
             [
                 ActronAirNimbusCompressorSpeedSensor(coordinator, state, ac_serial),
@@ -58,11 +60,25 @@ async def async_setup_entry(
             ]
         )
 
-        # Add zone sensor entities for each existing zone
-        for zone_id, zone in enumerate(state.zones):
-            if not zone["NV_Exists"]:
-                continue
+        # how far behind the cloud (and we) are
+        entities.extend(
+            [
+                ActronAirNimbusEventLagSensor(coordinator, state, ac_serial),
+                ActronAirNimbusLastChangedSensor(coordinator, state, ac_serial),
+                ActronAirNimbusRefreshDurationSensor(coordinator, state, ac_serial),
+            ]
+        )
+
+        # how this system (and the account) is using the API
+        entities.extend(
+            ActronAirNimbusEndpointRequestsSensor(
+                coordinator, state, ac_serial, endpoint
+            )
+            for endpoint in ACCOUNT_ENDPOINTS + SYSTEM_ENDPOINTS
+        )
 
+        # Add zone sensor entities for each existing zone
+        for zone_id in state.zone_ids:
             entities.extend(
                 [
                     ActronAirNimbusZoneSensorBatterySensor(
@@ -96,14 +112,6 @@ class ActronAirNimbusSensorEntity(ActronAirNimbusEntity, SensorEntity):
 
         self._update_internal_state(initial_state)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        state = self.coordinator.data[self.ac_serial]
-
-        self._update_internal_state(state)
-
-        return super()._handle_coordinator_update()
-
 
 class ActronAirNimbusZoneSensorEntity(ActronAirNimbusEntity, SensorEntity):
     """Base class for ActronAir Nimbus sensor entities."""
@@ -126,14 +134,6 @@ class ActronAirNimbusZoneSensorEntity(ActronAirNimbusEntity, SensorEntity):
 
         self._update_internal_state(initial_state)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        state = self.coordinator.data[self.ac_serial]
-
-        self._update_internal_state(state)
-
-        return super()._handle_coordinator_update()
-
 
 class ActronAirNimbusCompressorSpeedSensor(ActronAirNimbusSensorEntity):
     """Representation of the compressor speed sensor."""
@@ -142,9 +142,12 @@ class ActronAirNimbusCompressorSpeedSensor(ActronAirNimbusSensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = PERCENTAGE
 
+    _state_paths = ("LiveAircon.OutdoorUnit.CompSpeed",)
+    _deadbands = {"_attr_native_value": DEADBAND_SPEED}
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_native_value = state._state["LiveAircon"]["OutdoorUnit"]["CompSpeed"]
+        self._attr_native_value = state.outdoor.speed
 
 
 class ActronAirNimbusCompressorModeSensor(ActronAirNimbusSensorEntity):
@@ -154,9 +157,11 @@ class ActronAirNimbusCompressorModeSensor(ActronAirNimbusSensorEntity):
     _attr_device_class = SensorDeviceClass.ENUM
     _attr_options = ["OFF", "HEAT", "COOL"]
 
+    _state_paths = ("LiveAircon.CompressorMode",)
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_native_value = state._state["LiveAircon"]["CompressorMode"]
+        self._attr_native_value = state.outdoor.mode
 
 
 class ActronAirNimbusCompressorPowerSensor(ActronAirNimbusSensorEntity):
@@ -167,9 +172,12 @@ class ActronAirNimbusCompressorPowerSensor(ActronAirNimbusSensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfPower.WATT
 
+    _state_paths = ("LiveAircon.OutdoorUnit.CompPower",)
+    _deadbands = {"_attr_native_value": DEADBAND_POWER}
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_native_value = state._state["LiveAircon"]["OutdoorUnit"]["CompPower"]
+        self._attr_native_value = state.outdoor.power
 
 
 class ActronAirNimbusIndoorFanPwmSensor(ActronAirNimbusSensorEntity):
@@ -179,9 +187,12 @@ class ActronAirNimbusIndoorFanPwmSensor(ActronAirNimbusSensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = PERCENTAGE
 
+    _state_paths = ("LiveAircon.FanPWM",)
+    _deadbands = {"_attr_native_value": DEADBAND_SPEED}
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_native_value = state._state["LiveAircon"]["FanPWM"]
+        self._attr_native_value = state.outdoor.pwm
 
 
 class ActronAirNimbusIndoorFanRpmSensor(ActronAirNimbusSensorEntity):
@@ -191,9 +202,12 @@ class ActronAirNimbusIndoorFanRpmSensor(ActronAirNimbusSensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = REVOLUTIONS_PER_MINUTE
 
+    _state_paths = ("LiveAircon.FanRPM",)
+    _deadbands = {"_attr_native_value": DEADBAND_SPEED}
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_native_value = state._state["LiveAircon"]["FanRPM"]
+        self._attr_native_value = state.outdoor.rpm
 
 
 class ActronAirNimbusOutdoorAmbientTemperatureSensor(ActronAirNimbusSensorEntity):
@@ -203,9 +217,12 @@ class ActronAirNimbusOutdoorAmbientTemperatureSensor(ActronAirNimbusSensorEntity
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
 
+    _state_paths = ("LiveAircon.OutdoorUnit.AmbTemp",)
+    _deadbands = {"_attr_native_value": DEADBAND_TEMPERATURE}
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_native_value = state._state["LiveAircon"]["OutdoorUnit"]["AmbTemp"]
+        self._attr_native_value = state.outdoor.ambient_temperature
 
 
 class ActronAirNimbusCompressorCoilTemperatureSensor(ActronAirNimbusSensorEntity):
@@ -215,9 +232,12 @@ class ActronAirNimbusCompressorCoilTemperatureSensor(ActronAirNimbusSensorEntity
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
 
+    _state_paths = ("LiveAircon.OutdoorUnit.CoilTemp",)
+    _deadbands = {"_attr_native_value": DEADBAND_TEMPERATURE}
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_native_value = state._state["LiveAircon"]["OutdoorUnit"]["CoilTemp"]
+        self._attr_native_value = state.outdoor.coil_temperature
 
 
 class ActronAirNimbusCompressorDischargeTemperatureSensor(ActronAirNimbusSensorEntity):
@@ -227,9 +247,12 @@ class ActronAirNimbusCompressorDischargeTemperatureSensor(ActronAirNimbusSensorE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
 
+    _state_paths = ("LiveAircon.OutdoorUnit.DischargeTemp",)
+    _deadbands = {"_attr_native_value": DEADBAND_TEMPERATURE}
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_native_value = state._state["LiveAircon"]["OutdoorUnit"]["DischargeTemp"]
+        self._attr_native_value = state.outdoor.discharge_temperature
 
 
 class ActronAirNimbusCompressorCoilInletTemperatureSensor(ActronAirNimbusSensorEntity):
@@ -239,9 +262,12 @@ class ActronAirNimbusCompressorCoilInletTemperatureSensor(ActronAirNimbusSensorE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
 
+    _state_paths = ("LiveAircon.CoilInlet",)
+    _deadbands = {"_attr_native_value": DEADBAND_TEMPERATURE}
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_native_value = state._state["LiveAircon"]["CoilInlet"]
+        self._attr_native_value = state.coil_inlet_temperature
 
 
 class ActronAirNimbusVftAirflowSensor(ActronAirNimbusSensorEntity):
@@ -252,9 +278,11 @@ class ActronAirNimbusVftAirflowSensor(ActronAirNimbusSensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfVolumeFlowRate.LITERS_PER_SECOND
 
+    _state_paths = ("UserAirconSettings.VFT.Airflow",)
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_native_value = state._state["UserAirconSettings"]["VFT"]["Airflow"]
+        self._attr_native_value = state.vft.airflow
 
 
 class ActronAirNimbusVftStaticPressureSensor(ActronAirNimbusSensorEntity):
@@ -265,11 +293,11 @@ class ActronAirNimbusVftStaticPressureSensor(ActronAirNimbusSensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfPressure.PA
 
+    _state_paths = ("UserAirconSettings.VFT.StaticPressure",)
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_native_value = state._state["UserAirconSettings"]["VFT"][
-            "StaticPressure"
-        ]
+        self._attr_native_value = state.vft.static_pressure
 
 
 class ActronAirNimbusWifiSignalStrengthSensor(ActronAirNimbusSensorEntity):
@@ -282,9 +310,7 @@ class ActronAirNimbusWifiSignalStrengthSensor(ActronAirNimbusSensorEntity):
 
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_native_value = state._state[f"<{self.ac_serial.upper()}>"][
-            "SystemStatus_Local"
-        ]["WifiStrength_of3"]
+        self._attr_native_value = state.wifi_strength
 
 
 class ActronAirNimbusZoneSensorBatterySensor(ActronAirNimbusZoneSensorEntity):
@@ -295,18 +321,11 @@ class ActronAirNimbusZoneSensorBatterySensor(ActronAirNimbusZoneSensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = PERCENTAGE
 
+    _state_paths = ("AirconSystem.Peripherals",)
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        peripherals = [
-            peripheral
-            for peripheral in state._state["AirconSystem"]["Peripherals"]
-            if peripheral["DeviceType"] == "Zone Sensor"
-        ]
-        peripherals.sort(key=lambda x: x["ZoneAssignment"][0])
-
-        self._attr_native_value = peripherals[self.zone_id][
-            "RemainingBatteryCapacity_pc"
-        ]
+        self._attr_native_value = state.zone(self.zone_id).battery
 
 
 class ActronAirNimbusZoneSensorWifiSignalStrengthSensor(ActronAirNimbusZoneSensorEntity):
@@ -317,9 +336,11 @@ class ActronAirNimbusZoneSensorWifiSignalStrengthSensor(ActronAirNimbusZoneSenso
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = SIGNAL_STRENGTH_DECIBELS
 
+    _state_paths = ("RemoteZoneInfo[{zone_id}].Sensors",)
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
-        self._attr_native_value = state.zones[self.zone_id]["Sensors"][self.ac_serial.upper()]["Signal_of3"]
+        self._attr_native_value = state.zone(self.zone_id).signal
 
 
 class ActronAirNimbusZoneDamperPositionSensor(ActronAirNimbusZoneSensorEntity):
@@ -329,7 +350,90 @@ class ActronAirNimbusZoneDamperPositionSensor(ActronAirNimbusZoneSensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = PERCENTAGE
 
+    _state_paths = ("RemoteZoneInfo[{zone_id}].ZonePosition",)
+
     def _update_internal_state(self, state):
         """Update the internal state from the coordinator data."""
         # this appears to be a value out of 20. Convert to a real
-        self._attr_native_value = 100 * state.zones[self.zone_id]["ZonePosition"] / 20
+        self._attr_native_value = 100 * state.zone(self.zone_id).position / 20
+
+
+class ActronAirNimbusEventLagSensor(ActronAirNimbusSensorEntity):
+    """How long after it happened the newest event was merged."""
+
+    _attr_translation_key = "event_lag"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 0
+
+    _always_update = True
+
+    def _update_internal_state(self, state):
+        """Update the internal state from the coordinator's stats."""
+        stats = self.coordinator.stats.get(self.ac_serial)
+        self._attr_native_value = stats.event_lag if stats is not None else None
+
+
+class ActronAirNimbusLastChangedSensor(ActronAirNimbusSensorEntity):
+    """When the state of the system last changed."""
+
+    _attr_translation_key = "last_changed"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    _always_update = True
+
+    def _update_internal_state(self, state):
+        """Update the internal state from the coordinator's stats."""
+        stats = self.coordinator.stats.get(self.ac_serial)
+        self._attr_native_value = stats.last_changed if stats is not None else None
+
+
+class ActronAirNimbusRefreshDurationSensor(ActronAirNimbusSensorEntity):
+    """How long the last coordinator refresh took."""
+
+    _attr_translation_key = "refresh_duration"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 2
+    _attr_entity_registry_enabled_default = False
+
+    _always_update = True
+
+    def _update_internal_state(self, state):
+        """Update the internal state from the coordinator's stats."""
+        durations = self.coordinator.refresh_durations
+        self._attr_native_value = durations[-1] if durations else None
+
+
+class ActronAirNimbusEndpointRequestsSensor(ActronAirNimbusSensorEntity):
+    """Requests made to an API endpoint, with errors, retries and latency."""
+
+    _attr_translation_key = "endpoint_requests"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_entity_registry_enabled_default = False
+
+    # requests are made whether or not anything changed
+    _always_update = True
+
+    def __init__(self, coordinator, initial_state, ac_serial: str, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self._attr_translation_placeholders = {"endpoint": endpoint}
+        super().__init__(coordinator, initial_state, ac_serial)
+
+        self._attr_unique_id = f"{ac_serial}_{endpoint}_requests"
+
+    def _update_internal_state(self, state):
+        """Update the internal state from the adapter's metrics."""
+        # account wide endpoints aren't made on behalf of any one system
+        serial = None if self.endpoint in ACCOUNT_ENDPOINTS else self.ac_serial
+        metrics = self.coordinator.actron_api_client.adapter.metrics.endpoint(
+            self.endpoint, serial
+        )
+        self._attr_native_value = metrics.requests
+        self._metrics = metrics.as_dict()
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        return (super().extra_state_attributes or {}) | self._metrics
@@ -0,0 +1,158 @@
+"""Services for the Actron Air Nimbus integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .api.frozen import thaw
+from .api.journal import ABSENT
+from .const import DOMAIN
+from .coordinator import ActronAirNimbusDataUpdateCoordinator
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_DURATION = "duration"
+ATTR_KEY = "key"
+ATTR_SINCE = "since"
+
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_GET_JOURNAL = "get_journal"
+
+# long enough to catch most problems, short enough not to fill the disk if
+# it's forgotten about
+DEFAULT_CAPTURE_DURATION = timedelta(hours=1)
+
+START_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_DURATION, default=DEFAULT_CAPTURE_DURATION): vol.All(
+            cv.time_period, cv.positive_timedelta
+        ),
+    }
+)
+STOP_CAPTURE_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+GET_JOURNAL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_SINCE, default=timedelta(hours=1)): vol.All(
+            cv.time_period, cv.positive_timedelta
+        ),
+        vol.Optional(ATTR_KEY): cv.string,
+    }
+)
+
+
+def _coordinator(
+    hass: HomeAssistant, call: ServiceCall
+) -> ActronAirNimbusDataUpdateCoordinator:
+    entry = hass.config_entries.async_get_entry(call.data[ATTR_CONFIG_ENTRY_ID])
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="entry_not_found"
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="entry_not_loaded"
+        )
+    return entry.runtime_data
+
+
+async def _async_start_capture(call: ServiceCall) -> ServiceResponse:
+    """Record the payloads an entry receives, to replay offline."""
+    coordinator = _coordinator(call.hass, call)
+    if coordinator.capture is not None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="already_capturing"
+        )
+
+    path = call.hass.config.path(
+        f"{DOMAIN}_capture_{coordinator.config_entry.entry_id}_"
+        f"{dt_util.utcnow():%Y%m%dT%H%M%S}.jsonl.gz"
+    )
+    coordinator.async_start_capture(path, call.data[ATTR_DURATION])
+    return {"path": path}
+
+
+async def _async_stop_capture(call: ServiceCall) -> ServiceResponse:
+    coordinator = _coordinator(call.hass, call)
+    capture = await coordinator.async_stop_capture()
+    if capture is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="not_capturing"
+        )
+    return {"path": capture.path, "records": capture.records}
+
+
+async def _async_get_journal(call: ServiceCall) -> ServiceResponse:
+    """What changed in each system recently, and what a key was back then."""
+    coordinator = _coordinator(call.hass, call)
+    key = call.data.get(ATTR_KEY)
+    since = dt_util.utcnow() - call.data[ATTR_SINCE]
+
+    systems = {}
+    for serial_number, journal in coordinator.journals.items():
+        system = {
+            "horizon": journal.horizon.isoformat(),
+            "changes": [
+                {
+                    "at": entry.at.isoformat(),
+                    "key": entry.key,
+                    # keys that were added or removed are reported as None
+                    "before": None if entry.before is ABSENT else thaw(entry.before),
+                    "after": None if entry.after is ABSENT else thaw(entry.after),
+                }
+                for entry in journal.changes_since(since, key)
+            ],
+        }
+        if key:
+            try:
+                then = thaw(journal.value_at(key, since))
+            except LookupError:
+                # from before the journal's horizon, so not known
+                then = None
+            system["value"] = {
+                "at": since.isoformat(),
+                "then": then,
+                "now": thaw(journal.value_at(key, dt_util.utcnow())),
+            }
+        systems[serial_number] = system
+
+    return {"systems": systems}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_CAPTURE,
+        _async_start_capture,
+        schema=START_CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_CAPTURE,
+        _async_stop_capture,
+        schema=STOP_CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_JOURNAL,
+        _async_get_journal,
+        schema=GET_JOURNAL_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
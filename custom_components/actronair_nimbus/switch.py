@@ -1,4 +1,4 @@
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.helpers.device_registry import DeviceInfo
@@ -17,7 +17,7 @@ async def async_setup_entry(
     coordinator = config_entry.runtime_data
     entities: list[ActronAirNimbusEntity] = []
 
-    for unique_id, state in coordinator.data.items():
+    for unique_id, state in coordinator.parsed.items():
         entities.append(QuietModeEnabledSwitch(coordinator, state, unique_id))
         entities.append(TurboModeEnabledSwitch(coordinator, state, unique_id))
         entities.append(ContinuousFanEnabledSwitch(coordinator, state, unique_id))
@@ -31,6 +31,8 @@ class QuietModeEnabledSwitch(ActronAirNimbusEntity, SwitchEntity):
 
     _attr_translation_key = "quiet_mode_enabled"
 
+    _state_paths = ("UserAirconSettings.QuietModeEnabled",)
+
     def __init__(self, coordinator, initial_state, ac_serial: str) -> None:
         super().__init__(coordinator, ac_serial)
         self.ac_serial = ac_serial
@@ -43,16 +45,8 @@ class QuietModeEnabledSwitch(ActronAirNimbusEntity, SwitchEntity):
 
         self._update_internal_state(initial_state)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        state = self.coordinator.data[self.ac_serial]
-
-        self._update_internal_state(state)
-
-        return super()._handle_coordinator_update()
-
     def _update_internal_state(self, state):
-        self._attr_is_on = state._state["UserAirconSettings"]["QuietModeEnabled"]
+        self._attr_is_on = state.quiet_mode.enabled
 
     async def async_turn_on(self, **kwargs) -> None:
         await self.coordinator.actron_api_client.set_settings(
@@ -60,34 +54,20 @@ class QuietModeEnabledSwitch(ActronAirNimbusEntity, SwitchEntity):
             settings={"UserAirconSettings.QuietModeEnabled": True},
         )
 
-        # pre-emptively update local values given actron events can be slow
-        self._attr_is_on = True
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
     async def async_turn_off(self, **kwargs) -> None:
         await self.coordinator.actron_api_client.set_settings(
             serial=self.ac_serial,
             settings={"UserAirconSettings.QuietModeEnabled": False},
         )
 
-        # pre-emptively update local values given actron events can be slow
-        self._attr_is_on = False
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
 
 class TurboModeEnabledSwitch(ActronAirNimbusEntity, SwitchEntity):
     """Representation of a Turbo Mode switch."""
 
     _attr_translation_key = "turbo_mode_enabled"
 
+    _state_paths = ("UserAirconSettings.TurboMode.Enabled",)
+
     def __init__(self, coordinator, initial_state, ac_serial: str) -> None:
         super().__init__(coordinator, ac_serial)
         self.ac_serial = ac_serial
@@ -100,16 +80,8 @@ class TurboModeEnabledSwitch(ActronAirNimbusEntity, SwitchEntity):
 
         self._update_internal_state(initial_state)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        state = self.coordinator.data[self.ac_serial]
-
-        self._update_internal_state(state)
-
-        return super()._handle_coordinator_update()
-
     def _update_internal_state(self, state):
-        self._attr_is_on = state._state["UserAirconSettings"]["TurboMode"]["Enabled"]
+        self._attr_is_on = state.turbo_mode
 
     async def async_turn_on(self, **kwargs) -> None:
         await self.coordinator.actron_api_client.set_settings(
@@ -117,34 +89,20 @@ class TurboModeEnabledSwitch(ActronAirNimbusEntity, SwitchEntity):
             settings={"UserAirconSettings.TurboMode.Enabled": True},
         )
 
-        # pre-emptively update local values given actron events can be slow
-        self._attr_is_on = True
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
     async def async_turn_off(self, **kwargs) -> None:
         await self.coordinator.actron_api_client.set_settings(
             serial=self.ac_serial,
             settings={"UserAirconSettings.TurboMode.Enabled": False},
         )
 
-        # pre-emptively update local values given actron events can be slow
-        self._attr_is_on = False
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
 
 class ContinuousFanEnabledSwitch(ActronAirNimbusEntity, SwitchEntity):
     """Representation of a Continuous Fan switch."""
 
     _attr_translation_key = "continuous_fan_enabled"
 
+    _state_paths = ("UserAirconSettings.FanMode",)
+
     def __init__(self, coordinator, initial_state, ac_serial: str) -> None:
         super().__init__(coordinator, ac_serial)
         self.ac_serial = ac_serial
@@ -157,63 +115,35 @@ class ContinuousFanEnabledSwitch(ActronAirNimbusEntity, SwitchEntity):
 
         self._update_internal_state(initial_state)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        state = self.coordinator.data[self.ac_serial]
-
-        self._update_internal_state(state)
-
-        return super()._handle_coordinator_update()
-
     def _update_internal_state(self, state):
-        self._attr_is_on = state._state["UserAirconSettings"]["FanMode"].endswith(
-            "+CONT"
-        )
+        self._attr_is_on = state.fan_mode.endswith("+CONT")
 
     async def async_turn_on(self, **kwargs) -> None:
-        fan_mode = (
-            self.coordinator.data[self.ac_serial]
-            ._state["UserAirconSettings"]["FanMode"]
-            .replace("+CONT", "")
+        fan_mode = self.coordinator.parsed[self.ac_serial].fan_mode.replace(
+            "+CONT", ""
         )
         await self.coordinator.actron_api_client.set_settings(
             serial=self.ac_serial,
             settings={"UserAirconSettings.FanMode": f"{fan_mode}+CONT"},
         )
 
-        # pre-emptively update local values given actron events can be slow
-        self._attr_is_on = True
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
     async def async_turn_off(self, **kwargs) -> None:
-        fan_mode = (
-            self.coordinator.data[self.ac_serial]
-            ._state["UserAirconSettings"]["FanMode"]
-            .replace("+CONT", "")
+        fan_mode = self.coordinator.parsed[self.ac_serial].fan_mode.replace(
+            "+CONT", ""
         )
         await self.coordinator.actron_api_client.set_settings(
             serial=self.ac_serial,
             settings={"UserAirconSettings.FanMode": fan_mode},
         )
 
-        # pre-emptively update local values given actron events can be slow
-        self._attr_is_on = False
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
 
 class AwayModeEnabledSwitch(ActronAirNimbusEntity, SwitchEntity):
     """Representation of an Away Mode switch."""
 
     _attr_translation_key = "away_mode_enabled"
 
+    _state_paths = ("UserAirconSettings.AwayMode",)
+
     def __init__(self, coordinator, initial_state, ac_serial: str) -> None:
         super().__init__(coordinator, ac_serial)
         self.ac_serial = ac_serial
@@ -226,16 +156,8 @@ class AwayModeEnabledSwitch(ActronAirNimbusEntity, SwitchEntity):
 
         self._update_internal_state(initial_state)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        state = self.coordinator.data[self.ac_serial]
-
-        self._update_internal_state(state)
-
-        return super()._handle_coordinator_update()
-
     def _update_internal_state(self, state):
-        self._attr_is_on = state._state["UserAirconSettings"]["AwayMode"]
+        self._attr_is_on = state.away_mode
 
     async def async_turn_on(self, **kwargs) -> None:
         await self.coordinator.actron_api_client.set_settings(
@@ -243,24 +165,8 @@ class AwayModeEnabledSwitch(ActronAirNimbusEntity, SwitchEntity):
             settings={"UserAirconSettings.AwayMode": True},
         )
 
-        # pre-emptively update local values given actron events can be slow
-        self._attr_is_on = True
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
-
     async def async_turn_off(self, **kwargs) -> None:
         await self.coordinator.actron_api_client.set_settings(
             serial=self.ac_serial,
             settings={"UserAirconSettings.AwayMode": False},
         )
-
-        # pre-emptively update local values given actron events can be slow
-        self._attr_is_on = False
-        # write the state back now we've pre-emptively updated it for responsiveness
-        self.async_write_ha_state()
-
-        # tell the coordinator to refresh data
-        await self.coordinator.async_request_refresh()
@@ -21,7 +21,7 @@ async def async_setup_entry(
     coordinator = config_entry.runtime_data
     entities: list[ActronAirNimbusEntity] = []
 
-    for unique_id, state in coordinator.data.items():
+    for unique_id, state in coordinator.parsed.items():
         entities.extend(
             [
                 ActronAirNimbusWallControllerFirmwareUpdate(
@@ -42,6 +42,8 @@ class ActronAirNimbusWallControllerFirmwareUpdate(ActronAirNimbusEntity, UpdateE
     _attr_device_class = UpdateDeviceClass.FIRMWARE
     _attr_translation_key = "wall_controller_firmware_update"
 
+    _state_paths = ("AirconSystem.MasterWCFirmwareVersion",)
+
     def __init__(self, coordinator, initial_state, ac_serial: str) -> None:
         super().__init__(coordinator, ac_serial)
         self.ac_serial = ac_serial
@@ -52,12 +54,13 @@ class ActronAirNimbusWallControllerFirmwareUpdate(ActronAirNimbusEntity, UpdateE
             identifiers={(DOMAIN, ac_serial)},
         )
 
-        self._attr_installed_version = initial_state._state["AirconSystem"][
-            "MasterWCFirmwareVersion"
-        ]
-        self._attr_latest_version = initial_state._state["AirconSystem"][
-            "MasterWCFirmwareVersion"
-        ]
+        self._update_internal_state(initial_state)
+
+    def _update_internal_state(self, state):
+        """Update the internal state from the coordinator data."""
+        version = state.firmware_versions.master_controller
+        self._attr_installed_version = version
+        self._attr_latest_version = version
 
 
 class ActronAirNimbusIndoorUnitFirmwareUpdate(ActronAirNimbusEntity, UpdateEntity):
@@ -67,6 +70,8 @@ class ActronAirNimbusIndoorUnitFirmwareUpdate(ActronAirNimbusEntity, UpdateEntit
     _attr_device_class = UpdateDeviceClass.FIRMWARE
     _attr_translation_key = "indoor_unit_firmware_update"
 
+    _state_paths = ("AirconSystem.IndoorUnit.IndoorFW",)
+
     def __init__(self, coordinator, initial_state, ac_serial: str) -> None:
         super().__init__(coordinator, ac_serial)
         self.ac_serial = ac_serial
@@ -77,12 +82,13 @@ class ActronAirNimbusIndoorUnitFirmwareUpdate(ActronAirNimbusEntity, UpdateEntit
             identifiers={(DOMAIN, ac_serial)},
         )
 
-        self._attr_installed_version = initial_state._state["AirconSystem"][
-            "IndoorUnit"
-        ]["IndoorFW"]
-        self._attr_latest_version = initial_state._state["AirconSystem"]["IndoorUnit"][
-            "IndoorFW"
-        ]
+        self._update_internal_state(initial_state)
+
+    def _update_internal_state(self, state):
+        """Update the internal state from the coordinator data."""
+        version = state.firmware_versions.indoor
+        self._attr_installed_version = version
+        self._attr_latest_version = version
 
 
 class ActronAirNimbusOutdoorUnitFirmwareUpdate(ActronAirNimbusEntity, UpdateEntity):
@@ -92,6 +98,8 @@ class ActronAirNimbusOutdoorUnitFirmwareUpdate(ActronAirNimbusEntity, UpdateEnti
     _attr_device_class = UpdateDeviceClass.FIRMWARE
     _attr_translation_key = "outdoor_unit_firmware_update"
 
+    _state_paths = ("AirconSystem.OutdoorUnit.SoftwareVersion",)
+
     def __init__(self, coordinator, initial_state, ac_serial: str) -> None:
         super().__init__(coordinator, ac_serial)
         self.ac_serial = ac_serial
@@ -102,9 +110,10 @@ class ActronAirNimbusOutdoorUnitFirmwareUpdate(ActronAirNimbusEntity, UpdateEnti
             identifiers={(DOMAIN, ac_serial)},
         )
 
-        self._attr_installed_version = initial_state._state["AirconSystem"][
-            "OutdoorUnit"
-        ]["SoftwareVersion"]
-        self._attr_latest_version = initial_state._state["AirconSystem"]["OutdoorUnit"][
-            "SoftwareVersion"
-        ]
+        self._update_internal_state(initial_state)
+
+    def _update_internal_state(self, state):
+        """Update the internal state from the coordinator data."""
+        version = state.firmware_versions.outdoor
+        self._attr_installed_version = version
+        self._attr_latest_version = version